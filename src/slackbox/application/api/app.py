@@ -12,8 +12,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from starlette.exceptions import HTTPException
 
 from slackbox.application.api.exception_handlers import exception_handler
+from slackbox.application.api.middlewares import SlackSignatureMiddleware
 from slackbox.application.api.resources import health
 from slackbox.application.api.resources import slack
+from slackbox.domain.slack import http_session
 
 
 def create_app() -> FastAPI:
@@ -27,6 +29,10 @@ def create_app() -> FastAPI:
     ):
         app.include_router(resource.router)
 
+    # shared session pooling outbound connections, closed once routers are shut down
+    app.add_event_handler("startup", http_session.start)
+    app.add_event_handler("shutdown", http_session.stop)
+
     # exception handlers to manage errors
     # custom exception are handled by the generic exception handler
     for exception in (
@@ -45,4 +51,7 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # slack requests are verified before reaching the slack router
+    app.add_middleware(SlackSignatureMiddleware)
+
     return app
@@ -0,0 +1,126 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+slackbox api middlewares
+"""
+
+import hashlib
+import hmac
+from time import time
+from typing import Iterable
+from typing import Optional
+
+from starlette import status
+from starlette.exceptions import HTTPException
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+from slackbox import config
+from slackbox.application.api.components.error_response import ErrorResponse
+from slackbox.application.api.exception_handlers import get_error_code_from
+from slackbox.application.api.exception_handlers import get_error_message_from
+from slackbox.application.api.response import APIResponse
+
+
+def get_error_response(status_code: int) -> APIResponse:
+    """get the error response of a status code, rendered once to be sent many times"""
+    exception = HTTPException(status_code=status_code)
+    return APIResponse(
+        status_code=status_code,
+        content=ErrorResponse(
+            code=get_error_code_from(exception),
+            message=get_error_message_from(exception),
+        ),
+    )
+
+
+class SlackSignatureMiddleware:
+    """
+    ASGI middleware verifying slack request signatures with a pre-keyed HMAC, replayed requests
+    with stale timestamps and oversize requests are rejected before reading their whole body,
+    the body read for the verification being handed over to the application
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        app: ASGIApp,
+        signing_secret: str = config.SLACK_SIGNING_SECRET,
+        paths: Iterable[str] = ("/slack/events",),
+        max_age: float = config.SLACK_SIGNATURE_MAX_AGE,
+        max_body_size: int = config.SLACK_MAX_BODY_SIZE,
+    ):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.max_age = max_age
+        self.max_body_size = max_body_size
+        self._hmac = hmac.new(signing_secret.encode(), digestmod=hashlib.sha256)
+        self._unauthorized = get_error_response(status.HTTP_401_UNAUTHORIZED)
+        self._too_large = get_error_response(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        timestamp = headers.get(b"x-slack-request-timestamp", b"")
+        signature = headers.get(b"x-slack-signature", b"")
+        if not self.is_fresh(timestamp):
+            await self._unauthorized(scope, receive, send)
+            return
+        content_length = headers.get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > self.max_body_size:
+            await self._too_large(scope, receive, send)
+            return
+        body = await self.read_body(receive)
+        if body is None:
+            await self._too_large(scope, receive, send)
+            return
+        if not self.is_valid(timestamp, body, signature):
+            await self._unauthorized(scope, receive, send)
+            return
+        await self.app(scope, self.replay(body, receive), send)
+
+    def is_fresh(self, timestamp: bytes) -> bool:
+        """check if a request timestamp is recent enough"""
+        try:
+            return abs(time() - int(timestamp)) <= self.max_age
+        except ValueError:
+            return False
+
+    def is_valid(self, timestamp: bytes, body: bytes, signature: bytes) -> bool:
+        """check if the signature matches the request"""
+        digest = self._hmac.copy()
+        digest.update(b"v0:" + timestamp + b":" + body)
+        return hmac.compare_digest(b"v0=" + digest.hexdigest().encode(), signature)
+
+    async def read_body(self, receive: Receive) -> Optional[bytes]:
+        """read the request body, None if larger than the maximum body size"""
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_size:
+                return None
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    @staticmethod
+    def replay(body: bytes, receive: Receive) -> Receive:
+        """get a receive callable sending the already read body first"""
+        pending = [{"type": "http.request", "body": body, "more_body": False}]
+
+        async def receive_body() -> Message:
+            if pending:
+                return pending.pop()
+            return await receive()
+
+        return receive_body
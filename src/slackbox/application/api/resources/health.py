@@ -6,38 +6,103 @@ license: MIT
 slackbox api health resources
 """
 
+from time import monotonic
+from typing import Optional
+
 from fastapi import APIRouter
 from fastapi import Depends
+from fastapi import Response
 from fastapi import status
 
+from slackbox import config
 from slackbox.application.api.components.health_response import HealthResponse
+from slackbox.application.api.resources.slack import slack_requests
 from slackbox.application.api.response import APIResponse
 from slackbox.application.health import ApplicationReadiness
-from slackbox.application.health import HealthIndicator
+from slackbox.application.health import Check
+from slackbox.application.health import EventLoopLag
+from slackbox.application.health import HealthRegistry
+from slackbox.application.health import HealthScheduler
+from slackbox.application.health import MemoryUsage
+from slackbox.application.health import OpenFiles
+from slackbox.application.health import Status
 
 router = APIRouter()
 
 
-def get_application_readiness() -> HealthIndicator:
-    """return an application readiness indicator"""
-    return ApplicationReadiness()
+class RenderedHealthResponse:
+    """health response rendered once, served from its encoded body until it gets stale"""
+
+    def __init__(
+        self,
+        ttl: float = config.HEALTH_RESPONSE_TTL,
+        failure_status_code: int = status.HTTP_200_OK,
+    ):
+        self.ttl = ttl
+        self.failure_status_code = failure_status_code
+        self._key: Optional[tuple[tuple[str, Status], ...]] = None
+        self._body = b""
+        self._status_code = status.HTTP_200_OK
+        self._expires_at = 0.0
+
+    def get_response(self, checks: list[Check]) -> Response:
+        """get the response for the given checks, rendering it again when stale"""
+        key = tuple((check.name, check.status) for check in checks)
+        now = monotonic()
+        if key != self._key or now >= self._expires_at:
+            content = HealthResponse.from_checks(checks)
+            self._body = APIResponse(content=content).body
+            self._status_code = status.HTTP_200_OK
+            if content.status is Status.FAIL:
+                self._status_code = self.failure_status_code
+            self._key = key
+            self._expires_at = now + self.ttl
+        return Response(
+            content=self._body,
+            status_code=self._status_code,
+            media_type=APIResponse.media_type,
+        )
+
+
+readiness = HealthScheduler(
+    HealthRegistry(
+        [
+            ApplicationReadiness(),
+            EventLoopLag(),
+            MemoryUsage(),
+            OpenFiles(),
+            slack_requests,
+        ]
+    )
+)
+liveness = HealthScheduler(HealthRegistry([ApplicationReadiness()]))
+readyz_response = RenderedHealthResponse(failure_status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+livez_response = RenderedHealthResponse()
+
+for scheduler in (readiness, liveness):
+    router.add_event_handler("startup", scheduler.start)
+    router.add_event_handler("shutdown", scheduler.stop)
+
+
+def get_readiness() -> HealthScheduler:
+    """return the scheduler of indicators telling if the application can receive traffic"""
+    return readiness
+
+
+def get_liveness() -> HealthScheduler:
+    """return the scheduler of indicators telling if the application is alive"""
+    return liveness
 
 
 @router.get("/readyz")
-async def get_readyz(
-    application_ready: HealthIndicator = Depends(get_application_readiness),
-) -> APIResponse:
+async def get_readyz(health: HealthScheduler = Depends(get_readiness)) -> Response:
     """readyz resource controller"""
-    checks = [application_ready.get_check()]
-    response = HealthResponse.from_checks(checks)
-    return APIResponse(content=response, status_code=status.HTTP_200_OK)
+    checks = await health.get_checks()
+    return readyz_response.get_response(checks)
 
 
 @router.get("/livez")
-async def get_livez(
-    application_ready: HealthIndicator = Depends(get_application_readiness),
-) -> APIResponse:
+async def get_livez(health: HealthScheduler = Depends(get_liveness)) -> Response:
     """livez resource controller"""
-    checks = [application_ready.get_check()]
-    response = HealthResponse.from_checks(checks)
-    return APIResponse(content=response, status_code=status.HTTP_200_OK)
+    checks = await health.get_checks()
+    return livez_response.get_response(checks)
@@ -6,18 +6,156 @@ license: MIT
 slackbox slack resources
 """
 
+import json
+from typing import Any
+from typing import Optional
+from urllib.parse import parse_qs
 
 from fastapi import APIRouter
 from fastapi import Request
+from fastapi import Response
+from fastapi import status
 from slack_bolt.adapter.fastapi.async_handler import AsyncSlackRequestHandler
+from slack_sdk.socket_mode.async_client import AsyncBaseSocketModeClient
+from slack_sdk.socket_mode.request import SocketModeRequest
+from starlette.exceptions import HTTPException
 
+from slackbox import config
+from slackbox.application.health import InFlightRequests
 from slackbox.domain.slack import app
+from slackbox.domain.slack import installation_store
+from slackbox.domain.slack import work_queue
+from slackbox.infrastructure.deduplication import create_deduplication_backend
+from slackbox.infrastructure.socket_mode import SocketModeRunner
 
 router = APIRouter()
 handler = AsyncSlackRequestHandler(app)
+slack_requests = InFlightRequests(
+    name=f"{config.SERVICE}:slack-requests",
+    maximum=config.HEALTH_MAX_SLACK_REQUESTS,
+)
+deliveries = create_deduplication_backend()
+
+
+def get_payload_delivery_key(data: Any) -> Optional[str]:
+    """get the key identifying a slack delivery from its payload's event id or trigger id"""
+    if not isinstance(data, dict):
+        return None
+    if "event_id" in data:
+        return f"event:{data['event_id']}"
+    if "trigger_id" in data:
+        return f"trigger:{data['trigger_id']}"
+    return None
+
+
+def is_event(data: Any) -> bool:
+    """check if a slack delivery is an events api event"""
+    return isinstance(data, dict) and data.get("type") == "event_callback"
+
+
+def get_payload_team(data: Any) -> Optional[str]:
+    """get the id of the team a slack delivery comes from"""
+    if not isinstance(data, dict):
+        return None
+    if "team_id" in data:
+        return data["team_id"]
+    if isinstance(data.get("team"), dict):
+        return data["team"].get("id")
+    return None
+
+
+def get_payload(body: bytes, content_type: str) -> Any:
+    """get the payload of a slack delivery, none when it can not be parsed"""
+    try:
+        if content_type.startswith("application/json"):
+            return json.loads(body)
+        form = {key: values[0] for key, values in parse_qs(body.decode()).items()}
+        return json.loads(form["payload"]) if "payload" in form else form
+    except ValueError:
+        return None
+
+
+def get_delivery_key(body: bytes, content_type: str) -> Optional[str]:
+    """get the key identifying a slack delivery from its event id or trigger id"""
+    return get_payload_delivery_key(get_payload(body, content_type))
+
+
+async def get_request_payload(request: Request) -> Any:
+    """get the payload of a request verified by the slack signature middleware"""
+    body = await request.body()
+    return get_payload(body, request.headers.get("content-type", ""))
+
+
+class SlackSocketModeRunner(SocketModeRunner):
+    """
+    socket mode runner shedding, deduplicating and tracking envelopes like the slack event
+    resource does with http requests
+    """
+
+    async def handle(self, client: AsyncBaseSocketModeClient, request: SocketModeRequest) -> None:
+        # commands and interactions reach their listeners, which tell their user to retry
+        if request.type == "events_api" and work_queue.full(get_payload_team(request.payload)):
+            await self.ack(client, request)
+            return
+        key = get_payload_delivery_key(request.payload)
+        if key is not None and not await deliveries.add(key):
+            await self.ack(client, request)
+            return
+        # failed envelopes are left unacknowledged and forgotten, to be handled when redelivered
+        try:
+            with slack_requests.track():
+                response = await self.dispatch(client, request)
+        except BaseException:
+            if key is not None:
+                await deliveries.remove(key)
+            raise
+        if key is not None and response.status != status.HTTP_200_OK:
+            await deliveries.remove(key)
+
+
+socket_mode = SlackSocketModeRunner(app)
+# with socket mode, events stop arriving before the work queue gets drained on shutdown
+if config.SLACK_TRANSPORT == "socket":
+    router.add_event_handler("startup", socket_mode.start)
+    router.add_event_handler("shutdown", socket_mode.stop)
+router.add_event_handler("startup", installation_store.check)
+router.add_event_handler("startup", work_queue.start)
+router.add_event_handler("shutdown", work_queue.stop)
 
 
 @router.post("/slack/events")
 async def endpoint(request: Request):
-    """slack event resource controller"""
+    """
+    slack event resource controller, shedding events while the work queue is full for their
+    team and acknowledging redeliveries without handling them again
+    """
+    data = await get_request_payload(request)
+    # commands and interactions reach their listeners, which tell their user to retry
+    if is_event(data) and work_queue.full(get_payload_team(data)):
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS)
+    key = get_payload_delivery_key(data)
+    if key is not None and not await deliveries.add(key):
+        return Response(status_code=status.HTTP_200_OK)
+    # failed deliveries are forgotten, for slack's retries to be handled
+    try:
+        with slack_requests.track():
+            response = await handler.handle(request)
+    except BaseException:
+        if key is not None:
+            await deliveries.remove(key)
+        raise
+    if key is not None and response.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+        await deliveries.remove(key)
+    return response
+
+
+@router.get("/slack/install")
+async def install(request: Request):
+    """slack installation resource controller, starting the oauth flow of a workspace"""
+    return await handler.handle(request)
+
+
+@router.get("/slack/oauth_redirect")
+async def oauth_redirect(request: Request):
+    """slack oauth redirection resource controller, saving the workspace's installation"""
     return await handler.handle(request)
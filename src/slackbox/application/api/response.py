@@ -6,25 +6,145 @@ license: MIT
 slackbox api response
 """
 
+import json
+from datetime import date
+from datetime import datetime
+from datetime import time
+from enum import Enum
+from functools import lru_cache
 from typing import Any
+from typing import Callable
 
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
+from pydantic.fields import SHAPE_LIST
+from pydantic.fields import SHAPE_SEQUENCE
+from pydantic.fields import SHAPE_SET
+from pydantic.fields import SHAPE_SINGLETON
+from pydantic.fields import SHAPE_TUPLE_ELLIPSIS
+from pydantic.fields import ModelField
 
 from slackbox.application.api.components.base import APIComponent
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+Encoder = Callable[[Any], Any]
+SEQUENCE_SHAPES = (SHAPE_LIST, SHAPE_SEQUENCE, SHAPE_SET, SHAPE_TUPLE_ELLIPSIS)
+
+
+def dumps(data: Any) -> bytes:
+    """
+    dump json compatible data to bytes, using orjson when installed, non string keys being
+    converted to strings like the standard json module does
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        data,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _encode_identity(value: Any) -> Any:
+    return value
+
+
+def _encode_enum(value: Enum) -> Any:
+    return value.value
+
+
+def _encode_isoformat(value: date | time) -> str:
+    return value.isoformat()
+
+
+def _encode_any(value: Any) -> Any:
+    """encode a value of a type only known at runtime, components keeping their own plan"""
+    if isinstance(value, APIComponent):
+        return _encode_component(value)
+    if isinstance(value, dict):
+        return {
+            key if isinstance(key, str) else jsonable_encoder(key): _encode_any(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_encode_any(item) for item in value]
+    return jsonable_encoder(value)
+
+
+def _encode_component(value: APIComponent) -> dict[str, Any]:
+    return get_serialization_plan(type(value)).serialize(value)
+
+
+def _get_type_encoder(type_: Any) -> Encoder:
+    """get the encoder for values of the given type"""
+    if not isinstance(type_, type):
+        return _encode_any
+    if issubclass(type_, APIComponent):
+        return _encode_component
+    if issubclass(type_, Enum):
+        return _encode_enum
+    if issubclass(type_, (datetime, date, time)):
+        return _encode_isoformat
+    if issubclass(type_, (str, int, float, bool)):
+        return _encode_identity
+    return _encode_any
+
+
+def _get_field_encoder(field: ModelField) -> Encoder:
+    """get the encoder for the values of the given component field"""
+    encode = _get_type_encoder(field.type_)
+    if field.shape == SHAPE_SINGLETON:
+        return encode
+    if field.shape in SEQUENCE_SHAPES:
+        return lambda values: [encode(value) for value in values]
+    return _encode_any
+
+
+class SerializationPlan:
+    """plan turning a component into json compatible data in a single traversal"""
+
+    def __init__(self, component_class: type[APIComponent]):
+        self.fields = [
+            (name, field.alias, _get_field_encoder(field))
+            for name, field in component_class.__fields__.items()
+        ]
+
+    def serialize(self, component: APIComponent) -> dict[str, Any]:
+        """serialize the component's set and not none fields using their aliases"""
+        fields_set = component.__fields_set__
+        data = {}
+        for name, alias, encode in self.fields:
+            if name not in fields_set:
+                continue
+            value = getattr(component, name)
+            if value is None:
+                continue
+            data[alias] = encode(value)
+        return data
+
+
+@lru_cache(maxsize=None)
+def get_serialization_plan(component_class: type[APIComponent]) -> SerializationPlan:
+    """get the serialization plan of a component class, built once per class"""
+    return SerializationPlan(component_class)
+
 
 class APIResponse(JSONResponse):
     """API response able to render any API component"""
 
     def to_data(self, component: APIComponent) -> Any:
         """transfrom a component into serializable data"""
-        return component.dict(by_alias=True, exclude_unset=True, exclude_none=True)
+        return get_serialization_plan(type(component)).serialize(component)
 
     def render(self, content: APIComponent | list[APIComponent]) -> bytes:
         if isinstance(content, list):
             data = [self.to_data(item) for item in content]
         else:
             data = self.to_data(content)
-        json_content = jsonable_encoder(data)
-        return super().render(json_content)
+        return dumps(data)
@@ -8,10 +8,19 @@ slackbox applicative health management
 
 from __future__ import annotations
 
+import asyncio
+import logging
+import os
+import resource
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from inspect import iscoroutinefunction
+from time import monotonic
 from typing import Iterable
+from typing import Iterator
+from typing import Optional
 from typing import Protocol
 
 from slackbox import config
@@ -43,22 +52,263 @@ class Check:
     observed_unit: str
 
 
+logger = logging.getLogger(__name__)
+
+
 class HealthIndicator(Protocol):
     """protocol to be implemented by any class exposing a health check"""
 
+    name: str
+
     def get_check(self) -> Check:
         """method to be implemented exposing the health check"""
         ...
 
 
+class AsyncHealthIndicator(Protocol):
+    """protocol to be implemented by any class exposing a health check needing to await"""
+
+    name: str
+
+    async def get_check(self) -> Check:
+        """method to be implemented exposing the health check"""
+        ...
+
+
 class ApplicationReadiness(HealthIndicator):
     """application readiness health indicator"""
 
+    name = f"{config.SERVICE}:ready"
+
     def get_check(self) -> Check:
         return Check(
-            name=f"{config.SERVICE}:ready",
+            name=self.name,
             time=datetime.now(),
             status=Status.PASS,
             observed_value="true",
             observed_unit="boolean",
         )
+
+
+class ThresholdIndicator:
+    """base health indicator failing when its observed value exceeds a maximum"""
+
+    unit: str
+
+    def __init__(self, name: str, maximum: float):
+        self.name = name
+        self.maximum = maximum
+
+    def to_check(self, value: float) -> Check:
+        """create a check from an observed value"""
+        return Check(
+            name=self.name,
+            time=datetime.now(),
+            status=Status.PASS if value <= self.maximum else Status.FAIL,
+            observed_value=f"{value:g}",
+            observed_unit=self.unit,
+        )
+
+
+class EventLoopLag(ThresholdIndicator, AsyncHealthIndicator):
+    """health indicator measuring the delay for a callback scheduled now to be run"""
+
+    unit = "ms"
+
+    def __init__(
+        self,
+        name: str = f"{config.SERVICE}:event-loop-lag",
+        maximum: float = config.HEALTH_MAX_EVENT_LOOP_LAG,
+    ):
+        super().__init__(name, maximum)
+
+    async def get_check(self) -> Check:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        start = loop.time()
+        loop.call_soon(future.set_result, None)
+        await future
+        return self.to_check((loop.time() - start) * 1000)
+
+
+class MemoryUsage(ThresholdIndicator, HealthIndicator):
+    """health indicator measuring the resident memory of the process"""
+
+    unit = "MiB"
+
+    def __init__(
+        self,
+        name: str = f"{config.SERVICE}:memory",
+        maximum: float = config.HEALTH_MAX_MEMORY,
+    ):
+        super().__init__(name, maximum)
+
+    @staticmethod
+    def get_resident_memory() -> int:
+        """get the resident memory in bytes, falling back on the peak one without procfs"""
+        try:
+            with open("/proc/self/statm", encoding="ascii") as statm:
+                return int(statm.read().split()[1]) * resource.getpagesize()
+        except OSError:
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def get_check(self) -> Check:
+        return self.to_check(round(self.get_resident_memory() / 2**20, 1))
+
+
+class OpenFiles(ThresholdIndicator, HealthIndicator):
+    """health indicator counting the file descriptors opened by the process"""
+
+    unit = "files"
+
+    def __init__(
+        self,
+        name: str = f"{config.SERVICE}:open-files",
+        maximum: float = config.HEALTH_MAX_OPEN_FILES,
+    ):
+        super().__init__(name, maximum)
+
+    def get_check(self) -> Check:
+        for directory in ("/proc/self/fd", "/dev/fd"):
+            try:
+                return self.to_check(len(os.listdir(directory)))
+            except OSError:
+                continue
+        raise NotImplementedError("open files can not be listed on this platform")
+
+
+class InFlightRequests(ThresholdIndicator, HealthIndicator):
+    """health indicator counting requests being processed"""
+
+    unit = "requests"
+
+    def __init__(self, name: str, maximum: float):
+        super().__init__(name, maximum)
+        self.count = 0
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """count a request as in flight while in the context"""
+        self.count += 1
+        try:
+            yield
+        finally:
+            self.count -= 1
+
+    def get_check(self) -> Check:
+        return self.to_check(self.count)
+
+
+class HealthRegistry:
+    """registry evaluating health indicators concurrently, failing the ones being too slow"""
+
+    def __init__(
+        self,
+        indicators: Optional[list[HealthIndicator | AsyncHealthIndicator]] = None,
+        timeout: float = config.HEALTH_CHECK_TIMEOUT,
+    ):
+        self.indicators = indicators or []
+        self.timeout = timeout
+
+    def register(self, indicator: HealthIndicator | AsyncHealthIndicator) -> None:
+        """register a health indicator"""
+        self.indicators.append(indicator)
+
+    async def get_check(self, indicator: HealthIndicator | AsyncHealthIndicator) -> Check:
+        """evaluate an indicator, sync indicators run in a thread not to block the event loop"""
+        if iscoroutinefunction(indicator.get_check):
+            check = indicator.get_check()
+        else:
+            check = asyncio.to_thread(indicator.get_check)
+        try:
+            return await asyncio.wait_for(check, self.timeout)
+        except asyncio.TimeoutError:
+            observed_value = "timeout"
+        except Exception as error:  # pylint: disable=broad-except
+            logger.exception("health indicator %s failed", indicator.name)
+            observed_value = type(error).__name__
+        return Check(
+            name=indicator.name,
+            time=datetime.now(),
+            status=Status.FAIL,
+            observed_value=observed_value,
+            observed_unit="error",
+        )
+
+    async def get_checks(self) -> list[Check]:
+        """evaluate all registered indicators concurrently"""
+        return list(await asyncio.gather(*map(self.get_check, self.indicators)))
+
+
+class HealthScheduler:
+    """
+    evaluate a registry's indicators in the background, each one on its own interval, and serve
+    their last checks, indicators may define an interval attribute overriding the default one
+    """
+
+    def __init__(
+        self,
+        registry: HealthRegistry,
+        interval: float = config.HEALTH_CHECK_INTERVAL,
+        max_age_factor: float = 3.0,
+    ):
+        self.registry = registry
+        self.interval = interval
+        self.max_age_factor = max_age_factor
+        self._checks: dict[str, tuple[Check, float]] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+
+    def get_interval(self, indicator: HealthIndicator | AsyncHealthIndicator) -> float:
+        """get the evaluation interval of an indicator"""
+        return getattr(indicator, "interval", self.interval)
+
+    async def evaluate(self, indicator: HealthIndicator | AsyncHealthIndicator) -> Check:
+        """evaluate an indicator and cache its check"""
+        check = await self.registry.get_check(indicator)
+        self._checks[indicator.name] = (check, monotonic())
+        return check
+
+    async def _run(self, indicator: HealthIndicator | AsyncHealthIndicator) -> None:
+        interval = self.get_interval(indicator)
+        while not self._stopping.is_set():
+            await self.evaluate(indicator)
+            try:
+                await asyncio.wait_for(self._stopping.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self) -> None:
+        """start evaluating indicators in the background"""
+        if not self._tasks:
+            self._stopping = asyncio.Event()
+            self._tasks = [asyncio.create_task(self._run(i)) for i in self.registry.indicators]
+
+    async def stop(self) -> None:
+        """stop evaluating indicators in the background, letting running evaluations complete"""
+        tasks, self._tasks = self._tasks, []
+        self._stopping.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def get_snapshot(self, indicator: HealthIndicator | AsyncHealthIndicator) -> Check:
+        """
+        get the last check of an indicator, evaluating it if never evaluated, a check older than
+        a few intervals is reported as failing with its age as observed value
+        """
+        if indicator.name not in self._checks:
+            return await self.evaluate(indicator)
+        check, evaluated_at = self._checks[indicator.name]
+        age = monotonic() - evaluated_at
+        if age > self.get_interval(indicator) * self.max_age_factor:
+            return Check(
+                name=check.name,
+                time=check.time,
+                status=Status.FAIL,
+                observed_value=f"{age:.3f}",
+                observed_unit="s",
+            )
+        return check
+
+    async def get_checks(self) -> list[Check]:
+        """get the last check of all registered indicators"""
+        return list(await asyncio.gather(*map(self.get_snapshot, self.registry.indicators)))
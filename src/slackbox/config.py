@@ -14,14 +14,81 @@ def get_string(key: str, default: str) -> str:
     return getenv(key, default)
 
 
+def get_integer(key: str, default: int) -> int:
+    """return integer value from env variables"""
+    return int(getenv(key, default))
+
+
+def get_float(key: str, default: float) -> float:
+    """return float value from env variables"""
+    return float(getenv(key, default))
+
+
 # general config
 SERVICE = get_string("SERVICE", "slackbox")
 VERSION = get_string("VERSION", "dev")
 
+# health configuration
+HEALTH_CHECK_INTERVAL = get_float("HEALTH_CHECK_INTERVAL", 1.0)
+HEALTH_CHECK_TIMEOUT = get_float("HEALTH_CHECK_TIMEOUT", 0.5)
+HEALTH_RESPONSE_TTL = get_float("HEALTH_RESPONSE_TTL", 1.0)
+HEALTH_MAX_EVENT_LOOP_LAG = get_float("HEALTH_MAX_EVENT_LOOP_LAG", 250.0)  # milliseconds
+HEALTH_MAX_MEMORY = get_float("HEALTH_MAX_MEMORY", 512.0)  # mebibytes
+HEALTH_MAX_OPEN_FILES = get_integer("HEALTH_MAX_OPEN_FILES", 1000)
+HEALTH_MAX_SLACK_REQUESTS = get_integer("HEALTH_MAX_SLACK_REQUESTS", 100)
+
 # identifier generation configuration
 IDENTIFIER_ALPHABET = "abcdefghijklmnopqrstuvxyz"
 IDENTIFIER_SIZE = 8
+IDENTIFIER_BUFFER_SIZE = 4096
+IDENTIFIER_POOL_SIZE = 1024
 
 # slack configuration
-SLACK_BOT_TOKEN = get_string("SLACK_BOT_TOKEN", "token")
+SLACK_CLIENT_ID = get_string("SLACK_CLIENT_ID", "client-id")
+SLACK_CLIENT_SECRET = get_string("SLACK_CLIENT_SECRET", "client-secret")
+SLACK_SCOPES = get_string("SLACK_SCOPES", "commands,chat:write")
 SLACK_SIGNING_SECRET = get_string("SLACK_SIGNING_SECRET", "secret")
+SLACK_APP_TOKEN = get_string("SLACK_APP_TOKEN", "app-token")
+SLACK_TRANSPORT = get_string("SLACK_TRANSPORT", "http")  # http or socket
+SLACK_API_URL = get_string("SLACK_API_URL", "https://www.slack.com/api/")
+SLACK_RATE_LIMIT_RETRIES = get_integer("SLACK_RATE_LIMIT_RETRIES", 2)
+SLACK_SIGNATURE_MAX_AGE = get_float("SLACK_SIGNATURE_MAX_AGE", 300.0)  # seconds
+SLACK_MAX_BODY_SIZE = get_integer("SLACK_MAX_BODY_SIZE", 1048576)  # bytes
+
+# slack installation configuration
+SLACK_INSTALLATION_STORE = get_string("SLACK_INSTALLATION_STORE", "sqlite")  # sqlite or file
+SLACK_INSTALLATION_PATH = get_string("SLACK_INSTALLATION_PATH", "slackbox-installations.sqlite3")
+SLACK_INSTALLATION_CACHE_SIZE = get_integer("SLACK_INSTALLATION_CACHE_SIZE", 10000)
+SLACK_INSTALLATION_CACHE_TTL = get_float("SLACK_INSTALLATION_CACHE_TTL", 3600.0)
+
+# socket mode configuration
+SOCKET_MODE_CONCURRENCY = get_integer("SOCKET_MODE_CONCURRENCY", 64)
+SOCKET_MODE_PING_INTERVAL = get_float("SOCKET_MODE_PING_INTERVAL", 10.0)
+SOCKET_MODE_BACKOFF = get_float("SOCKET_MODE_BACKOFF", 0.5)
+SOCKET_MODE_MAX_BACKOFF = get_float("SOCKET_MODE_MAX_BACKOFF", 30.0)
+
+# outbound http configuration
+HTTP_POOL_SIZE = get_integer("HTTP_POOL_SIZE", 100)
+HTTP_POOL_SIZE_PER_HOST = get_integer("HTTP_POOL_SIZE_PER_HOST", 20)
+HTTP_KEEPALIVE_TIMEOUT = get_float("HTTP_KEEPALIVE_TIMEOUT", 30.0)
+HTTP_DNS_CACHE_TTL = get_integer("HTTP_DNS_CACHE_TTL", 300)
+
+# home view configuration
+HOME_VIEW_CACHE_SIZE = get_integer("HOME_VIEW_CACHE_SIZE", 10000)
+HOME_VIEW_CACHE_TTL = get_float("HOME_VIEW_CACHE_TTL", 3600.0)
+
+# background work queue configuration
+WORK_QUEUE_WORKERS = get_integer("WORK_QUEUE_WORKERS", 16)
+WORK_QUEUE_MAX_SIZE = get_integer("WORK_QUEUE_MAX_SIZE", 1000)
+WORK_QUEUE_RETRIES = get_integer("WORK_QUEUE_RETRIES", 2)
+WORK_QUEUE_RETRY_DELAY = get_float("WORK_QUEUE_RETRY_DELAY", 0.5)
+WORK_QUEUE_SHUTDOWN_TIMEOUT = get_float("WORK_QUEUE_SHUTDOWN_TIMEOUT", 5.0)
+WORK_QUEUE_MAX_IN_FLIGHT_PER_TEAM = get_integer("WORK_QUEUE_MAX_IN_FLIGHT_PER_TEAM", 8)
+WORK_QUEUE_MAX_IN_FLIGHT_PER_USER = get_integer("WORK_QUEUE_MAX_IN_FLIGHT_PER_USER", 2)
+WORK_QUEUE_MAX_PENDING_PER_TEAM = get_integer("WORK_QUEUE_MAX_PENDING_PER_TEAM", 100)
+
+# slack event deduplication configuration
+EVENT_DEDUPLICATION_BACKEND = get_string("EVENT_DEDUPLICATION_BACKEND", "memory")
+EVENT_DEDUPLICATION_PATH = get_string("EVENT_DEDUPLICATION_PATH", "slackbox-events.sqlite3")
+EVENT_DEDUPLICATION_SIZE = get_integer("EVENT_DEDUPLICATION_SIZE", 10000)
+EVENT_DEDUPLICATION_TTL = get_float("EVENT_DEDUPLICATION_TTL", 900.0)
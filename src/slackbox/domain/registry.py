@@ -0,0 +1,114 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+slackbox slack handler registry
+"""
+
+import re
+from enum import Enum
+from importlib import import_module
+from inspect import signature
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+
+from slack_bolt.async_app import AsyncApp
+from slack_bolt.kwargs_injection.async_utils import build_async_required_kwargs
+
+Handler = Callable[..., Awaitable[Any]]
+ANYTHING = re.compile("")
+
+
+class RouteKind(Enum):
+    """kinds of slack requests routed by the registry"""
+
+    EVENT = "event"
+    COMMAND = "command"
+    ACTION = "action"
+
+
+Route = tuple[RouteKind, str]
+
+
+def get_route(body: dict) -> Optional[Route]:
+    """get the route of a slack request from its event type, command name or action id"""
+    if "command" in body:
+        return RouteKind.COMMAND, body["command"]
+    if body.get("type") == "event_callback":
+        return RouteKind.EVENT, body.get("event", {}).get("type", "")
+    if body.get("type") == "block_actions" and body.get("actions"):
+        return RouteKind.ACTION, body["actions"][0].get("action_id", "")
+    return None
+
+
+class HandlerRegistry:
+    """
+    route slack requests to their handler through a lookup table, handlers registered as
+    "module:attribute" strings being imported on first dispatch
+    """
+
+    def __init__(self, app: AsyncApp):
+        self._handlers: dict[Route, Handler | str] = {}
+        self._arg_names: dict[Handler, list[str]] = {}
+        # a single bolt listener per kind, matching the routes present in the lookup table
+        app.event(ANYTHING, matchers=[self.matches])(self.dispatch)
+        app.command(ANYTHING, matchers=[self.matches])(self.dispatch)
+        app.action(ANYTHING, matchers=[self.matches])(self.dispatch)
+
+    def register(self, kind: RouteKind, key: str, handler: Handler | str) -> None:
+        """register the handler of a route, either as a function or as a "module:attribute" path"""
+        self._handlers[(kind, key)] = handler
+
+    def _decorator(self, kind: RouteKind, key: str) -> Callable[[Handler], Handler]:
+        def decorator(handler: Handler) -> Handler:
+            self.register(kind, key, handler)
+            return handler
+
+        return decorator
+
+    def event(self, event_type: str) -> Callable[[Handler], Handler]:
+        """decorator registering an event handler"""
+        return self._decorator(RouteKind.EVENT, event_type)
+
+    def command(self, command: str) -> Callable[[Handler], Handler]:
+        """decorator registering a command handler"""
+        return self._decorator(RouteKind.COMMAND, command)
+
+    def action(self, action_id: str) -> Callable[[Handler], Handler]:
+        """decorator registering an action handler"""
+        return self._decorator(RouteKind.ACTION, action_id)
+
+    def resolve(self, route: Route) -> Optional[Handler]:
+        """get the handler of a route, importing it on first use"""
+        handler = self._handlers.get(route)
+        if isinstance(handler, str):
+            module, _, attribute = handler.partition(":")
+            handler = getattr(import_module(module), attribute)
+            self._handlers[route] = handler
+        return handler
+
+    async def matches(self, body: dict) -> bool:
+        """check if a handler is registered for the request"""
+        route = get_route(body)
+        return route is not None and route in self._handlers
+
+    async def dispatch(self, request, response, logger) -> Any:
+        """call the request's handler with the bolt arguments it expects"""
+        route = get_route(request.body)
+        handler = self.resolve(route) if route is not None else None
+        if handler is None:
+            return None
+        if handler not in self._arg_names:
+            self._arg_names[handler] = list(signature(handler).parameters)
+        kwargs = build_async_required_kwargs(
+            logger=logger,
+            required_arg_names=list(self._arg_names[handler]),
+            request=request,
+            response=response,
+            this_func=handler,
+            next_keys_required=False,
+        )
+        return await handler(**kwargs)
@@ -8,19 +8,104 @@ slackbox slack domain
 
 from __future__ import annotations
 
+import asyncio
+import json
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import Optional
 from typing import Protocol
 from typing import TypeAlias
 
 from slack_bolt.async_app import AsyncApp
+from slack_bolt.context.respond.async_respond import AsyncRespond
+from slack_bolt.oauth.async_oauth_settings import AsyncOAuthSettings
 
 from slackbox import config
+from slackbox.domain.registry import HandlerRegistry
+from slackbox.domain.templates import Template
+from slackbox.infrastructure.http import HTTPSession
+from slackbox.infrastructure.installations import CachedAuthorize
+from slackbox.infrastructure.installations import create_installation_store
+from slackbox.infrastructure.queue import FairWorkQueue
+from slackbox.infrastructure.queue import Priority
+from slackbox.infrastructure.queue import WorkQueueFull
+from slackbox.infrastructure.slack import RateLimitedWebClient
+from slackbox.infrastructure.slack import RateLimiter
+from slackbox.infrastructure.slack import SessionRespond
+from slackbox.utils.caches import TTLCache
 
 Block: TypeAlias = dict[str, str | dict[str, str]]
 View: TypeAlias = dict[str, str | list[Block]]
+# slack's block kit limits
+MAX_VIEW_BLOCKS = 100
+MAX_TEXT_LENGTH = 3000
+# ephemeral answer to commands shed while the work queue is full
+BUSY_MESSAGE = "slackbox is busy, please try again in a moment"
+# views rendered from templates are json strings, accepted as is by the web api
+RenderedView: TypeAlias = View | str
+rate_limiter = RateLimiter()
+http_session = HTTPSession()
+installation_store = create_installation_store()
+oauth_settings = AsyncOAuthSettings(
+    client_id=config.SLACK_CLIENT_ID,
+    client_secret=config.SLACK_CLIENT_SECRET,
+    scopes=config.SLACK_SCOPES,
+    installation_store=installation_store,
+    installation_store_bot_only=True,
+)
+# requests are authorized from in memory caches, the installation store being hit on misses only
+oauth_settings.authorize = CachedAuthorize(installation_store)
+# listeners only acknowledge and queue their work, they can be run before responding to slack,
+# request signatures are verified by the api's slack signature middleware
 app = AsyncApp(
-    token=config.SLACK_BOT_TOKEN,
+    client=RateLimitedWebClient(base_url=config.SLACK_API_URL, rate_limiter=rate_limiter),
     signing_secret=config.SLACK_SIGNING_SECRET,
+    oauth_settings=oauth_settings,
+    process_before_response=True,
+    request_verification_enabled=False,
 )
+# uninstallations delete the workspace's installation, evicting its cached bot
+app.enable_token_revocation_listeners()
+# background work is shared fairly between workspaces and their users
+work_queue = FairWorkQueue()
+handlers = HandlerRegistry(app)
+
+
+@app.middleware
+async def share_client_resources(context, next_):
+    """share the app's rate limiter and http session with the clients bolt creates per request"""
+    session = http_session.session
+    context["client"] = RateLimitedWebClient.from_client(
+        context.client, rate_limiter, session=session
+    )
+    if context.response_url is not None:
+        context["respond"] = SessionRespond(
+            response_url=context.response_url,
+            session=session,
+            proxy=context.client.proxy,
+            ssl=context.client.ssl,
+        )
+    return await next_()
+
+
+class DeliveryError(Exception):
+    """raised when a message could not be delivered to slack"""
+
+
+class BlockKitLimitExceeded(Exception):
+    """raised when a block or a view exceeds slack's block kit limits"""
+
+
+def get_encoded_size(payload: Block | View) -> int:
+    """get the size of a payload once encoded as sent to slack"""
+    return len(json.dumps(payload, separators=(",", ":")).encode())
+
+
+def validate_block(block: Block) -> None:
+    """check a block against slack's block kit limits"""
+    text = block.get("text")
+    if isinstance(text, dict) and len(text.get("text", "")) > MAX_TEXT_LENGTH:
+        raise BlockKitLimitExceeded(f"block text is longer than {MAX_TEXT_LENGTH} characters")
 
 
 class BlockBuilder(Protocol):
@@ -57,49 +142,207 @@ class MarkdownBlockBuilder(BlockBuilder):
 
 
 class ViewBuilder:
-    """class helping building a slack view"""
+    """class helping building a slack view within slack's block kit limits"""
 
-    def __init__(self, type_: str, callback_id: str):
+    def __init__(
+        self,
+        type_: str,
+        callback_id: str,
+        max_blocks: int = MAX_VIEW_BLOCKS,
+        max_size: Optional[int] = None,
+    ):
         self.type_ = type_
         self.callback_id = callback_id
+        self.max_blocks = max_blocks
+        self.max_size = max_size
         self._blocks: list[Block] = []
+        self._block_sizes: list[int] = []
+        self.size = get_encoded_size(self._build([]))
 
     def add_block(self, block: Block) -> ViewBuilder:
-        """add a block to the view"""
+        """add a block to the view, raising BlockKitLimitExceeded for invalid blocks"""
+        validate_block(block)
+        block_size = get_encoded_size(block)
+        self.size += block_size + (1 if self._blocks else 0)
         self._blocks.append(block)
+        self._block_sizes.append(block_size)
         return self
 
-    def build(self) -> View:
-        """build a slack view from aggregated blocks"""
+    def _build(self, blocks: list[Block]) -> View:
         return {
             "type": self.type_,
             "callback_id": self.callback_id,
-            "blocks": self._blocks,
+            "blocks": blocks,
         }
 
+    def build(self) -> View:
+        """build a slack view from aggregated blocks, raising BlockKitLimitExceeded if too big"""
+        if len(self._blocks) > self.max_blocks:
+            raise BlockKitLimitExceeded(
+                f"view has {len(self._blocks)} blocks, more than {self.max_blocks}"
+            )
+        if self.max_size is not None and self.size > self.max_size:
+            raise BlockKitLimitExceeded(f"view takes {self.size} bytes, more than {self.max_size}")
+        return self._build(self._blocks)
+
+    def build_pages(self) -> list[View]:
+        """build as many views as needed to hold the aggregated blocks within limits"""
+        empty_size = get_encoded_size(self._build([]))
+        pages: list[list[Block]] = [[]]
+        size = empty_size
+        for block, block_size in zip(self._blocks, self._block_sizes):
+            page_size = size + block_size + (1 if pages[-1] else 0)
+            too_big = self.max_size is not None and page_size > self.max_size
+            if pages[-1] and (len(pages[-1]) == self.max_blocks or too_big):
+                pages.append([])
+                page_size = empty_size + block_size
+            if self.max_size is not None and page_size > self.max_size:
+                raise BlockKitLimitExceeded(f"block takes more than {self.max_size} bytes")
+            pages[-1].append(block)
+            size = page_size
+        return [self._build(blocks) for blocks in pages]
 
-@app.command("/beerbox")
-async def beerbox_controller(ack, respond, command):
-    """command controller"""
-    await ack()
-    await respond(f"you requested '{command['text']}' from beerbox")
 
+async def process_beerbox_command(respond: AsyncRespond, text: str) -> None:
+    """process a beerbox command, delivering the result to the command's response url"""
+    response = await respond(f"you requested '{text}' from beerbox")
+    if response.status_code != 200:
+        raise DeliveryError(f"response url answered with status {response.status_code}")
+
+
+class HomeViewCache:
+    """remember the home view last published to each user to avoid publishing it again"""
+
+    def __init__(
+        self,
+        max_size: int = config.HOME_VIEW_CACHE_SIZE,
+        ttl: float = config.HOME_VIEW_CACHE_TTL,
+    ):
+        self.version = 0
+        self._digests: TTLCache[tuple[str, int], bytes] = TTLCache(max_size, ttl)
+
+    @staticmethod
+    def get_digest(view: RenderedView) -> bytes:
+        """get a digest identifying the view's content"""
+        if isinstance(view, str):
+            content = view.encode()
+        else:
+            content = json.dumps(view, sort_keys=True, separators=(",", ":")).encode()
+        return blake2b(content, digest_size=16).digest()
+
+    def is_published(self, user: str, view: RenderedView) -> bool:
+        """check if the view is the last one published to the user"""
+        return self._digests.get((user, self.version)) == self.get_digest(view)
+
+    def set_published(self, user: str, view: RenderedView) -> None:
+        """remember the view as the last one published to the user"""
+        self._digests.set((user, self.version), self.get_digest(view))
 
-@app.event("app_home_opened")
-async def home_controller(client, event, logger):
-    """home controller"""
+    def invalidate(self, user: Optional[str] = None) -> None:
+        """forget the view published to a user, or to all users when the content changes"""
+        if user is None:
+            self.version += 1
+        else:
+            self._digests.delete((user, self.version))
+
+
+home_views = HomeViewCache()
+
+
+@dataclass
+class HomePublisherStats:
+    """home publisher counters"""
+
+    published: int = 0
+    coalesced: int = 0
+    superseded: int = 0
+
+
+class HomePublisher:
+    """
+    publish at most one home view per user at a time, concurrent publishes of the same view
+    share the in flight request and views superseded while waiting are dropped
+    """
+
+    def __init__(self) -> None:
+        self.stats = HomePublisherStats()
+        self._in_flight: dict[str, tuple[bytes, asyncio.Future]] = {}
+        self._latest: dict[str, bytes] = {}
+
+    async def publish(self, client, user: str, view: RenderedView) -> None:
+        """publish the view to the user unless superseded by a more recent one"""
+        digest = HomeViewCache.get_digest(view)
+        self._latest[user] = digest
+        while user in self._in_flight:
+            in_flight_digest, future = self._in_flight[user]
+            if in_flight_digest == digest:
+                self.stats.coalesced += 1
+                await asyncio.shield(future)
+                return
+            await asyncio.wait([future])
+            if self._latest.get(user) != digest:
+                self.stats.superseded += 1
+                return
+        future = asyncio.ensure_future(client.views_publish(user_id=user, view=view))
+        self._in_flight[user] = (digest, future)
+        self.stats.published += 1
+        try:
+            await asyncio.shield(future)
+        finally:
+            del self._in_flight[user]
+            if self._latest.get(user) == digest:
+                del self._latest[user]
+
+
+home_publisher = HomePublisher()
+
+
+@handlers.command("/beerbox")
+async def beerbox_controller(ack, respond, command, context):
+    """command controller, telling the user to retry when the work queue is full"""
     try:
-        divider = DividerBlockBuilder().build()
-        title = MarkdownBlockBuilder().text("*Welcome to your beerbox's home page*").build()
-        content = (
-            MarkdownBlockBuilder().text("Thanks to FastAPI, much more is coming soon.").build()
+        work_queue.submit(
+            lambda: process_beerbox_command(respond, command["text"]),
+            priority=Priority.HIGH,
+            team=context.team_id or "",
+            user=context.user_id or "",
         )
+    except WorkQueueFull:
+        await ack(BUSY_MESSAGE)
+        return
+    await ack()
+
+
+home_template = Template(
+    ViewBuilder(type_="home", callback_id="home_view")
+    .add_block(MarkdownBlockBuilder().text("*Welcome to your beerbox's home page*").build())
+    .add_block(DividerBlockBuilder().build())
+    .add_block(MarkdownBlockBuilder().text("Thanks to FastAPI, much more is coming soon.").build())
+    .build()
+)
 
-        view = ViewBuilder(type_="home", callback_id="home_view")
-        view.add_block(title)
-        view.add_block(divider)
-        view.add_block(content)
 
-        await client.views_publish(user_id=event["user"], view=view.build())
+async def publish_home(client, user: str, logger) -> None:
+    """publish the home view of a user"""
+    try:
+        home_view = home_template.render()
+        if home_views.is_published(user, home_view):
+            return
+        await home_publisher.publish(client, user, home_view)
+        home_views.set_published(user, home_view)
     except Exception as error:  # pylint: disable=broad-except
         logger.error(f"Error publishing home tab: {error}")
+
+
+@handlers.event("app_home_opened")
+async def home_controller(client, event, logger, context):
+    """home controller, the home view being published on the next opening when busy"""
+    try:
+        work_queue.submit(
+            lambda: publish_home(client, event["user"], logger),
+            priority=Priority.LOW,
+            team=context.team_id or "",
+            user=event["user"],
+        )
+    except WorkQueueFull:
+        logger.warning("work queue is full, home view of %s not published", event["user"])
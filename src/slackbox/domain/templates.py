@@ -0,0 +1,125 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+slackbox precompiled block kit templates
+"""
+
+import json
+from string import Formatter
+from types import MappingProxyType
+from typing import Any
+from typing import Callable
+from typing import Mapping
+
+Encoder = Callable[[Any], str]
+
+
+class Slot:
+    """placeholder for a whole value filled when rendering a template"""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"Slot({self.name!r})"
+
+
+class Text:
+    """string with {name} fields filled when rendering a template, literal braces being doubled"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def __repr__(self) -> str:
+        return f"Text({self.text!r})"
+
+
+def _encode_value(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _encode_text(value: Any) -> str:
+    return _encode_value(str(value))[1:-1]
+
+
+def freeze(value: Any) -> Any:
+    """get an immutable copy of a json compatible value"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class Template:
+    """
+    json payload declared once and serialized ahead of time, only its slots being filled
+    per render, slots are either Slot values or {name} fields in Text strings, plain strings
+    being static
+    """
+
+    def __init__(self, payload: Mapping[str, Any]):
+        self.payload = freeze(payload)
+        parts: list[str | tuple[str, Encoder]] = []
+        self._compile(self.payload, parts)
+        self._slots: list[tuple[str, str, Encoder]] = []
+        literal = ""
+        for part in parts:
+            if isinstance(part, str):
+                literal += part
+            else:
+                self._slots.append((literal, *part))
+                literal = ""
+        self._tail = literal
+
+    @property
+    def slots(self) -> set[str]:
+        """names of the slots to fill when rendering"""
+        return {name for _, name, _ in self._slots}
+
+    def _compile(self, value: Any, parts: list[str | tuple[str, Encoder]]) -> None:
+        """append the serialized value to parts, slots being appended as (name, encoder)"""
+        if isinstance(value, Slot):
+            parts.append((value.name, _encode_value))
+        elif isinstance(value, Text):
+            parts.append('"')
+            for literal, name, spec, conversion in Formatter().parse(value.text):
+                parts.append(_encode_text(literal))
+                if name is None:
+                    continue
+                if not name.isidentifier() or spec or conversion:
+                    raise ValueError(f"invalid template slot in {value!r}")
+                parts.append((name, _encode_text))
+            parts.append('"')
+        elif isinstance(value, Mapping):
+            parts.append("{")
+            for index, (key, item) in enumerate(value.items()):
+                parts.append(("," if index else "") + _encode_value(key) + ":")
+                self._compile(item, parts)
+            parts.append("}")
+        elif isinstance(value, (list, tuple)):
+            parts.append("[")
+            for index, item in enumerate(value):
+                if index:
+                    parts.append(",")
+                self._compile(item, parts)
+            parts.append("]")
+        else:
+            parts.append(_encode_value(value))
+
+    def render(self, **values: Any) -> str:
+        """render the payload to a json string, splicing the slot values"""
+        if not self._slots:
+            return self._tail
+        chunks = []
+        for literal, name, encode in self._slots:
+            chunks.append(literal)
+            chunks.append(encode(values[name]))
+        chunks.append(self._tail)
+        return "".join(chunks)
+
+    def to_dict(self, **values: Any) -> dict[str, Any]:
+        """render the payload to a new dictionary"""
+        return json.loads(self.render(**values))
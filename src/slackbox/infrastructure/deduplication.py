@@ -0,0 +1,124 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+slackbox deduplication backends remembering already received keys
+"""
+
+import asyncio
+import sqlite3
+from threading import Lock
+from time import time
+from typing import Optional
+from typing import Protocol
+
+from slackbox import config
+from slackbox.utils.caches import TTLCache
+
+
+class DeduplicationBackend(Protocol):
+    """protocol for all deduplication backends"""
+
+    async def add(self, key: str) -> bool:
+        """remember the key, returning False if it was already known"""
+        ...
+
+    async def remove(self, key: str) -> None:
+        """forget the key, so that it can be added again"""
+        ...
+
+
+class MemoryDeduplicationBackend:
+    """deduplication backend remembering keys in a bounded in memory cache"""
+
+    def __init__(
+        self,
+        max_size: int = config.EVENT_DEDUPLICATION_SIZE,
+        ttl: float = config.EVENT_DEDUPLICATION_TTL,
+    ):
+        self._keys: TTLCache[str, bool] = TTLCache(max_size, ttl)
+
+    async def add(self, key: str) -> bool:
+        """remember the key, returning False if it was already known"""
+        if key in self._keys:
+            return False
+        self._keys.set(key, True)
+        return True
+
+    async def remove(self, key: str) -> None:
+        """forget the key, so that it can be added again"""
+        self._keys.delete(key)
+
+
+class SQLiteDeduplicationBackend:
+    """deduplication backend remembering keys in a sqlite file shared by local workers"""
+
+    purge_interval = 1000
+
+    def __init__(
+        self,
+        path: str = config.EVENT_DEDUPLICATION_PATH,
+        ttl: float = config.EVENT_DEDUPLICATION_TTL,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self._additions = 0
+        self._lock = Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS keys (key TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def add_sync(self, key: str) -> bool:
+        """remember the key, returning False if it was already known"""
+        now = time()
+        with self._lock, self._connect() as connection:
+            self._additions += 1
+            if self._additions % self.purge_interval == 0:
+                connection.execute("DELETE FROM keys WHERE expires_at < ?", (now,))
+            else:
+                connection.execute("DELETE FROM keys WHERE key = ? AND expires_at < ?", (key, now))
+            cursor = connection.execute(
+                "INSERT OR IGNORE INTO keys (key, expires_at) VALUES (?, ?)",
+                (key, now + self.ttl),
+            )
+            return cursor.rowcount == 1
+
+    async def add(self, key: str) -> bool:
+        """remember the key without blocking the event loop"""
+        return await asyncio.to_thread(self.add_sync, key)
+
+    def remove_sync(self, key: str) -> None:
+        """forget the key, so that it can be added again"""
+        with self._lock, self._connect() as connection:
+            connection.execute("DELETE FROM keys WHERE key = ?", (key,))
+
+    async def remove(self, key: str) -> None:
+        """forget the key without blocking the event loop"""
+        await asyncio.to_thread(self.remove_sync, key)
+
+    def close(self) -> None:
+        """close the connection to the sqlite file"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def create_deduplication_backend(
+    name: str = config.EVENT_DEDUPLICATION_BACKEND,
+) -> DeduplicationBackend:
+    """create the deduplication backend of the given name"""
+    if name == "memory":
+        return MemoryDeduplicationBackend()
+    if name == "sqlite":
+        return SQLiteDeduplicationBackend()
+    raise ValueError(f"unknown deduplication backend {name!r}, expected 'memory' or 'sqlite'")
@@ -0,0 +1,49 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+slackbox shared http session
+"""
+
+from typing import Optional
+
+from aiohttp import ClientSession
+from aiohttp import TCPConnector
+
+from slackbox import config
+
+
+class HTTPSession:
+    """aiohttp client session pooling outbound connections, created on startup"""
+
+    def __init__(
+        self,
+        pool_size: int = config.HTTP_POOL_SIZE,
+        pool_size_per_host: int = config.HTTP_POOL_SIZE_PER_HOST,
+        keepalive_timeout: float = config.HTTP_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl: int = config.HTTP_DNS_CACHE_TTL,
+    ):
+        self.pool_size = pool_size
+        self.pool_size_per_host = pool_size_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.session: Optional[ClientSession] = None
+
+    async def start(self) -> None:
+        """open the session on the running event loop"""
+        if self.session is not None and not self.session.closed:
+            return
+        connector = TCPConnector(
+            limit=self.pool_size,
+            limit_per_host=self.pool_size_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+        )
+        self.session = ClientSession(connector=connector)
+
+    async def stop(self) -> None:
+        """close the session and its pooled connections"""
+        session, self.session = self.session, None
+        if session is not None:
+            await session.close()
@@ -0,0 +1,219 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+slackbox multi workspace installation storage and authorization
+"""
+
+import asyncio
+import os
+from logging import Logger
+from typing import Optional
+
+from slack_bolt.authorization import AuthorizeResult
+from slack_bolt.authorization.async_authorize import AsyncAuthorize
+from slack_bolt.context.async_context import AsyncBoltContext
+from slack_sdk.errors import SlackApiError
+from slack_sdk.oauth.installation_store import Bot
+from slack_sdk.oauth.installation_store import FileInstallationStore
+from slack_sdk.oauth.installation_store import Installation
+from slack_sdk.oauth.installation_store import InstallationStore
+from slack_sdk.oauth.installation_store.async_installation_store import AsyncInstallationStore
+from slack_sdk.oauth.installation_store.sqlite3 import SQLite3InstallationStore
+
+from slackbox import config
+from slackbox.utils.caches import TTLCache
+
+InstallationKey = tuple[Optional[str], Optional[str]]
+
+
+def get_installation_key(
+    enterprise_id: Optional[str],
+    team_id: Optional[str],
+    is_enterprise_install: Optional[bool] = False,
+) -> InstallationKey:
+    """get the key of a workspace installation, org wide installations ignoring the team"""
+    return enterprise_id, None if is_enterprise_install else team_id
+
+
+def check_installation_store(store: InstallationStore) -> None:
+    """make sure an installation store can be written, raising an error otherwise"""
+    if isinstance(store, SQLite3InstallationStore):
+        # creates the database and its tables when missing
+        store.init()
+    elif isinstance(store, FileInstallationStore):
+        os.makedirs(store.base_dir, exist_ok=True)
+        if not os.access(store.base_dir, os.W_OK):
+            raise PermissionError(f"installation directory {store.base_dir} is not writable")
+
+
+class CachedInstallationStore(AsyncInstallationStore):
+    """
+    installation store running a synchronous store in worker threads, installed bots being kept
+    in a bounded in memory cache evicted on every save and delete
+    """
+
+    def __init__(
+        self,
+        store: InstallationStore,
+        max_size: int = config.SLACK_INSTALLATION_CACHE_SIZE,
+        ttl: float = config.SLACK_INSTALLATION_CACHE_TTL,
+    ):
+        self.store = store
+        self._bots: TTLCache[InstallationKey, Bot] = TTLCache(max_size, ttl)
+
+    @property
+    def logger(self) -> Logger:
+        return self.store.logger
+
+    async def check(self) -> None:
+        """make sure the store can be written, for the service to fail on startup otherwise"""
+        await asyncio.to_thread(check_installation_store, self.store)
+
+    def evict(self, enterprise_id: Optional[str], team_id: Optional[str]) -> None:
+        """remove the cached bots of a workspace and of its organization"""
+        self._bots.delete((enterprise_id, team_id))
+        self._bots.delete((enterprise_id, None))
+
+    async def async_save(self, installation: Installation) -> None:
+        await asyncio.to_thread(self.store.save, installation)
+        self.evict(installation.enterprise_id, installation.team_id)
+
+    async def async_save_bot(self, bot: Bot) -> None:
+        await asyncio.to_thread(self.store.save_bot, bot)
+        self.evict(bot.enterprise_id, bot.team_id)
+
+    async def async_find_bot(
+        self,
+        *,
+        enterprise_id: Optional[str],
+        team_id: Optional[str],
+        is_enterprise_install: Optional[bool] = False,
+    ) -> Optional[Bot]:
+        key = get_installation_key(enterprise_id, team_id, is_enterprise_install)
+        bot = self._bots.get(key)
+        if bot is None:
+            bot = await asyncio.to_thread(
+                self.store.find_bot,
+                enterprise_id=enterprise_id,
+                team_id=team_id,
+                is_enterprise_install=is_enterprise_install,
+            )
+            if bot is not None:
+                self._bots.set(key, bot)
+        return bot
+
+    async def async_find_installation(
+        self,
+        *,
+        enterprise_id: Optional[str],
+        team_id: Optional[str],
+        user_id: Optional[str] = None,
+        is_enterprise_install: Optional[bool] = False,
+    ) -> Optional[Installation]:
+        return await asyncio.to_thread(
+            self.store.find_installation,
+            enterprise_id=enterprise_id,
+            team_id=team_id,
+            user_id=user_id,
+            is_enterprise_install=is_enterprise_install,
+        )
+
+    async def async_delete_bot(
+        self,
+        *,
+        enterprise_id: Optional[str],
+        team_id: Optional[str],
+    ) -> None:
+        self.evict(enterprise_id, team_id)
+        await asyncio.to_thread(
+            self.store.delete_bot, enterprise_id=enterprise_id, team_id=team_id
+        )
+
+    async def async_delete_installation(
+        self,
+        *,
+        enterprise_id: Optional[str],
+        team_id: Optional[str],
+        user_id: Optional[str] = None,
+    ) -> None:
+        self.evict(enterprise_id, team_id)
+        await asyncio.to_thread(
+            self.store.delete_installation,
+            enterprise_id=enterprise_id,
+            team_id=team_id,
+            user_id=user_id,
+        )
+
+    async def async_delete_all(
+        self,
+        *,
+        enterprise_id: Optional[str],
+        team_id: Optional[str],
+    ) -> None:
+        self.evict(enterprise_id, team_id)
+        await asyncio.to_thread(
+            self.store.delete_all, enterprise_id=enterprise_id, team_id=team_id
+        )
+
+
+class CachedAuthorize(AsyncAuthorize):
+    """
+    authorize requests with the bot installed in their workspace, the auth.test results being
+    cached per bot token so that authorizing an event is two in memory lookups
+    """
+
+    def __init__(
+        self,
+        installation_store: AsyncInstallationStore,
+        max_size: int = config.SLACK_INSTALLATION_CACHE_SIZE,
+        ttl: float = config.SLACK_INSTALLATION_CACHE_TTL,
+    ):
+        super().__init__()
+        self.installation_store = installation_store
+        self._results: TTLCache[str, AuthorizeResult] = TTLCache(max_size, ttl)
+
+    async def __call__(
+        self,
+        *,
+        context: AsyncBoltContext,
+        enterprise_id: Optional[str],
+        team_id: Optional[str],
+        user_id: Optional[str],
+    ) -> Optional[AuthorizeResult]:
+        bot = await self.installation_store.async_find_bot(
+            enterprise_id=enterprise_id,
+            team_id=team_id,
+            is_enterprise_install=context.is_enterprise_install,
+        )
+        if bot is None or bot.bot_token is None or context.client is None:
+            return None
+        result = self._results.get(bot.bot_token)
+        if result is None:
+            try:
+                response = await context.client.auth_test(token=bot.bot_token)
+            except SlackApiError:
+                return None
+            result = AuthorizeResult.from_auth_test_response(
+                auth_test_response=response,  # type: ignore
+                bot_token=bot.bot_token,
+                user_token=None,
+            )
+            self._results.set(bot.bot_token, result)
+        return result
+
+
+def create_installation_store(
+    name: str = config.SLACK_INSTALLATION_STORE,
+    path: str = config.SLACK_INSTALLATION_PATH,
+    client_id: str = config.SLACK_CLIENT_ID,
+) -> CachedInstallationStore:
+    """create the cached installation store of the given name"""
+    if name == "sqlite":
+        return CachedInstallationStore(
+            SQLite3InstallationStore(database=path, client_id=client_id)
+        )
+    if name == "file":
+        return CachedInstallationStore(FileInstallationStore(base_dir=path, client_id=client_id))
+    raise ValueError(f"unknown installation store {name!r}, expected 'sqlite' or 'file'")
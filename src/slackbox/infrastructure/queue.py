@@ -0,0 +1,395 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+slackbox in process background work queue
+"""
+
+import asyncio
+import heapq
+import logging
+from collections import deque
+from dataclasses import dataclass
+from dataclasses import field
+from enum import IntEnum
+from itertools import count
+from time import monotonic
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+
+from slackbox import config
+
+Job = Callable[[], Awaitable[Any]]
+QueuedJob = tuple[int, int, float, Job]
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """job priorities, lower values are run first"""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+class WorkQueueFull(Exception):
+    """raised when submitting a job to a full work queue"""
+
+
+@dataclass
+class WorkQueueStats:
+    """work queue counters, wait times are measured in seconds"""
+
+    submitted: int = 0
+    processed: int = 0
+    failed: int = 0
+    shed: int = 0
+    total_wait_time: float = 0.0
+    max_wait_time: float = 0.0
+
+
+class WorkQueue:  # pylint: disable=too-many-instance-attributes
+    """
+    bounded priority queue running jobs in the background on a limited number of workers,
+    retrying failures and shedding jobs when full
+    """
+
+    def __init__(
+        self,
+        workers: int = config.WORK_QUEUE_WORKERS,
+        max_size: int = config.WORK_QUEUE_MAX_SIZE,
+        retries: int = config.WORK_QUEUE_RETRIES,
+        retry_delay: float = config.WORK_QUEUE_RETRY_DELAY,
+    ):
+        self.workers = workers
+        self.max_size = max_size
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.stats = WorkQueueStats()
+        self._sequence = count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: asyncio.PriorityQueue[QueuedJob] = asyncio.PriorityQueue(max_size)
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def depth(self) -> int:
+        """number of jobs waiting for a worker"""
+        return self._queue.qsize()
+
+    def full(self) -> bool:
+        """check if the queue can not accept more jobs"""
+        return self._queue.full()
+
+    async def start(self) -> None:
+        """start the workers on the running event loop"""
+        self._ensure_started()
+
+    async def stop(self, timeout: float = config.WORK_QUEUE_SHUTDOWN_TIMEOUT) -> None:
+        """wait for queued jobs to be processed, then stop the workers"""
+        if self._loop is not asyncio.get_running_loop():
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("%d queued jobs dropped on shutdown", self._queue.qsize())
+        tasks, self._tasks, self._loop = self._tasks, [], None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _ensure_started(self) -> None:
+        """start workers if not yet running on the current event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.PriorityQueue(self.max_size)
+        self._tasks = [loop.create_task(self._work()) for _ in range(self.workers)]
+
+    def submit(self, job: Job, priority: Priority = Priority.NORMAL) -> None:
+        """queue a job to be run in the background, raise WorkQueueFull when the queue is full"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((priority, next(self._sequence), monotonic(), job))
+        except asyncio.QueueFull as error:
+            self.stats.shed += 1
+            raise WorkQueueFull(
+                f"work queue reached its maximum size of {self.max_size}"
+            ) from error
+        self.stats.submitted += 1
+
+    async def _work(self) -> None:
+        while True:
+            _, _, queued_at, job = await self._queue.get()
+            wait_time = monotonic() - queued_at
+            self.stats.total_wait_time += wait_time
+            self.stats.max_wait_time = max(self.stats.max_wait_time, wait_time)
+            try:
+                await self._run(job)
+            finally:
+                self.stats.processed += 1
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        """run a job, retrying it with an exponential backoff on failure"""
+        for attempt in range(self.retries + 1):
+            try:
+                await job()
+                return
+            except Exception:  # pylint: disable=broad-except
+                if attempt == self.retries:
+                    logger.exception("job %r failed after %d attempts", job, attempt + 1)
+                    self.stats.failed += 1
+                    return
+                logger.warning("job %r failed, retrying", job, exc_info=True)
+                await asyncio.sleep(self.retry_delay * 2**attempt)
+
+
+@dataclass
+class TenantStats:
+    """per tenant counters, wait times and latencies are measured in seconds"""
+
+    submitted: int = 0
+    processed: int = 0
+    shed: int = 0
+    total_wait_time: float = 0.0
+    max_wait_time: float = 0.0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        """mean time between the submission and the completion of a job"""
+        return self.total_latency / self.processed if self.processed else 0.0
+
+
+@dataclass
+class PriorityLane:
+    """jobs of a single priority queued by the users of a team, in submission order"""
+
+    users: dict[str, deque[QueuedJob]] = field(default_factory=dict)
+    ready_users: deque[str] = field(default_factory=deque)
+
+
+@dataclass
+class TeamQueue:
+    """jobs queued by the users of a team per priority, with the team's scheduling state"""
+
+    weight: float = 1.0
+    virtual_time: float = 0.0
+    pending: int = 0
+    in_flight: int = 0
+    lanes: dict[int, PriorityLane] = field(default_factory=dict)
+    users_in_flight: dict[str, int] = field(default_factory=dict)
+
+
+class FairWorkQueue(WorkQueue):  # pylint: disable=too-many-instance-attributes
+    """
+    work queue sharing its workers fairly between teams, jobs being run by priority and, within
+    a priority, teams being served by weighted fair queueing and their users in turn, the jobs
+    in flight being bounded per team and per user and the queued jobs per team
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        workers: int = config.WORK_QUEUE_WORKERS,
+        max_size: int = config.WORK_QUEUE_MAX_SIZE,
+        retries: int = config.WORK_QUEUE_RETRIES,
+        retry_delay: float = config.WORK_QUEUE_RETRY_DELAY,
+        max_in_flight_per_team: int = config.WORK_QUEUE_MAX_IN_FLIGHT_PER_TEAM,
+        max_in_flight_per_user: int = config.WORK_QUEUE_MAX_IN_FLIGHT_PER_USER,
+        max_pending_per_team: int = config.WORK_QUEUE_MAX_PENDING_PER_TEAM,
+        weights: Optional[dict[str, float]] = None,
+    ):
+        super().__init__(workers, max_size, retries, retry_delay)
+        self.max_in_flight_per_team = max_in_flight_per_team
+        self.max_in_flight_per_user = max_in_flight_per_user
+        self.max_pending_per_team = max_pending_per_team
+        self.weights = weights or {}
+        self.tenant_stats: dict[str, TenantStats] = {}
+        self._pending = 0
+        self._in_flight = 0
+        self._virtual_time = 0.0
+        self._teams: dict[str, TeamQueue] = {}
+        # per priority, teams with queued jobs ordered by the virtual time of their next job
+        self._schedules: dict[int, list[tuple[float, int, str]]] = {}
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+
+    @property
+    def depth(self) -> int:
+        return self._pending
+
+    def full(self, team: Optional[str] = None) -> bool:
+        """
+        check if the queue can not accept more jobs, or more jobs of the given team once it
+        queued its share
+        """
+        if self._pending >= self.max_size:
+            return True
+        team_queue = None if team is None else self._teams.get(team)
+        return team_queue is not None and team_queue.pending >= self.max_pending_per_team
+
+    def get_tenant_stats(self, team: str) -> TenantStats:
+        """get the counters of a team"""
+        return self.tenant_stats.setdefault(team, TenantStats())
+
+    async def stop(self, timeout: float = config.WORK_QUEUE_SHUTDOWN_TIMEOUT) -> None:
+        if self._loop is not asyncio.get_running_loop():
+            return
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("%d queued jobs dropped on shutdown", self._pending)
+        tasks, self._tasks, self._loop = self._tasks, [], None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._pending = 0
+        self._in_flight = 0
+        self._teams = {}
+        self._schedules = {}
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._tasks = [loop.create_task(self._work()) for _ in range(self.workers)]
+
+    def submit(
+        self,
+        job: Job,
+        priority: Priority = Priority.NORMAL,
+        team: str = "",
+        user: str = "",
+    ) -> None:
+        """queue a team user's job, raise WorkQueueFull when the queue or team share is full"""
+        self._ensure_started()
+        if self.full(team):
+            self.stats.shed += 1
+            self.get_tenant_stats(team).shed += 1
+            raise WorkQueueFull(f"work queue can not accept more jobs of team {team!r}")
+        team_queue = self._teams.get(team)
+        if team_queue is None:
+            team_queue = self._teams[team] = TeamQueue(weight=self.weights.get(team, 1.0))
+        if not team_queue.pending:
+            # an idle team starts at the current virtual time, without credit for its idle time
+            team_queue.virtual_time = max(team_queue.virtual_time, self._virtual_time)
+        lane = team_queue.lanes.get(priority)
+        if lane is None:
+            lane = team_queue.lanes[priority] = PriorityLane()
+            schedule = self._schedules.setdefault(priority, [])
+            heapq.heappush(schedule, (team_queue.virtual_time, next(self._sequence), team))
+        if user not in lane.users:
+            lane.users[user] = deque()
+            lane.ready_users.append(user)
+        lane.users[user].append((priority, next(self._sequence), monotonic(), job))
+        team_queue.pending += 1
+        self._pending += 1
+        self.stats.submitted += 1
+        self.get_tenant_stats(team).submitted += 1
+        self._idle.clear()
+        self._wakeup.set()
+
+    def _select_user(self, team_queue: TeamQueue, lane: PriorityLane) -> Optional[str]:
+        """get the next user of the team's lane allowed to run a job, rotating between users"""
+        if team_queue.in_flight >= self.max_in_flight_per_team:
+            return None
+        for _ in range(len(lane.ready_users)):
+            user = lane.ready_users[0]
+            lane.ready_users.rotate(-1)
+            if team_queue.users_in_flight.get(user, 0) < self.max_in_flight_per_user:
+                return user
+        return None
+
+    def _next(self) -> Optional[tuple[str, str, QueuedJob]]:
+        """take the next job of the best priority allowed to run"""
+        for priority in sorted(self._schedules):
+            selected = self._next_in_lane(priority)
+            if selected is not None:
+                return selected
+        return None
+
+    def _next_in_lane(self, priority: int) -> Optional[tuple[str, str, QueuedJob]]:
+        """take the next job of a priority from the team with the lowest virtual time"""
+        schedule = self._schedules[priority]
+        blocked = []
+        selected = None
+        while schedule and selected is None:
+            entry = heapq.heappop(schedule)
+            virtual_time, _, team = entry
+            team_queue = self._teams[team]
+            if virtual_time < team_queue.virtual_time:
+                # the team was served from another lane since it was scheduled in this one
+                heapq.heappush(schedule, (team_queue.virtual_time, next(self._sequence), team))
+                continue
+            lane = team_queue.lanes[priority]
+            user = self._select_user(team_queue, lane)
+            if user is None:
+                blocked.append(entry)
+                continue
+            jobs = lane.users[user]
+            selected = team, user, jobs.popleft()
+            if not jobs:
+                del lane.users[user]
+                lane.ready_users.pop()
+            team_queue.pending -= 1
+            team_queue.in_flight += 1
+            team_queue.users_in_flight[user] = team_queue.users_in_flight.get(user, 0) + 1
+            self._pending -= 1
+            self._in_flight += 1
+            self._virtual_time = max(self._virtual_time, virtual_time)
+            team_queue.virtual_time = virtual_time + 1 / team_queue.weight
+            if lane.users:
+                heapq.heappush(schedule, (team_queue.virtual_time, next(self._sequence), team))
+            else:
+                del team_queue.lanes[priority]
+        for entry in blocked:
+            heapq.heappush(schedule, entry)
+        return selected
+
+    def _release(self, team: str, user: str) -> None:
+        """account for the end of a team user's job, forgetting idle teams"""
+        team_queue = self._teams[team]
+        team_queue.in_flight -= 1
+        team_queue.users_in_flight[user] -= 1
+        if not team_queue.users_in_flight[user]:
+            del team_queue.users_in_flight[user]
+        if not team_queue.pending and not team_queue.in_flight:
+            del self._teams[team]
+        self._in_flight -= 1
+        if not self._pending and not self._in_flight:
+            self._idle.set()
+        self._wakeup.set()
+
+    async def _work(self) -> None:
+        while True:
+            selected = self._next()
+            if selected is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            team, user, (_, _, queued_at, job) = selected
+            stats = self.get_tenant_stats(team)
+            wait_time = monotonic() - queued_at
+            self.stats.total_wait_time += wait_time
+            self.stats.max_wait_time = max(self.stats.max_wait_time, wait_time)
+            stats.total_wait_time += wait_time
+            stats.max_wait_time = max(stats.max_wait_time, wait_time)
+            try:
+                await self._run(job)
+            finally:
+                latency = monotonic() - queued_at
+                self.stats.processed += 1
+                stats.processed += 1
+                stats.total_latency += latency
+                stats.max_latency = max(stats.max_latency, latency)
+                self._release(team, user)
@@ -0,0 +1,296 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+slackbox rate limit aware slack web api client
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass
+from enum import Enum
+from time import monotonic
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+from typing import Sequence
+
+from aiohttp import ClientSession
+from aiohttp import FormData
+from slack_bolt.context.respond.async_respond import AsyncRespond
+from slack_bolt.context.respond.internals import _build_message
+from slack_sdk.errors import SlackApiError
+from slack_sdk.models.attachments import Attachment
+from slack_sdk.models.blocks import Block
+from slack_sdk.web.async_client import AsyncWebClient
+from slack_sdk.web.async_slack_response import AsyncSlackResponse
+from slack_sdk.webhook.async_client import AsyncWebhookClient
+from slack_sdk.webhook.async_client import WebhookResponse
+
+from slackbox import config
+
+
+class Tier(Enum):
+    """slack web api rate limit tiers, as requests per minute"""
+
+    TIER_1 = 1
+    TIER_2 = 20
+    TIER_3 = 50
+    TIER_4 = 100
+    SPECIAL = 60
+
+
+METHOD_TIERS = {
+    "auth.test": Tier.TIER_4,
+    "chat.postMessage": Tier.SPECIAL,
+    "users.info": Tier.TIER_4,
+    "views.open": Tier.TIER_4,
+    "views.publish": Tier.TIER_4,
+    "views.update": Tier.TIER_4,
+}
+# idempotent methods whose identical concurrent calls can share a single request
+COALESCED_METHODS = {"auth.test", "users.info", "views.publish", "views.update"}
+
+
+class TokenBucket:
+    """token bucket handing out reservations in arrival order"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = monotonic()
+
+    def reserve(self) -> float:
+        """take a token, returning the time to wait before it can be used"""
+        now = monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def pause(self, delay: float) -> None:
+        """hand out no token for delay seconds"""
+        self.tokens = min(self.tokens, 0.0)
+        self.updated_at = max(self.updated_at, monotonic() + delay)
+
+
+@dataclass
+class MethodStats:
+    """rate limiting counters of a web api method, wait times are measured in seconds"""
+
+    calls: int = 0
+    throttled: int = 0
+    coalesced: int = 0
+    rate_limited: int = 0
+    total_wait_time: float = 0.0
+
+
+class RateLimiter:
+    """
+    per workspace token and web api method token buckets matching slack's rate limit tiers, the
+    counters being aggregated per method
+    """
+
+    def __init__(
+        self,
+        tiers: Optional[dict[str, Tier | float]] = None,
+        default_tier: Tier | float = Tier.TIER_3,
+        retries: int = config.SLACK_RATE_LIMIT_RETRIES,
+    ):
+        self.tiers: dict[str, Tier | float] = {**METHOD_TIERS, **(tiers or {})}
+        self.default_tier = default_tier
+        self.retries = retries
+        self.stats: dict[str, MethodStats] = {}
+        self._buckets: dict[tuple[Optional[str], str], TokenBucket] = {}
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    def get_bucket(self, method: str, token: Optional[str] = None) -> TokenBucket:
+        """
+        get the token bucket of a method called with a token, bursts are allowed up to a tenth of
+        a minute
+        """
+        if (token, method) not in self._buckets:
+            tier = self.tiers.get(method, self.default_tier)
+            per_minute = tier.value if isinstance(tier, Tier) else tier
+            bucket = TokenBucket(per_minute / 60, max(1.0, per_minute / 10))
+            self._buckets[token, method] = bucket
+        return self._buckets[token, method]
+
+    def get_stats(self, method: str) -> MethodStats:
+        """get the rate limiting counters of a method"""
+        return self.stats.setdefault(method, MethodStats())
+
+    async def call(
+        self,
+        method: str,
+        send: Callable[[], Awaitable[AsyncSlackResponse]],
+        key: Optional[str] = None,
+        token: Optional[str] = None,
+    ) -> AsyncSlackResponse:
+        """
+        send a request once allowed by the bucket of the method and token, identical concurrent
+        requests identified by the same key share the result of the first one
+        """
+        stats = self.get_stats(method)
+        stats.calls += 1
+        if key is None:
+            return await self._send(method, send, token)
+        if key in self._in_flight:
+            stats.coalesced += 1
+            return await asyncio.shield(self._in_flight[key])
+        future = asyncio.ensure_future(self._send(method, send, token))
+        self._in_flight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    async def _send(
+        self,
+        method: str,
+        send: Callable[[], Awaitable[AsyncSlackResponse]],
+        token: Optional[str],
+    ) -> AsyncSlackResponse:
+        bucket = self.get_bucket(method, token)
+        stats = self.get_stats(method)
+        for attempt in range(self.retries + 1):
+            wait_time = bucket.reserve()
+            if wait_time:
+                stats.throttled += 1
+                stats.total_wait_time += wait_time
+                await asyncio.sleep(wait_time)
+            try:
+                return await send()
+            except SlackApiError as error:
+                if error.response.status_code != 429 or attempt == self.retries:
+                    raise
+                stats.rate_limited += 1
+                bucket.pause(float(error.response.headers.get("Retry-After", 1)))
+        raise AssertionError("unreachable")  # pragma: no cover
+
+
+class RateLimitedWebClient(AsyncWebClient):
+    """slack web api client waiting for its calls to be allowed by a shared rate limiter"""
+
+    def __init__(self, *args, rate_limiter: RateLimiter, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rate_limiter = rate_limiter
+
+    @classmethod
+    def from_client(
+        cls,
+        client: AsyncWebClient,
+        rate_limiter: RateLimiter,
+        session: Optional[ClientSession] = None,
+    ) -> RateLimitedWebClient:
+        """create a rate limited copy of a client, optionally sending calls through a session"""
+        return cls(
+            token=client.token,
+            base_url=client.base_url,
+            timeout=client.timeout,
+            ssl=client.ssl,
+            proxy=client.proxy,
+            session=session or client.session,
+            trust_env_in_session=client.trust_env_in_session,
+            headers=client.headers,
+            team_id=client.default_params.get("team_id"),
+            logger=client._logger,  # pylint: disable=protected-access
+            retry_handlers=client.retry_handlers,
+            rate_limiter=rate_limiter,
+        )
+
+    async def api_call(  # pylint: disable=too-many-arguments
+        self,
+        api_method: str,
+        *,
+        http_verb: str = "POST",
+        files: Optional[dict] = None,
+        data: Any = None,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,  # pylint: disable=redefined-outer-name
+        headers: Optional[dict] = None,
+        auth: Optional[dict] = None,
+    ) -> AsyncSlackResponse:
+        send_call = super().api_call
+
+        def send() -> Awaitable[AsyncSlackResponse]:
+            return send_call(
+                api_method,
+                http_verb=http_verb,
+                files=files,
+                data=data,
+                params=params,
+                json=json,
+                headers=headers,
+                auth=auth,
+            )
+
+        key = None
+        if api_method in COALESCED_METHODS and not files and not isinstance(data, FormData):
+            key = self.get_coalescing_key(api_method, data, params, json)
+        token = self.get_token(params, json)
+        return await self.rate_limiter.call(api_method, send, key, token)
+
+    def get_token(self, *payloads: Optional[dict]) -> Optional[str]:
+        """get the token a call is sent with, given as an argument or the client's token"""
+        for payload in payloads:
+            if payload and payload.get("token"):
+                return payload["token"]
+        return self.token
+
+    def get_coalescing_key(self, api_method: str, *payloads: Any) -> str:
+        """get a key identifying identical calls"""
+        return json_dumps([self.token, api_method, *payloads])
+
+
+class SessionRespond(AsyncRespond):
+    """respond function sending messages to the response url through a shared session"""
+
+    def __init__(self, *, response_url: Optional[str], session: Optional[ClientSession], **kwargs):
+        super().__init__(response_url=response_url, **kwargs)
+        self.session = session
+
+    async def __call__(  # pylint: disable=too-many-arguments
+        self,
+        text: str | dict = "",
+        blocks: Optional[Sequence[dict | Block]] = None,
+        attachments: Optional[Sequence[dict | Attachment]] = None,
+        response_type: Optional[str] = None,
+        replace_original: Optional[bool] = None,
+        delete_original: Optional[bool] = None,
+        unfurl_links: Optional[bool] = None,
+        unfurl_media: Optional[bool] = None,
+    ) -> WebhookResponse:
+        if self.response_url is None:
+            raise ValueError("respond is unsupported here as there is no response_url")
+        if isinstance(text, dict):
+            message = _build_message(**text)
+        else:
+            message = _build_message(
+                text=text,
+                blocks=blocks,
+                attachments=attachments,
+                response_type=response_type,
+                replace_original=replace_original,
+                delete_original=delete_original,
+                unfurl_links=unfurl_links,
+                unfurl_media=unfurl_media,
+            )
+        client = AsyncWebhookClient(
+            url=self.response_url,
+            proxy=self.proxy,
+            ssl=self.ssl,
+            session=self.session,
+        )
+        return await client.send_dict(message)
+
+
+def json_dumps(data: object) -> str:
+    """dump data to a canonical json string"""
+    return json.dumps(data, sort_keys=True, default=str)
@@ -0,0 +1,141 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+slackbox socket mode transport
+"""
+
+import asyncio
+import json
+import random
+from time import time
+from typing import Optional
+
+from slack_bolt.adapter.socket_mode.async_internals import run_async_bolt_app
+from slack_bolt.adapter.socket_mode.async_internals import send_async_response
+from slack_bolt.async_app import AsyncApp
+from slack_bolt.response import BoltResponse
+from slack_sdk.socket_mode.aiohttp import SocketModeClient
+from slack_sdk.socket_mode.async_client import AsyncBaseSocketModeClient
+from slack_sdk.socket_mode.request import SocketModeRequest
+from slack_sdk.socket_mode.response import SocketModeResponse
+
+from slackbox import config
+
+
+class ConcurrentSocketModeClient(SocketModeClient):
+    """
+    socket mode client processing a bounded number of envelopes concurrently and reconnecting
+    with an exponential backoff
+    """
+
+    def __init__(
+        self,
+        *args,
+        max_concurrency: int = config.SOCKET_MODE_CONCURRENCY,
+        backoff: float = config.SOCKET_MODE_BACKOFF,
+        max_backoff: float = config.SOCKET_MODE_MAX_BACKOFF,
+        **kwargs,
+    ):
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        super().__init__(*args, **kwargs)
+
+    async def process_message(self) -> None:
+        raw_message = await self.message_queue.get()
+        if raw_message is None:
+            return
+        message = json.loads(raw_message) if raw_message.startswith("{") else {}
+        await self._semaphore.acquire()
+        task = asyncio.ensure_future(self.run_message_listeners(message, raw_message))
+        task.add_done_callback(lambda _: self._semaphore.release())
+
+    def get_backoff(self, attempt: int) -> float:
+        """get the delay before a reconnection attempt, with full jitter"""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    async def connect_to_new_endpoint(self, force: bool = False) -> None:
+        attempt = 0
+        while True:
+            try:
+                await super().connect_to_new_endpoint(force)
+                return
+            except Exception as error:  # pylint: disable=broad-except
+                if self.closed:
+                    raise
+                delay = self.get_backoff(attempt)
+                self.logger.warning(
+                    "socket mode connection failed (%s), retry in %.2fs", error, delay
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+
+class SocketModeRunner:
+    """run a bolt app over a persistent socket mode connection instead of http requests"""
+
+    def __init__(
+        self,
+        app: AsyncApp,
+        app_token: str = config.SLACK_APP_TOKEN,
+        ping_interval: float = config.SOCKET_MODE_PING_INTERVAL,
+        max_concurrency: int = config.SOCKET_MODE_CONCURRENCY,
+    ):
+        self.app = app
+        self.app_token = app_token
+        self.ping_interval = ping_interval
+        self.max_concurrency = max_concurrency
+        self.client: Optional[ConcurrentSocketModeClient] = None
+        self._connection: Optional[asyncio.Task] = None
+
+    async def handle(self, client: AsyncBaseSocketModeClient, request: SocketModeRequest) -> None:
+        """handle an envelope received by the socket mode client"""
+        await self.dispatch(client, request)
+
+    async def dispatch(
+        self, client: AsyncBaseSocketModeClient, request: SocketModeRequest
+    ) -> BoltResponse:
+        """
+        dispatch an envelope to the bolt app and acknowledge it with the app's response, failed
+        envelopes being left unacknowledged for slack to deliver them again
+        """
+        start = time()
+        response = await run_async_bolt_app(self.app, request)
+        await send_async_response(client, request, response, start)
+        return response
+
+    @staticmethod
+    async def ack(
+        client: AsyncBaseSocketModeClient,
+        request: SocketModeRequest,
+        payload: Optional[dict] = None,
+    ) -> None:
+        """acknowledge an envelope without dispatching it to the bolt app"""
+        response = SocketModeResponse(envelope_id=request.envelope_id, payload=payload)
+        await client.send_socket_mode_response(response)
+
+    async def start(self) -> None:
+        """connect to slack in the background, retrying until connected"""
+        if self.client is not None:
+            return
+        self.client = ConcurrentSocketModeClient(
+            app_token=self.app_token,
+            logger=self.app.logger,
+            web_client=self.app.client,
+            ping_interval=self.ping_interval,
+            max_concurrency=self.max_concurrency,
+        )
+        self.client.socket_mode_request_listeners.append(self.handle)
+        self._connection = asyncio.create_task(self.client.connect_to_new_endpoint())
+
+    async def stop(self) -> None:
+        """close the connection to slack"""
+        client, self.client = self.client, None
+        if client is None:
+            return
+        if self._connection is not None:
+            self._connection.cancel()
+            await asyncio.gather(self._connection, return_exceptions=True)
+        await client.close()
@@ -0,0 +1,60 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+slackbox in memory caches
+"""
+
+from collections import OrderedDict
+from time import monotonic
+from typing import Generic
+from typing import Hashable
+from typing import Optional
+from typing import TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """bounded mapping evicting least recently used entries and entries older than a ttl"""
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[K, tuple[V, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: K) -> Optional[V]:
+        """get the value cached for key, None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """cache value for key, evicting the least recently used entry when full"""
+        expires_at = monotonic() + self.ttl if self.ttl is not None else float("inf")
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: K) -> None:
+        """remove key from the cache"""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """remove all entries from the cache"""
+        self._entries.clear()
@@ -6,31 +6,188 @@ license: MIT
 slackbox unique identifiers management
 """
 
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
 from math import ceil
 from math import log
+from os import register_at_fork
 from os import urandom
+from threading import Lock
+from typing import Optional
 
 from slackbox import config
 
+logger = logging.getLogger(__name__)
+
+
+class IdentifierGenerator:
+    """random identifiers generator drawing entropy from the os in buffered chunks"""
+
+    def __init__(self, alphabet: str, size: int, buffer_size: int = config.IDENTIFIER_BUFFER_SIZE):
+        alphabet_len = len(alphabet)
+        if not 0 < alphabet_len <= 256 or not alphabet.isascii():
+            raise ValueError("identifier alphabet must contain between 1 and 256 ascii characters")
+
+        mask = 1
+        if alphabet_len > 1:
+            mask = (2 << int(log(alphabet_len - 1) / log(2))) - 1
+
+        self.size = size
+        self.buffer_size = buffer_size
+        # random bytes to draw per character: rejection rate of masked bytes plus a safety margin
+        self._step = 1.6 * (mask + 1) / alphabet_len
+        # each random byte is masked then mapped to an alphabet character in a single translate,
+        # bytes falling outside of the alphabet once masked are deleted
+        self._translation = (
+            bytes(
+                ord(alphabet[byte & mask]) if byte & mask < alphabet_len else 0
+                for byte in range(256)
+            ),
+            bytes(byte for byte in range(256) if byte & mask >= alphabet_len),
+        )
+        self._characters = ""
+        self._position = 0
+        self._lock = Lock()
+
+    def _take(self, count: int) -> str:
+        """take count random characters from the buffer, refilling it when needed"""
+        start = self._position
+        if len(self._characters) - start < count:
+            characters = self._characters[start:]
+            while len(characters) < count:
+                length = max(self.buffer_size, int(ceil(self._step * (count - len(characters)))))
+                random_bytes = urandom(length).translate(*self._translation)
+                characters += random_bytes.decode("ascii")
+            self._characters = characters
+            start = 0
+        end = start + count
+        self._position = end
+        return self._characters[start:end]
+
+    def reset(self) -> None:
+        """drop buffered entropy, forked processes must not share it"""
+        with self._lock:
+            self._characters = ""
+            self._position = 0
+
+    def generate(self) -> str:
+        """generate a random identifier"""
+        with self._lock:
+            return self._take(self.size)
+
+    def generate_many(self, count: int) -> list[str]:
+        """generate count random identifiers at once, none for a count of 0"""
+        if count < 0:
+            raise ValueError(f"identifier count must be positive or zero, got {count}")
+        if count == 0:
+            return []
+        size = self.size
+        with self._lock:
+            characters = self._take(count * size)
+        bounds = range(0, len(characters) + 1, size)
+        return [characters[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+_generator = IdentifierGenerator(config.IDENTIFIER_ALPHABET, config.IDENTIFIER_SIZE)
+register_at_fork(after_in_child=_generator.reset)
+
 
 def generate_identifier() -> str:
     """generate a random identifier"""
-    alphabet_len = len(config.IDENTIFIER_ALPHABET)
+    return _generator.generate()
 
-    mask = 1
-    if alphabet_len > 1:
-        mask = (2 << int(log(alphabet_len - 1) / log(2))) - 1
-    step = int(ceil(1.6 * mask * config.IDENTIFIER_SIZE / alphabet_len))
 
-    identifier = ""
-    while True:
-        random_bytes = bytearray(urandom((step)))
+def generate_identifiers(count: int) -> list[str]:
+    """generate count random identifiers"""
+    return _generator.generate_many(count)
 
-        for i in range(step):
-            if len(identifier) == config.IDENTIFIER_SIZE:
-                return identifier
 
-            random_byte = random_bytes[i] & mask
-            if random_byte >= alphabet_len:
-                continue
-            identifier += config.IDENTIFIER_ALPHABET[random_byte]
+@dataclass
+class IdentifierPoolStats:
+    """identifier pool counters, useful to size the pool"""
+
+    hits: int = 0
+    misses: int = 0
+    refills: int = 0
+    collisions: int = 0
+
+
+class IdentifierPool:  # pylint: disable=too-many-instance-attributes
+    """pool of pre-generated identifiers, refilled in the background once running low"""
+
+    def __init__(
+        self,
+        generator: Optional[IdentifierGenerator] = None,
+        size: int = config.IDENTIFIER_POOL_SIZE,
+        low_watermark: Optional[int] = None,
+        recent_size: int = 0,
+    ):
+        self.generator = generator or _generator
+        self.size = size
+        self.low_watermark = size // 4 if low_watermark is None else low_watermark
+        self.stats = IdentifierPoolStats()
+        self._identifiers: deque[str] = deque()
+        # bounded history of issued identifiers used to avoid handing out duplicates
+        self._recent: deque[str] = deque(maxlen=recent_size)
+        self._recent_set: set[str] = set()
+        self._refilling = False
+
+    def __len__(self) -> int:
+        return len(self._identifiers)
+
+    def refill(self) -> None:
+        """generate enough identifiers to fill the pool up"""
+        missing = self.size - len(self._identifiers)
+        if missing > 0:
+            self._identifiers.extend(self.generator.generate_many(missing))
+            self.stats.refills += 1
+
+    def _refill_done(self, future: asyncio.Future) -> None:
+        """allow the next refill to be scheduled, logging the failure of this one"""
+        self._refilling = False
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error("identifier pool refill failed", exc_info=error)
+
+    def _schedule_refill(self) -> None:
+        """refill the pool in a worker thread when running in an event loop, inline otherwise"""
+        if self._refilling:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.refill()
+            return
+        self._refilling = True
+        loop.run_in_executor(None, self.refill).add_done_callback(self._refill_done)
+
+    def _is_recent(self, identifier: str) -> bool:
+        """check if the identifier was recently issued, remembering it otherwise"""
+        if self._recent.maxlen == 0:
+            return False
+        if identifier in self._recent_set:
+            return True
+        if len(self._recent) == self._recent.maxlen:
+            self._recent_set.discard(self._recent[0])
+        self._recent.append(identifier)
+        self._recent_set.add(identifier)
+        return False
+
+    def get(self) -> str:
+        """get an identifier from the pool, generating one if the pool is empty"""
+        while True:
+            try:
+                identifier = self._identifiers.popleft()
+                self.stats.hits += 1
+            except IndexError:
+                identifier = self.generator.generate()
+                self.stats.misses += 1
+            if len(self._identifiers) < self.low_watermark:
+                self._schedule_refill()
+            if not self._is_recent(identifier):
+                return identifier
+            self.stats.collisions += 1
@@ -8,7 +8,22 @@ slackbox string management
 
 import re
 from enum import Enum
+from functools import lru_cache
+from typing import Any
 from typing import Callable
+from typing import Iterable
+
+CACHE_SIZE = 4096
+
+CAMEL_PATTERN = re.compile("^[a-z]+([A-Z]+[a-z]+)*$")
+SNAKE_PATTERN = re.compile("^[a-z]+(_[a-z]+)*$")
+KEBAB_PATTERN = re.compile("^[a-z]+(-[a-z]+)*$")
+PASCAL_PATTERN = re.compile("^([A-Z]+[a-z]+)+$")
+SCREAMING_SNAKE_PATTERN = re.compile("^[A-Z]+(_[A-Z]+)*$")
+DOT_PATTERN = re.compile(r"^[a-z]+(\.[a-z]+)*$")
+UPPERCASE_PATTERN = re.compile("([A-Z])")
+# separators and quotes become a space, a space is also inserted before each uppercase letter
+COMPONENT_PATTERN = re.compile("[_.-]+|['\"]|(?=[A-Z])")
 
 
 class Case(Enum):
@@ -18,61 +33,82 @@ class Case(Enum):
     CAMEL = "camel"
     KEBAB = "kebab"
     PASCAL = "pascal"
+    SCREAMING_SNAKE = "screaming_snake"
+    DOT = "dot"
 
 
 class CaseValidator:
     """Expose method validating string's cases"""
 
+    validators: dict[Case, Callable[[str], bool]] = {}
+
+    @classmethod
+    def register(cls, case: Case, validator: Callable[[str], bool]) -> None:
+        """register the validator for the given case"""
+        cls.validators[case] = validator
+
     @classmethod
     def get_validator(cls, case: Case) -> Callable[[str], bool]:
         """get the validator for the given case"""
-        validator_name = f"is_{case.value}"
-        if not hasattr(cls, validator_name):
-            raise NotImplementedError(f"CaseValidator.{validator_name}")
-        return getattr(cls, validator_name)
+        try:
+            return cls.validators[case]
+        except KeyError as error:
+            raise NotImplementedError(f"CaseValidator.is_{case.value}") from error
 
     @staticmethod
     def is_camel(string: str) -> bool:
         """make sure the string is camel case"""
-        return bool(re.match("^[a-z]+([A-Z]+[a-z]+)*$", string))
+        return bool(CAMEL_PATTERN.match(string))
 
     @staticmethod
     def is_snake(string: str) -> bool:
         """make sure the string is snake case"""
-        return bool(re.match("^[a-z]+(_[a-z]+)*$", string))
+        return bool(SNAKE_PATTERN.match(string))
 
     @staticmethod
     def is_kebab(string: str) -> bool:
         """make sure the string is kebab case"""
-        return bool(re.match("^[a-z]+(-[a-z]+)*$", string))
+        return bool(KEBAB_PATTERN.match(string))
 
     @staticmethod
     def is_pascal(string: str) -> bool:
         """make sure the string is pascal case"""
-        return bool(re.match("^([A-Z]+[a-z]+)+$", string))
+        return bool(PASCAL_PATTERN.match(string))
+
+    @staticmethod
+    def is_screaming_snake(string: str) -> bool:
+        """make sure the string is screaming snake case"""
+        return bool(SCREAMING_SNAKE_PATTERN.match(string))
+
+    @staticmethod
+    def is_dot(string: str) -> bool:
+        """make sure the string is dot case"""
+        return bool(DOT_PATTERN.match(string))
 
 
 class CaseEnforcer:
     """Expose method enforcing a string's case"""
 
+    enforcers: dict[Case, Callable[[str], str]] = {}
+
+    @classmethod
+    def register(cls, case: Case, enforcer: Callable[[str], str]) -> None:
+        """register the enforcer for the given case"""
+        cls.enforcers[case] = enforcer
+
     @classmethod
     def get_enforcer(cls, case: Case) -> Callable[[str], str]:
         """get the enforcer for the given case"""
-        enforcer_name = f"to_{case.value}"
-        if not hasattr(cls, enforcer_name):
-            raise NotImplementedError(f"CaseValidator.{enforcer_name}")
-        return getattr(cls, enforcer_name)
+        try:
+            return cls.enforcers[case]
+        except KeyError as error:
+            raise NotImplementedError(f"CaseEnforcer.to_{case.value}") from error
 
     @classmethod
     def get_components(cls, string: str) -> list[str]:
         """extract components from any case string"""
-        component_string = re.sub(r"(_|-)+", " ", string)
-        component_string = re.sub(r"([A-Z])", r" \g<1>", component_string)
-        component_string = component_string.lower()
-        component_string = component_string.replace("'", " ")
-        component_string = component_string.replace('"', " ")
-        component_string = component_string.strip()
-        return component_string.split(" ")
+        component_string = COMPONENT_PATTERN.sub(" ", string)
+        return component_string.lower().strip().split(" ")
 
     @classmethod
     def to_camel(cls, string: str) -> str:
@@ -96,17 +132,38 @@ class CaseEnforcer:
         components = cls.get_components(string)
         return "".join(x.title() for x in components)
 
+    @classmethod
+    def to_screaming_snake(cls, string: str) -> str:
+        """force the string to screaming snake case"""
+        if CaseValidator.is_screaming_snake(string):
+            return string
+        return "_".join(cls.get_components(string)).upper()
+
+    @classmethod
+    def to_dot(cls, string: str) -> str:
+        """force the string to dot case"""
+        return ".".join(cls.get_components(string))
+
 
 class CaseConverter:
     """Expose methods transforming string from one case to others"""
 
+    converters: dict[tuple[Case, Case], Callable[[str], str]] = {}
+
+    @classmethod
+    def register(cls, from_case: Case, to_case: Case, converter: Callable[[str], str]) -> None:
+        """register the converter from one case to another"""
+        cls.converters[(from_case, to_case)] = converter
+
     @classmethod
     def get_converter(cls, from_case: Case, to_case: Case) -> Callable[[str], str]:
         """get the converter from one case to another"""
-        converter_name = f"convert_{from_case.value}_to_{to_case.value}"
-        if not hasattr(cls, converter_name):
-            raise NotImplementedError(f"CaseConverter.{converter_name}")
-        return getattr(cls, converter_name)
+        try:
+            return cls.converters[(from_case, to_case)]
+        except KeyError as error:
+            raise NotImplementedError(
+                f"CaseConverter.convert_{from_case.value}_to_{to_case.value}"
+            ) from error
 
     @staticmethod
     def convert_snake_to_camel(string: str) -> str:
@@ -127,12 +184,12 @@ class CaseConverter:
     @staticmethod
     def convert_camel_to_snake(string: str) -> str:
         """convert a camel cased string to snake case"""
-        return re.sub("([A-Z])", r"_\1", string).lower()
+        return UPPERCASE_PATTERN.sub(r"_\1", string).lower()
 
     @staticmethod
     def convert_camel_to_kebab(string: str) -> str:
         """convert a camel cased string to kebab case"""
-        return re.sub("([A-Z])", r"-\1", string).lower()
+        return UPPERCASE_PATTERN.sub(r"-\1", string).lower()
 
     @staticmethod
     def convert_camel_to_pascal(string: str) -> str:
@@ -158,7 +215,7 @@ class CaseConverter:
     @staticmethod
     def convert_pascal_to_snake(string: str) -> str:
         """convert a pascal cased string to snake case"""
-        return re.sub("([A-Z])", r"_\1", string).lower().strip("_")
+        return UPPERCASE_PATTERN.sub(r"_\1", string).lower().strip("_")
 
     @staticmethod
     def convert_pascal_to_camel(string: str) -> str:
@@ -168,9 +225,30 @@ class CaseConverter:
     @staticmethod
     def convert_pascal_to_kebab(string: str) -> str:
         """convert a pascal cased string to kebab case"""
-        return re.sub("([A-Z])", r"-\1", string).lower().strip("-")
+        return UPPERCASE_PATTERN.sub(r"-\1", string).lower().strip("-")
 
+    @staticmethod
+    def convert_snake_to_screaming_snake(string: str) -> str:
+        """convert a snake cased string to screaming snake case"""
+        return string.upper()
+
+    @staticmethod
+    def convert_screaming_snake_to_snake(string: str) -> str:
+        """convert a screaming snake cased string to snake case"""
+        return string.lower()
+
+    @staticmethod
+    def convert_snake_to_dot(string: str) -> str:
+        """convert a snake cased string to dot case"""
+        return string.replace("_", ".")
 
+    @staticmethod
+    def convert_dot_to_snake(string: str) -> str:
+        """convert a dot cased string to snake case"""
+        return string.replace(".", "_")
+
+
+@lru_cache(maxsize=CACHE_SIZE)
 def convert_case(string: str, from_case: Case, to_case: Case) -> str:
     """convert a string from one case to another"""
     is_valid = CaseValidator.get_validator(from_case)
@@ -180,7 +258,143 @@ def convert_case(string: str, from_case: Case, to_case: Case) -> str:
     return convert(string)
 
 
+@lru_cache(maxsize=CACHE_SIZE)
 def force_case(string: str, case: Case) -> str:
     """force the string to the given case"""
     enforce = CaseEnforcer.get_enforcer(case)
     return enforce(string)
+
+
+def convert_case_many(strings: Iterable[str], from_case: Case, to_case: Case) -> list[str]:
+    """convert many strings from one case to another"""
+    is_valid = CaseValidator.get_validator(from_case)
+    convert = CaseConverter.get_converter(from_case, to_case)
+    converted = []
+    for string in strings:
+        if not is_valid(string):
+            raise ValueError(f"{string} is not a {from_case.value} case string")
+        converted.append(convert(string))
+    return converted
+
+
+def force_case_many(strings: Iterable[str], case: Case) -> list[str]:
+    """force many strings to the given case"""
+    enforce = CaseEnforcer.get_enforcer(case)
+    return [enforce(string) for string in strings]
+
+
+def convert_keys(data: Any, case: Case) -> Any:
+    """recursively force all dict keys of a json like structure to the given case"""
+    enforce = CaseEnforcer.get_enforcer(case)
+    keys: dict[str, str] = {}
+
+    def convert(value: Any) -> Any:
+        if isinstance(value, dict):
+            converted = {}
+            for key, item in value.items():
+                if key not in keys:
+                    keys[key] = enforce(key)
+                converted[keys[key]] = convert(item)
+            return converted
+        if isinstance(value, list):
+            return [convert(item) for item in value]
+        return value
+
+    return convert(data)
+
+
+_to_snake: dict[Case, Callable[[str], str]] = {}
+_from_snake: dict[Case, Callable[[str], str]] = {}
+
+
+def _compose(first: Callable[[str], str], second: Callable[[str], str]) -> Callable[[str], str]:
+    def convert(string: str) -> str:
+        return second(first(string))
+
+    return convert
+
+
+def register_case(
+    case: Case,
+    validator: Callable[[str], bool],
+    enforcer: Callable[[str], str],
+    to_snake: Callable[[str], str],
+    from_snake: Callable[[str], str],
+) -> None:
+    """
+    register a case's validator and enforcer, converters between the case and every other
+    registered case going through snake case unless a direct converter is already registered
+    """
+    CaseValidator.register(case, validator)
+    CaseEnforcer.register(case, enforcer)
+    _to_snake[case] = to_snake
+    _from_snake[case] = from_snake
+    for other in CaseValidator.validators:
+        if other is case:
+            continue
+        if (case, other) not in CaseConverter.converters:
+            CaseConverter.register(case, other, _compose(to_snake, _from_snake[other]))
+        if (other, case) not in CaseConverter.converters:
+            CaseConverter.register(other, case, _compose(_to_snake[other], from_snake))
+    convert_case.cache_clear()
+    force_case.cache_clear()
+
+
+for _from_case, _to_case, _converter in (
+    (Case.SNAKE, Case.CAMEL, CaseConverter.convert_snake_to_camel),
+    (Case.SNAKE, Case.KEBAB, CaseConverter.convert_snake_to_kebab),
+    (Case.SNAKE, Case.PASCAL, CaseConverter.convert_snake_to_pascal),
+    (Case.CAMEL, Case.SNAKE, CaseConverter.convert_camel_to_snake),
+    (Case.CAMEL, Case.KEBAB, CaseConverter.convert_camel_to_kebab),
+    (Case.CAMEL, Case.PASCAL, CaseConverter.convert_camel_to_pascal),
+    (Case.KEBAB, Case.SNAKE, CaseConverter.convert_kebab_to_snake),
+    (Case.KEBAB, Case.CAMEL, CaseConverter.convert_kebab_to_camel),
+    (Case.KEBAB, Case.PASCAL, CaseConverter.convert_kebab_to_pascal),
+    (Case.PASCAL, Case.SNAKE, CaseConverter.convert_pascal_to_snake),
+    (Case.PASCAL, Case.CAMEL, CaseConverter.convert_pascal_to_camel),
+    (Case.PASCAL, Case.KEBAB, CaseConverter.convert_pascal_to_kebab),
+):
+    CaseConverter.register(_from_case, _to_case, _converter)
+
+register_case(
+    Case.SNAKE,
+    validator=CaseValidator.is_snake,
+    enforcer=CaseEnforcer.to_snake,
+    to_snake=str,
+    from_snake=str,
+)
+register_case(
+    Case.CAMEL,
+    validator=CaseValidator.is_camel,
+    enforcer=CaseEnforcer.to_camel,
+    to_snake=CaseConverter.convert_camel_to_snake,
+    from_snake=CaseConverter.convert_snake_to_camel,
+)
+register_case(
+    Case.KEBAB,
+    validator=CaseValidator.is_kebab,
+    enforcer=CaseEnforcer.to_kebab,
+    to_snake=CaseConverter.convert_kebab_to_snake,
+    from_snake=CaseConverter.convert_snake_to_kebab,
+)
+register_case(
+    Case.PASCAL,
+    validator=CaseValidator.is_pascal,
+    enforcer=CaseEnforcer.to_pascal,
+    to_snake=CaseConverter.convert_pascal_to_snake,
+    from_snake=CaseConverter.convert_snake_to_pascal,
+)
+register_case(
+    Case.SCREAMING_SNAKE,
+    validator=CaseValidator.is_screaming_snake,
+    enforcer=CaseEnforcer.to_screaming_snake,
+    to_snake=CaseConverter.convert_screaming_snake_to_snake,
+    from_snake=CaseConverter.convert_snake_to_screaming_snake,
+)
+register_case(
+    Case.DOT,
+    validator=CaseValidator.is_dot,
+    enforcer=CaseEnforcer.to_dot,
+    to_snake=CaseConverter.convert_dot_to_snake,
+    from_snake=CaseConverter.convert_snake_to_dot,
+)
@@ -0,0 +1,162 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+slackbox benchmark tests configuration
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+from threading import Thread
+from time import monotonic
+from time import sleep
+
+import pytest
+import requests
+from slack_sdk.oauth.installation_store import Installation
+from slack_sdk.oauth.installation_store.sqlite3 import SQLite3InstallationStore
+
+from tests.utils import FakeSlackServer
+from tests.utils import LoadReport
+from tests.utils import SlackLoadGenerator
+
+SIGNING_SECRET = "benchmark-secret"
+CLIENT_ID = "benchmark"
+TEAM_ID = "T0"
+reports_key = pytest.StashKey[list[tuple[str, LoadReport]]]()
+
+
+def pytest_addoption(parser):
+    """inject parameters to pytest cli"""
+    parser.addoption("--rate", action="store", type=float, default=200.0)
+    parser.addoption("--duration", action="store", type=float, default=5.0)
+    parser.addoption("--workers", action="store", type=int, default=1)
+    parser.addoption("--slack-latency", action="store", type=float, default=0.05)
+    parser.addoption("--max-p99-latency", action="store", type=float, default=250.0)
+
+
+def pytest_configure(config):
+    """collect the load reports of the session"""
+    config.stash[reports_key] = []
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """report throughput and ack latencies of the load tests"""
+    reports = config.stash.get(reports_key, [])
+    if reports:
+        terminalreporter.section("slackbox load tests")
+        for name, report in reports:
+            terminalreporter.write_line(f"{name}: {report}")
+
+
+@pytest.fixture(name="load_options", scope="session")
+def fixture_load_options(request):
+    """expose the load test parameters"""
+    option = request.config.option
+    return {
+        "rate": option.rate,
+        "duration": option.duration,
+        "max_p99_latency": option.max_p99_latency / 1000,
+    }
+
+
+@pytest.fixture(name="record_load")
+def fixture_record_load(request):
+    """expose a function recording a load report for the session's summary"""
+
+    def record(name: str, report: LoadReport) -> None:
+        request.config.stash[reports_key].append((name, report))
+
+    return record
+
+
+@pytest.fixture(name="slack_api", scope="session")
+def fixture_slack_api(request):
+    """run a fake slack api on its own event loop, answering after the configured latency"""
+    loop = asyncio.new_event_loop()
+    thread = Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server = FakeSlackServer(latency=request.config.option.slack_latency)
+    asyncio.run_coroutine_threadsafe(server.__aenter__(), loop).result()
+    yield server
+    asyncio.run_coroutine_threadsafe(server.__aexit__(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+
+def get_free_port() -> int:
+    """get a free local tcp port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_live(url: str, process: subprocess.Popen, timeout: float = 20.0) -> None:
+    """wait for slackbox to answer its liveness probe"""
+    deadline = monotonic() + timeout
+    while monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"slackbox exited with code {process.returncode}")
+        try:
+            if requests.get(f"{url}/livez", timeout=1).status_code == 200:
+                return
+        except requests.ConnectionError:
+            pass
+        sleep(0.1)
+    raise RuntimeError(f"slackbox is not live after {timeout} seconds")
+
+
+@pytest.fixture(name="slackbox")
+def fixture_slackbox(request, slack_api, tmp_path):
+    """
+    run slackbox under uvicorn, installed in a workspace and calling the fake slack api, a new
+    process per test so that work queued by a test does not slow down the next one
+    """
+    installations = str(tmp_path / "installations.sqlite3")
+    SQLite3InstallationStore(database=installations, client_id=CLIENT_ID).save(
+        Installation(
+            app_id="A0",
+            team_id=TEAM_ID,
+            user_id="U0",
+            bot_token="xoxb-benchmark",
+            bot_id="B0",
+            bot_user_id="U0",
+        )
+    )
+    port = get_free_port()
+    env = {
+        **os.environ,
+        "SLACK_API_URL": slack_api.base_url,
+        "SLACK_SIGNING_SECRET": SIGNING_SECRET,
+        "SLACK_CLIENT_ID": CLIENT_ID,
+        "SLACK_INSTALLATION_PATH": installations,
+        "EVENT_DEDUPLICATION_PATH": str(tmp_path / "events.sqlite3"),
+    }
+    command = ["uvicorn", "slackbox.main:app", "--port", str(port), "--log-level", "warning"]
+    workers = request.config.option.workers
+    if workers > 1:
+        env["EVENT_DEDUPLICATION_BACKEND"] = "sqlite"
+        command += ["--workers", str(workers)]
+    process = subprocess.Popen([sys.executable, "-m", *command], env=env)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        wait_until_live(url, process)
+        yield url
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+@pytest.fixture(name="generator")
+def fixture_generator(slackbox, slack_api):
+    """expose a generator of signed slack requests sent to slackbox"""
+    return SlackLoadGenerator(
+        url=f"{slackbox}/slack/events",
+        signing_secret=SIGNING_SECRET,
+        response_url=slack_api.response_url,
+        team_id=TEAM_ID,
+    )
@@ -0,0 +1,62 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+benchmarking slackbox slack events throughput and ack latencies
+"""
+
+import pytest
+
+from tests.benchmark.conftest import SIGNING_SECRET
+from tests.utils import SlackLoadGenerator
+
+
+@pytest.mark.asyncio
+async def test_slash_commands(generator, load_options, record_load, slack_api):
+    """test slash commands are acknowledged at the target rate"""
+    report = await generator.run(
+        generator.make_command, load_options["rate"], load_options["duration"]
+    )
+    record_load("slash commands", report)
+
+    assert report.acked == report.sent
+    assert report.percentile(99) <= load_options["max_p99_latency"]
+    assert slack_api.calls.get("hooks", 0) > 0
+
+
+@pytest.mark.asyncio
+async def test_app_home_opened(generator, load_options, record_load):
+    """test app_home_opened events are acknowledged at the target rate"""
+    report = await generator.run(
+        generator.make_home_opened, load_options["rate"], load_options["duration"]
+    )
+    record_load("app_home_opened", report)
+
+    assert report.acked == report.sent
+    assert report.percentile(99) <= load_options["max_p99_latency"]
+
+
+@pytest.mark.asyncio
+async def test_app_home_opened__rate_limited(generator, load_options, record_load, slack_api):
+    """test acknowledgements are not slowed down while slack rate limits views.publish"""
+    # new users, whose home views were not published yet
+    generator = SlackLoadGenerator(
+        url=generator.url,
+        signing_secret=SIGNING_SECRET,
+        response_url=generator.response_url,
+        team_id=generator.team_id,
+        user_prefix="R",
+    )
+    slack_api.window, slack_api.limits = 1.0, {"views.publish": 10}
+    try:
+        report = await generator.run(
+            generator.make_home_opened, load_options["rate"], load_options["duration"]
+        )
+    finally:
+        slack_api.window, slack_api.limits = 60.0, {}
+    record_load("app_home_opened, views.publish rate limited", report)
+
+    assert report.errors == 0
+    assert set(report.statuses) <= {200, 429}
+    assert report.percentile(99) <= load_options["max_p99_latency"]
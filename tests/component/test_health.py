@@ -50,7 +50,35 @@ def test_readyz(host, port):
                 "observedValue": "true",
                 "status": "pass",
                 "time": AnyDatetimeString(),
-            }
+            },
+            {
+                "name": "slackbox:event-loop-lag",
+                "observedUnit": "ms",
+                "observedValue": AnyInstanceOf(str),
+                "status": "pass",
+                "time": AnyDatetimeString(),
+            },
+            {
+                "name": "slackbox:memory",
+                "observedUnit": "MiB",
+                "observedValue": AnyInstanceOf(str),
+                "status": "pass",
+                "time": AnyDatetimeString(),
+            },
+            {
+                "name": "slackbox:open-files",
+                "observedUnit": "files",
+                "observedValue": AnyInstanceOf(str),
+                "status": "pass",
+                "time": AnyDatetimeString(),
+            },
+            {
+                "name": "slackbox:slack-requests",
+                "observedUnit": "requests",
+                "observedValue": "0",
+                "status": "pass",
+                "time": AnyDatetimeString(),
+            },
         ],
         "service": "slackbox",
         "status": "pass",
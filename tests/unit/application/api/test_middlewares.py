@@ -0,0 +1,101 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+unit testing slackbox api middlewares
+"""
+
+from time import time
+from typing import Optional
+
+import pytest
+from slack_sdk.signature import SignatureVerifier
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from slackbox.application.api.middlewares import SlackSignatureMiddleware
+
+SECRET = "secret"
+
+
+async def echo(request: Request) -> Response:
+    """respond with the request body"""
+    return Response(content=await request.body())
+
+
+@pytest.fixture(name="client")
+def fixture_client() -> TestClient:
+    """test client of an application echoing slack requests behind the middleware"""
+    app = Starlette(routes=[Route("/slack/events", echo, methods=["POST"])])
+    app.add_middleware(SlackSignatureMiddleware, signing_secret=SECRET, max_body_size=64)
+    return TestClient(app)
+
+
+def sign(body: bytes, timestamp: Optional[int] = None, secret: str = SECRET) -> dict[str, str]:
+    """get the headers of a slack request signed with the given secret"""
+    timestamp_ = str(int(time()) if timestamp is None else timestamp)
+    verifier = SignatureVerifier(secret)
+    return {
+        "x-slack-request-timestamp": timestamp_,
+        "x-slack-signature": verifier.generate_signature(timestamp=timestamp_, body=body),
+    }
+
+
+def test_slack_signature_middleware(client):
+    """test signed requests reach the application with their body"""
+    body = b'{"event_id": "Ev1"}'
+
+    response = client.post("/slack/events", data=body, headers=sign(body))
+
+    assert response.status_code == 200
+    assert response.content == body
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {},
+        sign(b"{}", secret="forged"),
+        sign(b"{}", timestamp=int(time()) - 3600),
+        {**sign(b"{}"), "x-slack-request-timestamp": "now"},
+    ],
+)
+def test_slack_signature_middleware__unauthorized(client, headers):
+    """test unsigned, forged and stale requests are rejected"""
+    response = client.post("/slack/events", data=b"{}", headers=headers)
+
+    assert response.status_code == 401
+    assert response.json()["code"] == "unauthorized"
+
+
+def test_slack_signature_middleware__too_large(client):
+    """test requests larger than the maximum body size are rejected"""
+    body = b"{" + b" " * 64 + b"}"
+
+    response = client.post("/slack/events", data=body, headers=sign(body))
+
+    assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_slack_signature_middleware__streamed_too_large():
+    """test streamed bodies are rejected as soon as they get too large"""
+    middleware = SlackSignatureMiddleware(app=None, max_body_size=4)  # type: ignore
+    messages = [{"type": "http.request", "body": b"abc", "more_body": True}] * 3
+
+    async def receive():
+        return messages.pop()
+
+    assert await middleware.read_body(receive) is None
+    assert len(messages) == 1
+
+
+def test_slack_signature_middleware__other_paths(client):
+    """test requests to other paths are not verified"""
+    response = client.post("/other")
+
+    assert response.status_code == 404
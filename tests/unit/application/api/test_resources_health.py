@@ -9,14 +9,19 @@ unit testing slackbox health resources
 import json
 from datetime import datetime
 from unittest.mock import Mock
+from unittest.mock import patch
 
 import pytest
 
-from slackbox.application.api.resources.health import get_application_readiness
+from slackbox.application.api.resources.health import RenderedHealthResponse
+from slackbox.application.api.resources.health import get_liveness
 from slackbox.application.api.resources.health import get_livez
+from slackbox.application.api.resources.health import get_readiness
 from slackbox.application.api.resources.health import get_readyz
 from slackbox.application.health import ApplicationReadiness
 from slackbox.application.health import Check
+from slackbox.application.health import HealthRegistry
+from slackbox.application.health import HealthScheduler
 from slackbox.application.health import Status
 from tests.utils import AnyInstanceOf
 
@@ -28,23 +33,40 @@ def mock_request(url: str) -> Mock:
     return mock
 
 
-def mock_health_provider(success: bool = True) -> Mock:
-    """create a health provider mock"""
-    mock = Mock()
-    mock.get_check.return_value = Check(
+def make_check(success: bool = True, time: datetime = datetime(2020, 1, 1)) -> Check:
+    """create a health check"""
+    return Check(
         name="test",
-        time=datetime(2020, 1, 1),
+        time=time,
         status=Status.PASS if success else Status.FAIL,
         observed_value="true" if success else "false",
         observed_unit="boolean",
     )
+
+
+def mock_health_provider(success: bool = True) -> Mock:
+    """create a health provider mock"""
+    mock = Mock()
+    mock.get_check.return_value = make_check(success)
     return mock
 
 
-def test_get_application_readiness():
-    """make sure get_application_readiness returns a ApplicationReadiness"""
-    indicator = get_application_readiness()
-    assert isinstance(indicator, ApplicationReadiness)
+def test_get_readiness():
+    """make sure get_readiness returns a scheduler checking the application readiness"""
+    health = get_readiness()
+    assert isinstance(health, HealthScheduler)
+    assert any(
+        isinstance(indicator, ApplicationReadiness) for indicator in health.registry.indicators
+    )
+
+
+def test_get_liveness():
+    """make sure get_liveness returns a scheduler checking the application readiness"""
+    health = get_liveness()
+    assert isinstance(health, HealthScheduler)
+    assert any(
+        isinstance(indicator, ApplicationReadiness) for indicator in health.registry.indicators
+    )
 
 
 @pytest.mark.asyncio
@@ -52,7 +74,7 @@ async def test_readyz():
     """test readyz resource"""
     health_provider = mock_health_provider()
 
-    response = await get_readyz(application_ready=health_provider)
+    response = await get_readyz(health=HealthScheduler(HealthRegistry([health_provider])))
 
     assert response.status_code == 200
     assert json.loads(response.body) == {
@@ -76,7 +98,7 @@ async def test_livez():
     """test livez resource"""
     health_provider = mock_health_provider()
 
-    response = await get_livez(application_ready=health_provider)
+    response = await get_livez(health=HealthScheduler(HealthRegistry([health_provider])))
 
     assert response.status_code == 200
     assert json.loads(response.body) == {
@@ -93,3 +115,32 @@ async def test_livez():
         "status": "pass",
         "version": AnyInstanceOf(str),
     }
+
+
+@patch("slackbox.application.api.resources.health.monotonic")
+def test_rendered_health_response(monotonic):
+    """test health responses are rendered again only when stale or when a status changes"""
+    rendered = RenderedHealthResponse(ttl=1.0)
+
+    monotonic.return_value = 10.0
+    first = rendered.get_response([make_check(time=datetime(2020, 1, 1))])
+    monotonic.return_value = 10.5
+    cached = rendered.get_response([make_check(time=datetime(2020, 1, 2))])
+    changed = rendered.get_response([make_check(success=False, time=datetime(2020, 1, 3))])
+    monotonic.return_value = 11.5
+    expired = rendered.get_response([make_check(success=False, time=datetime(2020, 1, 4))])
+
+    assert first.body == cached.body
+    assert first.headers["content-type"] == "application/json"
+    assert json.loads(first.body)["checks"][0]["time"] == "2020-01-01T00:00:00"
+    assert json.loads(changed.body)["status"] == "fail"
+    assert json.loads(changed.body)["checks"][0]["time"] == "2020-01-03T00:00:00"
+    assert json.loads(expired.body)["checks"][0]["time"] == "2020-01-04T00:00:00"
+
+
+def test_rendered_health_response__failure_status_code():
+    """test failing health responses use the failure status code"""
+    rendered = RenderedHealthResponse(failure_status_code=503)
+
+    assert rendered.get_response([make_check(success=False)]).status_code == 503
+    assert rendered.get_response([make_check(success=True)]).status_code == 200
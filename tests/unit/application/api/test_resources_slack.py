@@ -0,0 +1,264 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+unit testing slackbox slack resources
+"""
+
+from unittest.mock import AsyncMock
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+from fastapi import Response
+from slack_bolt.response import BoltResponse
+from slack_sdk.socket_mode.request import SocketModeRequest
+from starlette.exceptions import HTTPException
+
+from slackbox.application.api.resources.slack import endpoint
+from slackbox.application.api.resources.slack import get_delivery_key
+from slackbox.application.api.resources.slack import get_payload_team
+from slackbox.application.api.resources.slack import install
+from slackbox.application.api.resources.slack import oauth_redirect
+from slackbox.application.api.resources.slack import socket_mode
+from slackbox.domain.slack import BUSY_MESSAGE
+from slackbox.infrastructure.deduplication import MemoryDeduplicationBackend
+
+
+def make_request(body: bytes, content_type: str = "application/json") -> Mock:
+    """make a slack request"""
+    return Mock(headers={"content-type": content_type}, body=AsyncMock(return_value=body))
+
+
+@pytest.mark.asyncio
+@patch("slackbox.application.api.resources.slack.handler")
+@patch("slackbox.application.api.resources.slack.work_queue")
+async def test_endpoint(work_queue, handler):
+    """test slack requests are handed to the bolt handler"""
+    work_queue.full.return_value = False
+    response = Response(status_code=200)
+    handler.handle = AsyncMock(return_value=response)
+    request = Mock(headers={}, body=AsyncMock(return_value=b"{}"))
+
+    assert await endpoint(request) is response
+    handler.handle.assert_awaited_once_with(request)
+
+
+@pytest.mark.asyncio
+@patch("slackbox.application.api.resources.slack.handler")
+@patch("slackbox.application.api.resources.slack.work_queue")
+async def test_endpoint__shedding(work_queue, handler):
+    """test events are rejected while the work queue is full for their team"""
+    work_queue.full.return_value = True
+    handler.handle = AsyncMock()
+    body = b'{"type": "event_callback", "event_id": "Ev1", "team_id": "T1"}'
+
+    with pytest.raises(HTTPException) as error:
+        await endpoint(make_request(body))
+
+    assert error.value.status_code == 429
+    work_queue.full.assert_called_once_with("T1")
+    handler.handle.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch("slackbox.application.api.resources.slack.handler")
+@patch("slackbox.application.api.resources.slack.work_queue")
+async def test_endpoint__shedding_commands(work_queue, handler):
+    """test commands reach their listener, answering them, while the work queue is full"""
+    work_queue.full.return_value = True
+    response = Response(status_code=200)
+    handler.handle = AsyncMock(return_value=response)
+    request = make_request(
+        b"command=%2Fbeerbox&team_id=T1&trigger_id=Tr1", "application/x-www-form-urlencoded"
+    )
+
+    assert await endpoint(request) is response
+    handler.handle.assert_awaited_once_with(request)
+
+
+@pytest.mark.parametrize(
+    "body,content_type,key",
+    [
+        (b'{"event_id": "Ev1"}', "application/json", "event:Ev1"),
+        (b"command=%2Fbeerbox&trigger_id=T1", "application/x-www-form-urlencoded", "trigger:T1"),
+        (
+            b"payload=%7B%22trigger_id%22%3A%22T2%22%7D",
+            "application/x-www-form-urlencoded",
+            "trigger:T2",
+        ),
+        (b'{"type": "url_verification"}', "application/json", None),
+        (b"[]", "application/json", None),
+        (b"not json", "application/json", None),
+    ],
+)
+def test_get_delivery_key(body, content_type, key):
+    """test deliveries are identified by their event id or trigger id"""
+    assert get_delivery_key(body, content_type) == key
+
+
+@pytest.mark.parametrize(
+    "data,team",
+    [
+        ({"type": "event_callback", "team_id": "T1"}, "T1"),
+        ({"type": "block_actions", "team": {"id": "T2"}}, "T2"),
+        ({"type": "url_verification"}, None),
+        (None, None),
+    ],
+)
+def test_get_payload_team(data, team):
+    """test deliveries are attributed to their team"""
+    assert get_payload_team(data) == team
+
+
+@pytest.mark.asyncio
+@patch(
+    "slackbox.application.api.resources.slack.deliveries", new_callable=MemoryDeduplicationBackend
+)
+@patch("slackbox.application.api.resources.slack.handler")
+@patch("slackbox.application.api.resources.slack.work_queue")
+async def test_endpoint__redelivery(work_queue, handler, _):
+    """test redeliveries of an event are acknowledged without being handled again"""
+    work_queue.full.return_value = False
+    handled = Response(status_code=200, content="handled")
+    handler.handle = AsyncMock(return_value=handled)
+    body = b'{"event_id": "Ev1"}'
+
+    assert await endpoint(make_request(body)) is handled
+    response = await endpoint(make_request(body))
+
+    assert response.status_code == 200
+    assert response is not handled
+    handler.handle.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch(
+    "slackbox.application.api.resources.slack.deliveries", new_callable=MemoryDeduplicationBackend
+)
+@patch("slackbox.application.api.resources.slack.handler")
+@patch("slackbox.application.api.resources.slack.work_queue")
+async def test_endpoint__failed_delivery(work_queue, handler, _):
+    """test retries of deliveries that failed to be handled are handled again"""
+    work_queue.full.return_value = False
+    handled = Response(status_code=200)
+    handler.handle = AsyncMock(
+        side_effect=[Response(status_code=500), ValueError("boom"), handled]
+    )
+    body = b'{"event_id": "Ev1"}'
+
+    assert (await endpoint(make_request(body))).status_code == 500
+    with pytest.raises(ValueError):
+        await endpoint(make_request(body))
+    assert await endpoint(make_request(body)) is handled
+
+    assert handler.handle.await_count == 3
+
+
+def make_envelope(kind: str, payload: dict) -> SocketModeRequest:
+    """make a socket mode envelope"""
+    return SocketModeRequest(type=kind, envelope_id=f"{kind}-envelope", payload=payload)
+
+
+@pytest.mark.asyncio
+@patch("slackbox.infrastructure.socket_mode.run_async_bolt_app")
+@patch("slackbox.application.api.resources.slack.work_queue")
+async def test_socket_mode__shedding(work_queue, run_async_bolt_app):
+    """
+    test event envelopes are acknowledged without being dispatched when the work queue is full
+    for their team
+    """
+    work_queue.full.return_value = True
+    client = Mock(send_socket_mode_response=AsyncMock())
+
+    await socket_mode.handle(client, make_envelope("events_api", {"team_id": "T1"}))
+
+    work_queue.full.assert_called_once_with("T1")
+    run_async_bolt_app.assert_not_called()
+    client.send_socket_mode_response.assert_awaited_once()
+    assert client.send_socket_mode_response.await_args.args[0].to_dict() == {
+        "envelope_id": "events_api-envelope"
+    }
+
+
+@pytest.mark.asyncio
+@patch("slackbox.infrastructure.socket_mode.send_async_response", new_callable=AsyncMock)
+@patch("slackbox.infrastructure.socket_mode.run_async_bolt_app", new_callable=AsyncMock)
+@patch("slackbox.application.api.resources.slack.work_queue")
+async def test_socket_mode__shedding_commands(work_queue, run_async_bolt_app, _):
+    """test command envelopes reach their listener, answering them, while the queue is full"""
+    work_queue.full.return_value = True
+    run_async_bolt_app.return_value = BoltResponse(status=200, body=BUSY_MESSAGE)
+    envelope = make_envelope("slash_commands", {"team_id": "T1", "command": "/beerbox"})
+
+    await socket_mode.handle(Mock(send_socket_mode_response=AsyncMock()), envelope)
+
+    run_async_bolt_app.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch(
+    "slackbox.application.api.resources.slack.deliveries", new_callable=MemoryDeduplicationBackend
+)
+@patch("slackbox.infrastructure.socket_mode.send_async_response", new_callable=AsyncMock)
+@patch("slackbox.infrastructure.socket_mode.run_async_bolt_app", new_callable=AsyncMock)
+@patch("slackbox.application.api.resources.slack.work_queue")
+async def test_socket_mode__redelivery(work_queue, run_async_bolt_app, send_async_response, _):
+    """test redelivered envelopes are acknowledged without being dispatched again"""
+    work_queue.full.return_value = False
+    run_async_bolt_app.return_value = BoltResponse(status=200)
+    client = Mock(send_socket_mode_response=AsyncMock())
+    envelope = make_envelope("events_api", {"event_id": "Ev1"})
+
+    await socket_mode.handle(client, envelope)
+    await socket_mode.handle(client, envelope)
+
+    run_async_bolt_app.assert_awaited_once()
+    send_async_response.assert_awaited_once()
+    client.send_socket_mode_response.assert_awaited_once()
+    assert client.send_socket_mode_response.await_args.args[0].to_dict() == {
+        "envelope_id": "events_api-envelope"
+    }
+
+
+@pytest.mark.asyncio
+@patch(
+    "slackbox.application.api.resources.slack.deliveries", new_callable=MemoryDeduplicationBackend
+)
+@patch("slackbox.application.api.resources.slack.slack_requests")
+@patch("slackbox.infrastructure.socket_mode.send_async_response", new_callable=AsyncMock)
+@patch("slackbox.infrastructure.socket_mode.run_async_bolt_app", new_callable=AsyncMock)
+@patch("slackbox.application.api.resources.slack.work_queue")
+async def test_socket_mode__failed_delivery(work_queue, run_async_bolt_app, _, slack_requests, __):
+    """test envelopes are tracked, and redeliveries of failed envelopes dispatched again"""
+    work_queue.full.return_value = False
+    run_async_bolt_app.side_effect = [
+        BoltResponse(status=500),
+        ValueError("boom"),
+        BoltResponse(status=200),
+    ]
+    client = Mock(send_socket_mode_response=AsyncMock())
+    envelope = make_envelope("events_api", {"event_id": "Ev1"})
+
+    await socket_mode.handle(client, envelope)
+    with pytest.raises(ValueError):
+        await socket_mode.handle(client, envelope)
+    await socket_mode.handle(client, envelope)
+    await socket_mode.handle(client, envelope)
+
+    assert run_async_bolt_app.await_count == 3
+    assert slack_requests.track.call_count == 3
+    client.send_socket_mode_response.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("resource", [install, oauth_redirect])
+@patch("slackbox.application.api.resources.slack.handler")
+async def test_oauth_flow(handler, resource):
+    """test installation requests are handed to the bolt handler"""
+    handler.handle = AsyncMock(return_value="response")
+    request = Mock()
+
+    assert await resource(request) == "response"
+    handler.handle.assert_awaited_once_with(request)
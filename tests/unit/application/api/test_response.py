@@ -6,8 +6,20 @@ license: MIT
 unit testing slackbox api response
 """
 
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any
+from typing import Optional
+from typing import Union
+from unittest.mock import patch
+
+from fastapi.encoders import jsonable_encoder
+
 from slackbox.application.api.components.base import APIComponent
+from slackbox.application.api.components.error_response import ErrorResponse
 from slackbox.application.api.response import APIResponse
+from slackbox.application.api.response import get_serialization_plan
 
 
 class Dummy(APIComponent):
@@ -16,6 +28,32 @@ class Dummy(APIComponent):
     dummy: bool
 
 
+class Color(Enum):
+    """dummy enum to test rendering"""
+
+    RED = "red"
+
+
+class Nested(APIComponent):
+    """nested component to test rendering"""
+
+    created_at: datetime
+    color: Color
+    dummies: list[Dummy]
+    parent: Optional[Dummy] = None
+    extra_data: Optional[Any] = None
+    comment: Optional[str] = None
+
+
+NESTED = Nested(
+    created_at=datetime(2020, 1, 1, 12, 30),
+    color=Color.RED,
+    dummies=[Dummy(dummy=True)],
+    extra_data={"key": None, "values": [1, 2]},
+    comment=None,
+)
+
+
 def test_render_single():
     """test the response rendering with a single component"""
     response = APIResponse(content=Dummy(dummy=True), status_code=418)
@@ -26,3 +64,76 @@ def test_render_list():
     """test the response rendering with a single component"""
     response = APIResponse(content=[Dummy(dummy=True), Dummy(dummy=False)], status_code=418)
     assert response.body == b'[{"dummy":true},{"dummy":false}]'
+
+
+def test_render_nested():
+    """test the response rendering with nested components"""
+    response = APIResponse(content=NESTED, status_code=200)
+
+    assert json.loads(response.body) == {
+        "createdAt": "2020-01-01T12:30:00",
+        "color": "red",
+        "dummies": [{"dummy": True}],
+        "extraData": {"key": None, "values": [1, 2]},
+    }
+
+
+@patch("slackbox.application.api.response.orjson", new=None)
+def test_render_without_orjson():
+    """test the response rendering falls back on the standard json module"""
+    response = APIResponse(content=[Dummy(dummy=True), Dummy(dummy=False)], status_code=418)
+    assert response.body == b'[{"dummy":true},{"dummy":false}]'
+
+
+def test_render_non_string_keys():
+    """test dict keys are rendered as strings, with or without orjson"""
+    error = ErrorResponse(code="x", message="m", data={1: "a"})
+    response = APIResponse(content=error)
+    with patch("slackbox.application.api.response.orjson", new=None):
+        fallback = APIResponse(content=error)
+
+    assert json.loads(response.body) == {"code": "x", "message": "m", "data": {"1": "a"}}
+    assert json.loads(fallback.body) == json.loads(response.body)
+
+
+def test_serialization_plan():
+    """test serialization plans match pydantic serialization and are built once per class"""
+    plan = get_serialization_plan(Nested)
+
+    assert get_serialization_plan(Nested) is plan
+    assert plan.serialize(NESTED) == jsonable_encoder(
+        NESTED.dict(by_alias=True, exclude_unset=True, exclude_none=True)
+    )
+
+
+class Inner(APIComponent):
+    """component with optional fields nested in union and dict fields"""
+
+    some_field: int
+    other_field: Optional[int] = None
+
+
+class Mixed(APIComponent):
+    """component holding nested components in fields whose type is only known at runtime"""
+
+    union: Union[Inner, int]
+    mapping: dict[str, Inner]
+    items: list[Union[Inner, str]]
+    nested: dict[str, list[Inner]]
+
+
+def test_serialization_plan__runtime_types():
+    """test components in union and dict fields are serialized like pydantic would"""
+    mixed = Mixed(
+        union=Inner(some_field=1),
+        mapping={"key": Inner(some_field=2, other_field=None)},
+        items=[Inner(some_field=3), "item"],
+        nested={"key": [Inner(some_field=4, other_field=5)]},
+    )
+
+    data = get_serialization_plan(Mixed).serialize(mixed)
+
+    assert data == jsonable_encoder(
+        mixed.dict(by_alias=True, exclude_unset=True, exclude_none=True)
+    )
+    assert data["union"] == {"someField": 1}
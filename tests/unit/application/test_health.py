@@ -6,13 +6,24 @@ license: MIT
 unit testing slackbox health indicators
 """
 
+import asyncio
+import time
 from datetime import datetime
 from datetime import timezone
+from time import monotonic
 from unittest.mock import Mock
 from unittest.mock import patch
 
+import pytest
+
 from slackbox.application.health import ApplicationReadiness
 from slackbox.application.health import Check
+from slackbox.application.health import EventLoopLag
+from slackbox.application.health import HealthRegistry
+from slackbox.application.health import HealthScheduler
+from slackbox.application.health import InFlightRequests
+from slackbox.application.health import MemoryUsage
+from slackbox.application.health import OpenFiles
 from slackbox.application.health import Status
 
 NOW = datetime(2020, 1, 1, tzinfo=timezone.utc)
@@ -43,3 +54,201 @@ def test_application_readiness():
         observed_value="true",
         observed_unit="boolean",
     )
+
+
+class SlowIndicator:
+    """async health indicator taking its time"""
+
+    def __init__(self, name: str, delay: float):
+        self.name = name
+        self.delay = delay
+
+    async def get_check(self) -> Check:
+        """return a passing check after a delay"""
+        await asyncio.sleep(self.delay)
+        return Check(
+            name=self.name,
+            time=NOW,
+            status=Status.PASS,
+            observed_value="true",
+            observed_unit="boolean",
+        )
+
+
+class BrokenIndicator:
+    """sync health indicator raising an error"""
+
+    name = "broken"
+
+    def get_check(self) -> Check:
+        """raise an error"""
+        raise RuntimeError("broken")
+
+
+@pytest.mark.asyncio
+async def test_health_registry__concurrency():
+    """test indicators are evaluated concurrently"""
+    registry = HealthRegistry(timeout=1.0)
+    for index in range(5):
+        registry.register(SlowIndicator(f"slow-{index}", 0.1))
+
+    start = monotonic()
+    checks = await registry.get_checks()
+
+    assert monotonic() - start < 0.3
+    assert [check.name for check in checks] == [f"slow-{index}" for index in range(5)]
+    assert Status.all(check.status for check in checks) is Status.PASS
+
+
+@pytest.mark.asyncio
+@patch("slackbox.application.health.datetime", new=mock_datetime(now=NOW))
+async def test_health_registry__failures():
+    """test slow and broken indicators yield failing checks"""
+    registry = HealthRegistry(
+        [ApplicationReadiness(), SlowIndicator("slow", 1.0), BrokenIndicator()],
+        timeout=0.05,
+    )
+
+    checks = await registry.get_checks()
+
+    assert checks == [
+        Check(
+            name="slackbox:ready",
+            time=NOW,
+            status=Status.PASS,
+            observed_value="true",
+            observed_unit="boolean",
+        ),
+        Check(
+            name="slow",
+            time=NOW,
+            status=Status.FAIL,
+            observed_value="timeout",
+            observed_unit="error",
+        ),
+        Check(
+            name="broken",
+            time=NOW,
+            status=Status.FAIL,
+            observed_value="RuntimeError",
+            observed_unit="error",
+        ),
+    ]
+
+
+class CountingIndicator:
+    """sync health indicator counting its evaluations"""
+
+    def __init__(self, name: str, interval: float):
+        self.name = name
+        self.interval = interval
+        self.count = 0
+
+    def get_check(self) -> Check:
+        """return a passing check counting evaluations"""
+        self.count += 1
+        return Check(
+            name=self.name,
+            time=NOW,
+            status=Status.PASS,
+            observed_value=str(self.count),
+            observed_unit="evaluations",
+        )
+
+
+@pytest.mark.asyncio
+async def test_health_scheduler__on_demand():
+    """test checks are evaluated on demand then served from the cache"""
+    indicator = CountingIndicator("counting", interval=10.0)
+    scheduler = HealthScheduler(HealthRegistry([indicator]))
+
+    first = await scheduler.get_checks()
+    second = await scheduler.get_checks()
+
+    assert first == second
+    assert indicator.count == 1
+
+
+@pytest.mark.asyncio
+async def test_health_scheduler__background():
+    """test indicators are evaluated in the background on their own interval"""
+    fast = CountingIndicator("fast", interval=0.01)
+    slow = CountingIndicator("slow", interval=10.0)
+    scheduler = HealthScheduler(HealthRegistry([fast, slow]))
+
+    await scheduler.start()
+    await asyncio.sleep(0.1)
+    await scheduler.stop()
+    count = fast.count
+    checks = await scheduler.get_checks()
+
+    assert count > 3
+    assert slow.count == 1
+    assert [check.observed_value for check in checks] == [str(count), "1"]
+    await asyncio.sleep(0.05)
+    assert fast.count == count
+
+
+@pytest.mark.asyncio
+async def test_health_scheduler__stale():
+    """test stale checks are reported as failing with their age"""
+    indicator = CountingIndicator("counting", interval=1.0)
+    scheduler = HealthScheduler(HealthRegistry([indicator]), max_age_factor=2.0)
+    await scheduler.get_checks()
+
+    with patch("slackbox.application.health.monotonic", return_value=monotonic() + 2.5):
+        checks = await scheduler.get_checks()
+
+    assert checks[0].status is Status.FAIL
+    assert checks[0].observed_unit == "s"
+    assert 2.4 < float(checks[0].observed_value) < 2.6
+
+
+@pytest.mark.asyncio
+async def test_event_loop_lag():
+    """test event loop lag health indicator fails when callbacks are delayed"""
+    indicator = EventLoopLag(maximum=20.0)
+    loop = asyncio.get_running_loop()
+
+    idle = await indicator.get_check()
+    loop.call_soon(lambda: time.sleep(0.05))
+    saturated = await indicator.get_check()
+
+    assert idle.name == "slackbox:event-loop-lag"
+    assert idle.status is Status.PASS
+    assert saturated.status is Status.FAIL
+    assert saturated.observed_unit == "ms"
+    assert float(saturated.observed_value) >= 50
+
+
+def test_memory_usage():
+    """test memory usage health indicator"""
+    assert MemoryUsage().get_check().status is Status.PASS
+    assert MemoryUsage(maximum=1).get_check().status is Status.FAIL
+    assert float(MemoryUsage().get_check().observed_value) > 1
+
+
+def test_open_files():
+    """test open files health indicator"""
+    check = OpenFiles().get_check()
+    with open(__file__, encoding="utf-8"):
+        with_file = OpenFiles(maximum=int(check.observed_value)).get_check()
+
+    assert check.status is Status.PASS
+    assert with_file.status is Status.FAIL
+    assert int(with_file.observed_value) == int(check.observed_value) + 1
+
+
+def test_in_flight_requests():
+    """test in flight requests health indicator"""
+    indicator = InFlightRequests(name="requests", maximum=1)
+
+    with indicator.track():
+        single = indicator.get_check()
+        with indicator.track():
+            double = indicator.get_check()
+
+    assert single.status is Status.PASS
+    assert double.status is Status.FAIL
+    assert double.observed_value == "2"
+    assert indicator.get_check().observed_value == "0"
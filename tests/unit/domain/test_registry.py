@@ -0,0 +1,116 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+unit testing slackbox slack handler registry
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from slack_bolt.async_app import AsyncApp
+from slack_bolt.request.async_request import AsyncBoltRequest
+from slack_sdk.web.async_client import AsyncWebClient
+
+from slackbox.domain.registry import HandlerRegistry
+from slackbox.domain.registry import RouteKind
+from slackbox.domain.registry import get_route
+from tests.utils import FakeSlackServer
+
+EVENT = {"type": "event_callback", "team_id": "T0", "event": {"type": "app_mention", "text": "hi"}}
+COMMAND = {"command": "/beer", "text": "ipa", "team_id": "T0", "response_url": "http://hooks"}
+ACTION = {"type": "block_actions", "team": {"id": "T0"}, "actions": [{"action_id": "buy"}]}
+
+
+def make_app(server: FakeSlackServer) -> AsyncApp:
+    """make a bolt app calling the fake slack web api"""
+    return AsyncApp(
+        client=AsyncWebClient(token="xoxb", base_url=server.base_url),
+        signing_secret="secret",
+        process_before_response=True,
+        request_verification_enabled=False,
+    )
+
+
+async def dispatch(app: AsyncApp, body: dict) -> int:
+    """dispatch a request body to the app, returning the response status"""
+    response = await app.async_dispatch(AsyncBoltRequest(body=body, mode="socket_mode"))
+    return response.status
+
+
+@pytest.mark.parametrize(
+    "body,route",
+    [
+        (EVENT, (RouteKind.EVENT, "app_mention")),
+        (COMMAND, (RouteKind.COMMAND, "/beer")),
+        (ACTION, (RouteKind.ACTION, "buy")),
+        ({"type": "view_submission"}, None),
+    ],
+)
+def test_get_route(body, route):
+    """test requests are routed by event type, command name and action id"""
+    assert get_route(body) == route
+
+
+@pytest.mark.asyncio
+async def test_handler_registry():
+    """test requests are dispatched to their handler with the arguments it expects"""
+    async with FakeSlackServer() as server:
+        app = make_app(server)
+        registry = HandlerRegistry(app)
+        calls = []
+
+        @registry.event("app_mention")
+        async def mention(event, client):
+            calls.append((event["text"], client.token))
+
+        @registry.command("/beer")
+        async def beer(ack, command):
+            await ack()
+            calls.append(command["text"])
+
+        @registry.action("buy")
+        async def buy(ack, action):
+            await ack()
+            calls.append(action["action_id"])
+
+        statuses = [await dispatch(app, body) for body in (EVENT, COMMAND, ACTION)]
+
+    assert statuses == [200, 200, 200]
+    assert calls == [("hi", "xoxb"), "ipa", "buy"]
+
+
+@pytest.mark.asyncio
+async def test_handler_registry__unknown_route():
+    """test requests without handler are left unhandled"""
+    async with FakeSlackServer() as server:
+        app = make_app(server)
+        HandlerRegistry(app)
+
+        assert await dispatch(app, COMMAND) == 404
+
+
+@pytest.mark.asyncio
+async def test_handler_registry__lazy_loading():
+    """test handlers registered by path are imported on first dispatch only"""
+    calls = []
+
+    async def beer(ack, command):
+        await ack()
+        calls.append(command["text"])
+
+    async with FakeSlackServer() as server:
+        app = make_app(server)
+        registry = HandlerRegistry(app)
+        with patch("slackbox.domain.registry.import_module") as import_module:
+            import_module.return_value = SimpleNamespace(beer=beer)
+            registry.register(RouteKind.COMMAND, "/beer", "features.beer:beer")
+            import_module.assert_not_called()
+
+            for _ in range(2):
+                assert await dispatch(app, COMMAND) == 200
+
+    import_module.assert_called_once_with("features.beer")
+    assert calls == ["ipa", "ipa"]
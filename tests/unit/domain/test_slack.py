@@ -0,0 +1,317 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+unit testing slackbox slack domain
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+from slack_bolt.context.async_context import AsyncBoltContext
+from slack_sdk.web.async_client import AsyncWebClient
+
+from slackbox.domain.slack import BUSY_MESSAGE
+from slackbox.domain.slack import BlockKitLimitExceeded
+from slackbox.domain.slack import DeliveryError
+from slackbox.domain.slack import DividerBlockBuilder
+from slackbox.domain.slack import HomePublisher
+from slackbox.domain.slack import HomeViewCache
+from slackbox.domain.slack import MarkdownBlockBuilder
+from slackbox.domain.slack import ViewBuilder
+from slackbox.domain.slack import beerbox_controller
+from slackbox.domain.slack import get_encoded_size
+from slackbox.domain.slack import home_controller
+from slackbox.domain.slack import home_views
+from slackbox.domain.slack import http_session
+from slackbox.domain.slack import process_beerbox_command
+from slackbox.domain.slack import publish_home
+from slackbox.domain.slack import rate_limiter
+from slackbox.domain.slack import share_client_resources
+from slackbox.infrastructure.queue import WorkQueueFull
+from slackbox.infrastructure.slack import RateLimitedWebClient
+from slackbox.infrastructure.slack import SessionRespond
+
+
+@pytest.fixture(name="_", autouse=True)
+def fixture_reset_home_views():
+    """forget home views published by previous tests"""
+    home_views.invalidate()
+
+
+@pytest.mark.asyncio
+@patch("slackbox.domain.slack.work_queue")
+async def test_beerbox_controller(work_queue):
+    """test the command is acknowledged and processed in the background"""
+    ack = AsyncMock()
+    respond = AsyncMock(return_value=Mock(status_code=200))
+
+    context = AsyncBoltContext(team_id="T1", user_id="U1")
+
+    await beerbox_controller(ack=ack, respond=respond, command={"text": "beer"}, context=context)
+
+    ack.assert_awaited_once_with()
+    respond.assert_not_awaited()
+    assert work_queue.submit.call_args.kwargs["team"] == "T1"
+    assert work_queue.submit.call_args.kwargs["user"] == "U1"
+    job = work_queue.submit.call_args.args[0]
+    await job()
+    respond.assert_awaited_once_with("you requested 'beer' from beerbox")
+
+
+@pytest.mark.asyncio
+@patch("slackbox.domain.slack.work_queue")
+async def test_beerbox_controller__busy(work_queue):
+    """test the user is asked to retry when the work queue is full"""
+    work_queue.submit.side_effect = WorkQueueFull()
+    ack = AsyncMock()
+    respond = AsyncMock()
+    context = AsyncBoltContext(team_id="T1", user_id="U1")
+
+    await beerbox_controller(ack=ack, respond=respond, command={"text": "beer"}, context=context)
+
+    ack.assert_awaited_once_with(BUSY_MESSAGE)
+    respond.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch("slackbox.domain.slack.work_queue")
+async def test_home_controller__busy(work_queue):
+    """test home views are skipped when the work queue is full"""
+    work_queue.submit.side_effect = WorkQueueFull()
+    logger = Mock()
+
+    await home_controller(
+        client=AsyncMock(), event={"user": "U1"}, logger=logger, context=AsyncBoltContext()
+    )
+
+    logger.warning.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_process_beerbox_command__failure():
+    """test failing response url deliveries raise to be retried"""
+    respond = AsyncMock(return_value=Mock(status_code=500))
+
+    with pytest.raises(DeliveryError):
+        await process_beerbox_command(respond, "beer")
+
+
+@pytest.mark.asyncio
+@patch("slackbox.domain.slack.work_queue")
+async def test_home_controller(work_queue):
+    """test the home view is published in the background"""
+    client = AsyncMock()
+
+    context = AsyncBoltContext(team_id="T1")
+
+    await home_controller(client=client, event={"user": "U1"}, logger=Mock(), context=context)
+
+    client.views_publish.assert_not_awaited()
+    assert work_queue.submit.call_args.kwargs["team"] == "T1"
+    job = work_queue.submit.call_args.args[0]
+    await job()
+    client.views_publish.assert_awaited_once()
+    assert client.views_publish.call_args.kwargs["user_id"] == "U1"
+
+
+@pytest.mark.asyncio
+async def test_publish_home__failure():
+    """test home publishing errors are logged"""
+    client = AsyncMock()
+    client.views_publish.side_effect = ValueError("boom")
+    logger = Mock()
+
+    await publish_home(client, "U1", logger)
+
+    logger.error.assert_called_once_with("Error publishing home tab: boom")
+
+
+@pytest.mark.asyncio
+async def test_publish_home__cached():
+    """test unchanged home views are published only once per user"""
+    client = AsyncMock()
+
+    await publish_home(client, "U1", Mock())
+    await publish_home(client, "U1", Mock())
+    await publish_home(client, "U2", Mock())
+    home_views.invalidate("U1")
+    await publish_home(client, "U1", Mock())
+
+    assert [call.kwargs["user_id"] for call in client.views_publish.call_args_list] == [
+        "U1",
+        "U2",
+        "U1",
+    ]
+
+
+def test_home_view_cache():
+    """test home view cache tracks the last view published to each user"""
+    cache = HomeViewCache(max_size=2, ttl=60)
+    view = {"type": "home", "blocks": []}
+    other_view = {"type": "home", "blocks": [{"type": "divider"}]}
+
+    cache.set_published("U1", view)
+
+    assert cache.is_published("U1", view)
+    assert cache.is_published("U1", {"blocks": [], "type": "home"})
+    assert not cache.is_published("U1", other_view)
+    assert not cache.is_published("U2", view)
+    cache.invalidate()
+    assert not cache.is_published("U1", view)
+
+
+@pytest.mark.asyncio
+async def test_share_client_resources():
+    """test listeners receive a client sharing the app's rate limiter"""
+    context = AsyncBoltContext(client=AsyncWebClient(token="xoxb"))
+    next_ = AsyncMock()
+
+    await share_client_resources(context=context, next_=next_)
+
+    assert isinstance(context.client, RateLimitedWebClient)
+    assert context.client.rate_limiter is rate_limiter
+    assert context.client.token == "xoxb"
+    assert "respond" not in context
+    next_.assert_awaited_once_with()
+
+
+@pytest.mark.asyncio
+async def test_share_client_resources__session():
+    """test clients and respond functions use the shared http session"""
+    await http_session.start()
+    context = AsyncBoltContext(client=AsyncWebClient(), response_url="http://localhost/hooks")
+
+    await share_client_resources(context=context, next_=AsyncMock())
+    await http_session.stop()
+
+    assert isinstance(context.respond, SessionRespond)
+    assert context.respond.response_url == "http://localhost/hooks"
+    assert context.respond.session is context.client.session is not None
+
+
+def make_slow_client() -> AsyncMock:
+    """make a client whose publishes wait for the next event loop iterations"""
+
+    async def views_publish(**_):
+        await asyncio.sleep(0.01)
+
+    client = AsyncMock()
+    client.views_publish.side_effect = views_publish
+    return client
+
+
+@pytest.mark.asyncio
+async def test_home_publisher__coalescing():
+    """test concurrent publishes of the same view to a user share a single request"""
+    publisher = HomePublisher()
+    client = make_slow_client()
+    view = {"type": "home", "blocks": []}
+
+    await asyncio.gather(*(publisher.publish(client, "U1", view) for _ in range(3)))
+    await publisher.publish(client, "U2", view)
+
+    assert client.views_publish.await_count == 2
+    assert publisher.stats.coalesced == 2
+
+
+@pytest.mark.asyncio
+async def test_home_publisher__superseded():
+    """test views superseded while waiting for the in flight publish are dropped"""
+    publisher = HomePublisher()
+    client = make_slow_client()
+    views = [{"type": "home", "callback_id": str(i)} for i in range(3)]
+
+    await asyncio.gather(*(publisher.publish(client, "U1", view) for view in views))
+
+    assert [call.kwargs["view"] for call in client.views_publish.await_args_list] == [
+        views[0],
+        views[2],
+    ]
+    assert publisher.stats.superseded == 1
+
+
+@pytest.mark.asyncio
+async def test_home_publisher__failure():
+    """test publishing errors are raised to every coalesced caller"""
+    publisher = HomePublisher()
+    client = AsyncMock()
+    client.views_publish.side_effect = ValueError("boom")
+    view = {"type": "home", "blocks": []}
+
+    results = await asyncio.gather(
+        publisher.publish(client, "U1", view),
+        publisher.publish(client, "U1", view),
+        return_exceptions=True,
+    )
+
+    assert [type(result) for result in results] == [ValueError, ValueError]
+    await publisher.publish(AsyncMock(), "U1", view)
+
+
+def test_view_builder__size():
+    """test the encoded size of the view is kept up to date as blocks are added"""
+    view = ViewBuilder(type_="home", callback_id="home_view")
+
+    for _ in range(3):
+        view.add_block(MarkdownBlockBuilder().text("hello").build())
+    view.add_block(DividerBlockBuilder().build())
+
+    assert view.size == get_encoded_size(view.build())
+
+
+def test_view_builder__text_too_long():
+    """test blocks with too long texts are refused"""
+    view = ViewBuilder(type_="home", callback_id="home_view")
+
+    with pytest.raises(BlockKitLimitExceeded):
+        view.add_block(MarkdownBlockBuilder().text("a" * 3001).build())
+
+
+@pytest.mark.parametrize("max_blocks,max_size", [(2, None), (100, 100)])
+def test_view_builder__limits(max_blocks, max_size):
+    """test views exceeding their limits are refused"""
+    view = ViewBuilder(type_="home", callback_id="id", max_blocks=max_blocks, max_size=max_size)
+
+    for _ in range(3):
+        view.add_block(MarkdownBlockBuilder().text("hello world").build())
+
+    with pytest.raises(BlockKitLimitExceeded):
+        view.build()
+
+
+def test_view_builder__build_pages():
+    """test blocks are split into pages within limits"""
+    block = MarkdownBlockBuilder().text("hello world").build()
+    empty_size = get_encoded_size(ViewBuilder(type_="home", callback_id="id").build())
+    max_size = empty_size + 2 * get_encoded_size(block) + 1
+    view = ViewBuilder(type_="home", callback_id="id", max_blocks=3, max_size=max_size)
+    for _ in range(5):
+        view.add_block(block)
+
+    pages = view.build_pages()
+
+    assert [len(page["blocks"]) for page in pages] == [2, 2, 1]
+    assert all(get_encoded_size(page) <= max_size for page in pages)
+
+
+def test_view_builder__build_pages_max_blocks():
+    """test pages hold at most the maximum number of blocks"""
+    view = ViewBuilder(type_="home", callback_id="id", max_blocks=2)
+    for _ in range(3):
+        view.add_block(DividerBlockBuilder().build())
+
+    assert [len(page["blocks"]) for page in view.build_pages()] == [2, 1]
+
+
+def test_view_builder__build_pages_block_too_big():
+    """test blocks too big for any page are refused"""
+    view = ViewBuilder(type_="home", callback_id="id", max_size=10)
+    view.add_block(DividerBlockBuilder().build())
+
+    with pytest.raises(BlockKitLimitExceeded):
+        view.build_pages()
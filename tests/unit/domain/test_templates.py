@@ -0,0 +1,83 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+unit testing slackbox precompiled block kit templates
+"""
+
+import json
+
+import pytest
+
+from slackbox.domain.templates import Slot
+from slackbox.domain.templates import Template
+from slackbox.domain.templates import Text
+from slackbox.domain.templates import freeze
+
+
+def test_freeze():
+    """test frozen payloads can not be modified"""
+    payload = freeze({"blocks": [{"type": "divider"}]})
+
+    with pytest.raises(TypeError):
+        payload["blocks"][0]["type"] = "section"  # type: ignore
+    assert payload["blocks"] == ({"type": "divider"},)
+
+
+def test_template__static():
+    """test templates without slots render their precompiled payload"""
+    payload = {"type": "home", "blocks": [{"type": "divider"}], "private": True, "count": 1}
+    template = Template(payload)
+
+    assert template.slots == set()
+    assert template.render() is template.render()
+    assert json.loads(template.render()) == payload
+
+
+@pytest.mark.parametrize("text", ["a } b", 'json {"a": 1}', "{name}", "{{}}"])
+def test_template__static_braces(text):
+    """test braces in plain strings are rendered as is"""
+    template = Template({"text": text})
+
+    assert template.slots == set()
+    assert template.to_dict() == {"text": text}
+
+
+def test_template__slots():
+    """test slot values are encoded in place"""
+    template = Template(
+        {
+            "text": {
+                "type": "mrkdwn",
+                "text": Text('hello *{name}*, you have {count} "beers" {{}}'),
+            },
+            "blocks": Slot("blocks"),
+        }
+    )
+
+    rendered = template.to_dict(name='Jérôme "quoted"\n', count=3, blocks=[{"type": "divider"}])
+
+    assert template.slots == {"name", "count", "blocks"}
+    assert rendered == {
+        "text": {
+            "type": "mrkdwn",
+            "text": 'hello *Jérôme "quoted"\n*, you have 3 "beers" {}',
+        },
+        "blocks": [{"type": "divider"}],
+    }
+
+
+def test_template__missing_slot():
+    """test rendering requires every slot value"""
+    template = Template({"text": Text("hello {name}")})
+
+    with pytest.raises(KeyError):
+        template.render()
+
+
+@pytest.mark.parametrize("text", ["hello {}", "hello {0}", "{name!r}", "{name:>4}"])
+def test_template__invalid_slot(text):
+    """test slots must be plain named fields"""
+    with pytest.raises(ValueError):
+        Template({"text": Text(text)})
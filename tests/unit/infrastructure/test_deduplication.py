@@ -0,0 +1,90 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+unit testing slackbox deduplication backends
+"""
+
+import pytest
+
+from slackbox.infrastructure.deduplication import MemoryDeduplicationBackend
+from slackbox.infrastructure.deduplication import SQLiteDeduplicationBackend
+from slackbox.infrastructure.deduplication import create_deduplication_backend
+
+
+@pytest.mark.asyncio
+async def test_memory_deduplication_backend():
+    """test keys are only added once"""
+    backend = MemoryDeduplicationBackend()
+
+    assert await backend.add("event:1")
+    assert not await backend.add("event:1")
+    assert await backend.add("event:2")
+
+
+@pytest.mark.asyncio
+async def test_memory_deduplication_backend__remove():
+    """test removed keys can be added again"""
+    backend = MemoryDeduplicationBackend()
+    await backend.add("event:1")
+
+    await backend.remove("event:1")
+
+    assert await backend.add("event:1")
+
+
+@pytest.mark.asyncio
+async def test_memory_deduplication_backend__expiration():
+    """test expired keys can be added again"""
+    backend = MemoryDeduplicationBackend(ttl=0.0)
+
+    assert await backend.add("event:1")
+    assert await backend.add("event:1")
+
+
+@pytest.mark.asyncio
+async def test_sqlite_deduplication_backend(tmp_path):
+    """test keys are shared by backends using the same file"""
+    path = str(tmp_path / "events.sqlite3")
+    backend, other_backend = SQLiteDeduplicationBackend(path), SQLiteDeduplicationBackend(path)
+
+    assert await backend.add("event:1")
+    assert not await other_backend.add("event:1")
+    assert await other_backend.add("event:2")
+
+    backend.close()
+    other_backend.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_deduplication_backend__remove(tmp_path):
+    """test removed keys can be added again"""
+    backend = SQLiteDeduplicationBackend(str(tmp_path / "events.sqlite3"))
+    await backend.add("event:1")
+
+    await backend.remove("event:1")
+
+    assert await backend.add("event:1")
+    backend.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_deduplication_backend__expiration(tmp_path):
+    """test expired keys can be added again and are purged periodically"""
+    backend = SQLiteDeduplicationBackend(str(tmp_path / "events.sqlite3"), ttl=-1.0)
+    backend.purge_interval = 2
+
+    assert await backend.add("event:1")
+    assert await backend.add("event:1")
+    assert await backend.add("event:2")
+
+    backend.close()
+
+
+def test_create_deduplication_backend():
+    """test backends are created from their name"""
+    assert isinstance(create_deduplication_backend("memory"), MemoryDeduplicationBackend)
+    assert isinstance(create_deduplication_backend("sqlite"), SQLiteDeduplicationBackend)
+    with pytest.raises(ValueError):
+        create_deduplication_backend("redis")
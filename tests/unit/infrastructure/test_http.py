@@ -0,0 +1,41 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+unit testing slackbox shared http session
+"""
+
+import pytest
+
+from slackbox.infrastructure.http import HTTPSession
+
+
+@pytest.mark.asyncio
+async def test_http_session():
+    """test the session is opened once on startup and closed on shutdown"""
+    http_session = HTTPSession(pool_size=10, pool_size_per_host=2)
+
+    await http_session.start()
+    session = http_session.session
+    await http_session.start()
+
+    assert session is not None
+    assert http_session.session is session
+    assert session.connector.limit == 10
+    assert session.connector.limit_per_host == 2
+
+    await http_session.stop()
+
+    assert session.closed
+    assert http_session.session is None
+
+
+@pytest.mark.asyncio
+async def test_http_session__stop_before_start():
+    """test stopping a session never started is a no-op"""
+    http_session = HTTPSession()
+
+    await http_session.stop()
+
+    assert http_session.session is None
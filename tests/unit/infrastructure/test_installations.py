@@ -0,0 +1,136 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+unit testing slackbox installation storage and authorization
+"""
+
+import sqlite3
+from unittest.mock import Mock
+
+import pytest
+from slack_bolt.context.async_context import AsyncBoltContext
+from slack_sdk.oauth.installation_store import FileInstallationStore
+from slack_sdk.oauth.installation_store import Installation
+from slack_sdk.oauth.installation_store.sqlite3 import SQLite3InstallationStore
+from slack_sdk.web.async_client import AsyncWebClient
+
+from slackbox.infrastructure.installations import CachedAuthorize
+from slackbox.infrastructure.installations import CachedInstallationStore
+from slackbox.infrastructure.installations import create_installation_store
+from slackbox.infrastructure.installations import get_installation_key
+from tests.utils import FakeSlackServer
+
+
+def make_installation(team_id: str = "T0", bot_token: str = "xoxb-0") -> Installation:
+    """make the installation of a workspace"""
+    return Installation(
+        app_id="A0",
+        team_id=team_id,
+        user_id="U0",
+        bot_token=bot_token,
+        bot_id="B0",
+        bot_user_id="U1",
+    )
+
+
+def make_store(tmp_path) -> tuple[CachedInstallationStore, Mock]:
+    """make a cached store on a sqlite file, returning the spied synchronous store"""
+    store = Mock(wraps=SQLite3InstallationStore(database=str(tmp_path / "i.db"), client_id="C0"))
+    return CachedInstallationStore(store), store
+
+
+def test_get_installation_key():
+    """test org wide installations are shared by the organization's workspaces"""
+    assert get_installation_key("E0", "T0") == ("E0", "T0")
+    assert get_installation_key("E0", "T0", is_enterprise_install=True) == ("E0", None)
+
+
+@pytest.mark.asyncio
+async def test_cached_installation_store(tmp_path):
+    """test installed bots are read from storage once"""
+    installations, store = make_store(tmp_path)
+    await installations.async_save(make_installation())
+
+    for _ in range(3):
+        bot = await installations.async_find_bot(enterprise_id=None, team_id="T0")
+        assert bot is not None and bot.bot_token == "xoxb-0"
+
+    assert await installations.async_find_bot(enterprise_id=None, team_id="T1") is None
+    assert store.find_bot.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_installation_store__eviction(tmp_path):
+    """test cached bots are evicted when reinstalled or uninstalled"""
+    installations, _ = make_store(tmp_path)
+    await installations.async_save(make_installation())
+    await installations.async_find_bot(enterprise_id=None, team_id="T0")
+
+    await installations.async_save(make_installation(bot_token="xoxb-1"))
+    bot = await installations.async_find_bot(enterprise_id=None, team_id="T0")
+    assert bot is not None and bot.bot_token == "xoxb-1"
+
+    await installations.async_delete_all(enterprise_id=None, team_id="T0")
+    assert await installations.async_find_bot(enterprise_id=None, team_id="T0") is None
+
+
+@pytest.mark.asyncio
+async def test_cached_authorize(tmp_path):
+    """test authorizations only call auth.test once per bot token"""
+    installations, _ = make_store(tmp_path)
+    await installations.async_save(make_installation())
+    authorize = CachedAuthorize(installations)
+    async with FakeSlackServer() as server:
+        context = AsyncBoltContext(client=AsyncWebClient(base_url=server.base_url))
+        results = [
+            await authorize(context=context, enterprise_id=None, team_id="T0", user_id="U2")
+            for _ in range(3)
+        ]
+        missing = await authorize(context=context, enterprise_id=None, team_id="T1", user_id="U2")
+
+    assert all(result is not None and result.bot_token == "xoxb-0" for result in results)
+    assert results[0]["bot_user_id"] == "U0"
+    assert missing is None
+    assert server.calls["auth.test"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_authorize__invalid_token(tmp_path):
+    """test requests of workspaces with a revoked token are not authorized"""
+    installations, _ = make_store(tmp_path)
+    await installations.async_save(make_installation())
+    async with FakeSlackServer() as server:
+        server.failures["auth.test"] = 1
+        context = AsyncBoltContext(client=AsyncWebClient(base_url=server.base_url))
+
+        result = await CachedAuthorize(installations)(
+            context=context, enterprise_id=None, team_id="T0", user_id="U2"
+        )
+
+    assert result is None
+
+
+def test_create_installation_store(tmp_path):
+    """test installation stores are created by name"""
+    store = create_installation_store("sqlite", str(tmp_path / "i.db"))
+    assert isinstance(store.store, SQLite3InstallationStore)
+    store = create_installation_store("file", str(tmp_path))
+    assert isinstance(store.store, FileInstallationStore)
+    with pytest.raises(ValueError):
+        create_installation_store("redis")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "name,path,error",
+    [("sqlite", "i.db", sqlite3.OperationalError), ("file", "installations", OSError)],
+)
+async def test_cached_installation_store__check(tmp_path, name, path, error):
+    """test stores are checked to be writable, stores under a regular file failing"""
+    await create_installation_store(name, str(tmp_path / path)).check()
+    (tmp_path / "file").touch()
+
+    with pytest.raises(error):
+        await create_installation_store(name, str(tmp_path / "file" / path)).check()
@@ -0,0 +1,304 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+unit testing slackbox background work queue
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from slackbox.infrastructure.queue import FairWorkQueue
+from slackbox.infrastructure.queue import Priority
+from slackbox.infrastructure.queue import WorkQueue
+from slackbox.infrastructure.queue import WorkQueueFull
+
+
+@pytest.mark.asyncio
+async def test_work_queue():
+    """test jobs are run in the background"""
+    queue = WorkQueue(workers=2)
+    job = AsyncMock()
+
+    for _ in range(5):
+        queue.submit(job)
+    job.assert_not_awaited()
+    await queue.stop()
+
+    assert job.await_count == 5
+
+
+@pytest.mark.asyncio
+async def test_work_queue__concurrency():
+    """test no more jobs than workers are run at once"""
+    queue = WorkQueue(workers=3)
+    running = []
+    peak = []
+
+    async def job():
+        running.append(None)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.pop()
+
+    for _ in range(10):
+        queue.submit(job)
+    await queue.stop()
+
+    assert max(peak) == 3
+    assert len(peak) == 10
+
+
+@pytest.mark.asyncio
+async def test_work_queue__retries():
+    """test failing jobs are retried"""
+    queue = WorkQueue(workers=1, retries=2, retry_delay=0)
+    flaky = AsyncMock(side_effect=[ValueError(), None])
+    broken = AsyncMock(side_effect=ValueError())
+
+    queue.submit(flaky)
+    queue.submit(broken)
+    await queue.stop()
+
+    assert flaky.await_count == 2
+    assert broken.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_work_queue__stop_timeout():
+    """test stopping the queue gives up on jobs taking too long"""
+    queue = WorkQueue(workers=1)
+    queue.submit(lambda: asyncio.sleep(10))
+
+    await asyncio.wait_for(queue.stop(timeout=0.01), 1)
+
+
+@pytest.mark.asyncio
+async def test_work_queue__priority():
+    """test jobs are run by priority, then by submission order"""
+    queue = WorkQueue(workers=1)
+    order = []
+
+    def job(name: str):
+        async def run():
+            order.append(name)
+
+        return run
+
+    queue.submit(job("low"), priority=Priority.LOW)
+    queue.submit(job("normal-1"))
+    queue.submit(job("high"), priority=Priority.HIGH)
+    queue.submit(job("normal-2"))
+    await queue.stop()
+
+    assert order == ["high", "normal-1", "normal-2", "low"]
+
+
+@pytest.mark.asyncio
+async def test_work_queue__shedding():
+    """test jobs are shed when the queue is full"""
+    queue = WorkQueue(workers=1, max_size=2)
+    queue.submit(AsyncMock())
+    queue.submit(AsyncMock())
+
+    assert queue.full()
+    assert queue.depth == 2
+    with pytest.raises(WorkQueueFull):
+        queue.submit(AsyncMock())
+    await queue.stop()
+
+    assert queue.stats.submitted == 2
+    assert queue.stats.processed == 2
+    assert queue.stats.shed == 1
+
+
+@pytest.mark.asyncio
+async def test_work_queue__stats():
+    """test work queue measures wait times and failures"""
+    queue = WorkQueue(workers=1, retries=0)
+    queue.submit(lambda: asyncio.sleep(0.02))
+    queue.submit(AsyncMock(side_effect=ValueError()))
+    await queue.stop()
+
+    assert queue.stats.processed == 2
+    assert queue.stats.failed == 1
+    assert queue.stats.max_wait_time >= 0.02
+    assert queue.stats.total_wait_time >= queue.stats.max_wait_time
+
+
+def make_job(order: list[str], name: str, delay: float = 0.0):
+    """make a job recording its name when run"""
+
+    async def run():
+        order.append(name)
+        await asyncio.sleep(delay)
+
+    return run
+
+
+@pytest.mark.asyncio
+async def test_fair_work_queue():
+    """test a noisy team does not delay the jobs of quiet teams"""
+    queue = FairWorkQueue(workers=1)
+    order: list[str] = []
+
+    for index in range(5):
+        queue.submit(make_job(order, f"noisy-{index}"), team="T1", user="U1")
+    queue.submit(make_job(order, "quiet-0"), team="T2", user="U2")
+    queue.submit(make_job(order, "quiet-1"), team="T3", user="U3")
+    await queue.stop()
+
+    assert order[:4] == ["noisy-0", "quiet-0", "quiet-1", "noisy-1"]
+    assert queue.get_tenant_stats("T1").processed == 5
+    assert queue.get_tenant_stats("T2").processed == 1
+
+
+@pytest.mark.asyncio
+async def test_fair_work_queue__weights():
+    """test teams are served in proportion to their weight"""
+    queue = FairWorkQueue(workers=1, weights={"T1": 2.0})
+    order: list[str] = []
+
+    for index in range(4):
+        queue.submit(make_job(order, "T1"), team="T1", user=f"U{index}")
+        queue.submit(make_job(order, "T2"), team="T2", user=f"U{index}")
+    await queue.stop()
+
+    assert order[:6].count("T1") == 4
+    assert order[:6].count("T2") == 2
+
+
+@pytest.mark.asyncio
+async def test_fair_work_queue__users():
+    """test the users of a team are served in turn"""
+    queue = FairWorkQueue(workers=1)
+    order: list[str] = []
+
+    for index in range(3):
+        queue.submit(make_job(order, "U1"), team="T1", user="U1")
+    queue.submit(make_job(order, "U2"), team="T1", user="U2")
+    await queue.stop()
+
+    assert order == ["U1", "U2", "U1", "U1"]
+
+
+@pytest.mark.asyncio
+async def test_fair_work_queue__priority_across_users():
+    """test a user's high priority job runs before the low priority jobs of other users"""
+    queue = FairWorkQueue(workers=1, max_size=1000, max_pending_per_team=1000)
+    order: list[str] = []
+
+    for index in range(500):
+        queue.submit(make_job(order, "low"), priority=Priority.LOW, team="T1", user=f"U{index}")
+    queue.submit(make_job(order, "high"), priority=Priority.HIGH, team="T1", user="U500")
+    await queue.stop()
+
+    assert order[0] == "high"
+    assert len(order) == 501
+
+
+@pytest.mark.asyncio
+async def test_fair_work_queue__priority_across_teams():
+    """test jobs are run by priority whatever their team, teams sharing a priority in turn"""
+    queue = FairWorkQueue(workers=1)
+    order: list[str] = []
+
+    for index in range(2):
+        queue.submit(make_job(order, f"T1-low-{index}"), priority=Priority.LOW, team="T1")
+        queue.submit(make_job(order, f"T2-normal-{index}"), team="T2")
+    queue.submit(make_job(order, "T3-high"), priority=Priority.HIGH, team="T3")
+    queue.submit(make_job(order, "T1-high"), priority=Priority.HIGH, team="T1")
+    await queue.stop()
+
+    assert order == [
+        "T3-high",
+        "T1-high",
+        "T2-normal-0",
+        "T2-normal-1",
+        "T1-low-0",
+        "T1-low-1",
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "teams,users,peak",
+    [
+        (["T1"] * 6, ["U1", "U2", "U3"] * 2, 2),
+        (["T1"] * 6, ["U1"] * 6, 1),
+    ],
+)
+async def test_fair_work_queue__in_flight(teams, users, peak):
+    """test jobs in flight are bounded per team and per user"""
+    queue = FairWorkQueue(workers=4, max_in_flight_per_team=2, max_in_flight_per_user=1)
+    running: list[None] = []
+    peaks = []
+
+    async def job():
+        running.append(None)
+        peaks.append(len(running))
+        await asyncio.sleep(0.01)
+        running.pop()
+
+    for team, user in zip(teams, users):
+        queue.submit(job, team=team, user=user)
+    await queue.stop()
+
+    assert max(peaks) == peak
+    assert len(peaks) == 6
+
+
+@pytest.mark.asyncio
+async def test_fair_work_queue__shedding():
+    """test jobs are shed when the queue is full"""
+    queue = FairWorkQueue(workers=1, max_size=2)
+    queue.submit(AsyncMock(), team="T1")
+    queue.submit(AsyncMock(), team="T2")
+
+    assert queue.full()
+    assert queue.depth == 2
+    with pytest.raises(WorkQueueFull):
+        queue.submit(AsyncMock(), team="T3")
+    await queue.stop()
+
+    assert queue.stats.processed == 2
+    assert queue.stats.shed == 1
+
+
+@pytest.mark.asyncio
+async def test_fair_work_queue__team_shedding():
+    """test only the jobs of a team that queued its share are shed"""
+    queue = FairWorkQueue(workers=1, max_size=10, max_pending_per_team=3)
+    for _ in range(3):
+        queue.submit(AsyncMock(), team="T1")
+
+    assert queue.full("T1")
+    assert not queue.full("T2")
+    assert not queue.full()
+    with pytest.raises(WorkQueueFull):
+        queue.submit(AsyncMock(), team="T1")
+    queue.submit(AsyncMock(), team="T2")
+    await queue.stop()
+
+    assert queue.stats.processed == 4
+    assert queue.get_tenant_stats("T1").shed == 1
+    assert queue.get_tenant_stats("T2").shed == 0
+
+
+@pytest.mark.asyncio
+async def test_fair_work_queue__stats():
+    """test latencies are measured per team"""
+    queue = FairWorkQueue(workers=1, retries=0)
+    queue.submit(lambda: asyncio.sleep(0.02), team="T1")
+    queue.submit(AsyncMock(side_effect=ValueError()), team="T2")
+    await queue.stop()
+
+    stats = queue.get_tenant_stats("T1")
+    assert stats.submitted == stats.processed == 1
+    assert stats.max_latency >= 0.02
+    assert stats.mean_latency == stats.total_latency
+    assert queue.get_tenant_stats("T2").max_wait_time >= 0.02
+    assert queue.stats.failed == 1
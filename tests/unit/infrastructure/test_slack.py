@@ -0,0 +1,196 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+unit testing slackbox rate limit aware slack web api client
+"""
+
+import asyncio
+from time import monotonic
+
+import pytest
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
+
+from slackbox.infrastructure.http import HTTPSession
+from slackbox.infrastructure.slack import RateLimitedWebClient
+from slackbox.infrastructure.slack import RateLimiter
+from slackbox.infrastructure.slack import SessionRespond
+from slackbox.infrastructure.slack import Tier
+from slackbox.infrastructure.slack import TokenBucket
+from tests.utils import FakeSlackServer
+
+
+def test_token_bucket():
+    """test tokens are handed out up to the capacity, then reserved ahead of time"""
+    bucket = TokenBucket(rate=10.0, capacity=2.0)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def test_token_bucket__pause():
+    """test no token is handed out during a pause"""
+    bucket = TokenBucket(rate=10.0, capacity=2.0)
+
+    bucket.pause(1.0)
+
+    assert bucket.reserve() == pytest.approx(1.1, abs=0.01)
+
+
+def test_rate_limiter__get_bucket():
+    """test buckets match the method's tier"""
+    limiter = RateLimiter(tiers={"custom.method": 6})
+
+    assert limiter.get_bucket("views.publish").rate == pytest.approx(Tier.TIER_4.value / 60)
+    assert limiter.get_bucket("unknown.method").rate == pytest.approx(Tier.TIER_3.value / 60)
+    assert limiter.get_bucket("custom.method").rate == pytest.approx(0.1)
+    assert limiter.get_bucket("custom.method").capacity == 1.0
+
+
+def test_rate_limiter__get_bucket_per_token():
+    """test each workspace token gets its own buckets, a rate limit pausing only its own"""
+    limiter = RateLimiter()
+
+    limiter.get_bucket("chat.postMessage", "xoxb-1").pause(60)
+
+    assert limiter.get_bucket("chat.postMessage", "xoxb-1").reserve() > 1
+    assert limiter.get_bucket("chat.postMessage", "xoxb-2").reserve() == 0.0
+    assert limiter.get_bucket("chat.postMessage", "xoxb-1") is not limiter.get_bucket(
+        "chat.postMessage"
+    )
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_web_client__throttling():
+    """test calls above the bucket's capacity wait for their token"""
+    limiter = RateLimiter(tiers={"chat.postMessage": 600})
+    async with FakeSlackServer() as server:
+        client = RateLimitedWebClient(base_url=server.base_url, rate_limiter=limiter)
+        started_at = monotonic()
+
+        await asyncio.gather(
+            *(client.chat_postMessage(channel="C1", text=str(i)) for i in range(62))
+        )
+
+        assert monotonic() - started_at >= 0.15
+    stats = limiter.get_stats("chat.postMessage")
+    assert server.calls["chat.postMessage"] == 62
+    assert stats.calls == 62
+    assert stats.throttled == 2
+    assert 0.0 < stats.total_wait_time <= 0.3
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_web_client__workspaces():
+    """test calls made with different tokens are throttled separately"""
+    limiter = RateLimiter(tiers={"chat.postMessage": 600, "auth.test": 600})
+    async with FakeSlackServer() as server:
+        clients = [
+            RateLimitedWebClient(token=token, base_url=server.base_url, rate_limiter=limiter)
+            for token in ("xoxb-1", "xoxb-2")
+        ]
+
+        await asyncio.gather(
+            *(
+                client.chat_postMessage(channel="C1", text=str(i))
+                for client in clients
+                for i in range(60)
+            )
+        )
+        await clients[0].auth_test(token="xoxb-3")
+
+    assert server.calls["chat.postMessage"] == 120
+    assert limiter.get_stats("chat.postMessage").throttled == 0
+    assert limiter.get_bucket("auth.test", "xoxb-3").tokens < 60
+    assert limiter.get_bucket("auth.test", "xoxb-1").tokens == 60
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_web_client__retry_after():
+    """test rate limited calls are retried after the delay given by slack"""
+    limiter = RateLimiter()
+    async with FakeSlackServer(limits={"chat.postMessage": 1}, window=0.2) as server:
+        client = RateLimitedWebClient(base_url=server.base_url, rate_limiter=limiter)
+        await client.chat_postMessage(channel="C1", text="first")
+
+        response = await client.chat_postMessage(channel="C1", text="second")
+
+    assert response["ok"]
+    assert server.calls["chat.postMessage"] == 3
+    assert limiter.get_stats("chat.postMessage").rate_limited == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_web_client__retries_exhausted():
+    """test rate limit errors are raised once retries are exhausted"""
+    limiter = RateLimiter(retries=1)
+    async with FakeSlackServer(limits={"chat.postMessage": 0}, window=0.05) as server:
+        client = RateLimitedWebClient(base_url=server.base_url, rate_limiter=limiter)
+
+        with pytest.raises(SlackApiError):
+            await client.chat_postMessage(channel="C1", text="hello")
+
+    assert server.calls["chat.postMessage"] == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_web_client__coalescing():
+    """test identical concurrent idempotent calls share a single request"""
+    limiter = RateLimiter()
+    async with FakeSlackServer() as server:
+        client = RateLimitedWebClient(base_url=server.base_url, rate_limiter=limiter)
+        view = {"type": "home", "blocks": []}
+
+        responses = await asyncio.gather(
+            client.views_publish(user_id="U1", view=view),
+            client.views_publish(user_id="U1", view=view),
+            client.views_publish(user_id="U2", view=view),
+        )
+
+    assert all(response["ok"] for response in responses)
+    assert server.calls["views.publish"] == 2
+    assert limiter.get_stats("views.publish").coalesced == 1
+
+
+def test_rate_limited_web_client__from_client():
+    """test copies keep the client's settings"""
+    limiter = RateLimiter()
+    client = AsyncWebClient(token="xoxb", base_url="http://localhost/api/", team_id="T1")
+
+    copy = RateLimitedWebClient.from_client(client, limiter)
+
+    assert copy.token == "xoxb"
+    assert copy.base_url == "http://localhost/api/"
+    assert copy.default_params["team_id"] == "T1"
+    assert copy.rate_limiter is limiter
+
+
+@pytest.mark.asyncio
+async def test_session_respond():
+    """test messages are sent to the response url through the shared session"""
+    http_session = HTTPSession()
+    await http_session.start()
+    async with FakeSlackServer() as server:
+        respond = SessionRespond(
+            response_url=str(server.server.make_url("/hooks/T1")),
+            session=http_session.session,
+        )
+
+        responses = [await respond("hello"), await respond({"text": "world"})]
+
+    await http_session.stop()
+    assert [response.status_code for response in responses] == [200, 200]
+    assert server.calls["hooks"] == 2
+
+
+@pytest.mark.asyncio
+async def test_session_respond__without_response_url():
+    """test responding is refused without response url"""
+    respond = SessionRespond(response_url=None, session=None)
+
+    with pytest.raises(ValueError):
+        await respond("hello")
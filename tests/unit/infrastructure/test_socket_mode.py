@@ -0,0 +1,121 @@
+"""
+created by: Thibault DEFEYTER
+created at: 2026/10/18
+license: MIT
+
+unit testing slackbox socket mode transport
+"""
+
+import asyncio
+
+import pytest
+from slack_bolt.async_app import AsyncApp
+from slack_sdk.web.async_client import AsyncWebClient
+
+from slackbox.infrastructure.socket_mode import ConcurrentSocketModeClient
+from slackbox.infrastructure.socket_mode import SocketModeRunner
+from tests.utils import FakeSlackServer
+
+
+def make_app(server: FakeSlackServer) -> AsyncApp:
+    """make a bolt app calling the fake slack web api, running listeners before acknowledging"""
+    return AsyncApp(
+        client=AsyncWebClient(token="xoxb", base_url=server.base_url),
+        signing_secret="secret",
+        process_before_response=True,
+        request_verification_enabled=False,
+    )
+
+
+def make_event(event_id: str) -> dict:
+    """make an events api payload"""
+    return {
+        "type": "event_callback",
+        "event_id": event_id,
+        "team_id": "T0",
+        "event": {"type": "app_mention", "user": "U1", "text": event_id},
+    }
+
+
+async def wait_connected(server: FakeSlackServer) -> None:
+    """wait for a socket mode client to be connected"""
+    while not server.sockets:
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_socket_mode_runner():
+    """test envelopes are dispatched to the bolt app and acknowledged"""
+    async with FakeSlackServer() as server:
+        app = make_app(server)
+        mentions = []
+
+        @app.event("app_mention")
+        async def listener(event):
+            mentions.append(event["text"])
+
+        runner = SocketModeRunner(app, app_token="xapp")
+        await runner.start()
+        await asyncio.wait_for(wait_connected(server), 5)
+        envelope_id = await server.send_envelope(make_event("Ev1"))
+        ack = await asyncio.wait_for(server.acks.get(), 5)
+        await runner.stop()
+
+    assert ack == {"envelope_id": envelope_id}
+    assert mentions == ["Ev1"]
+
+
+@pytest.mark.asyncio
+async def test_socket_mode_runner__concurrency():
+    """test no more envelopes than the maximum concurrency are processed at once"""
+    async with FakeSlackServer() as server:
+        app = make_app(server)
+        running = []
+        peak = []
+
+        @app.event("app_mention")
+        async def listener(event):
+            running.append(event)
+            peak.append(len(running))
+            await asyncio.sleep(0.02)
+            running.remove(event)
+
+        runner = SocketModeRunner(app, app_token="xapp", max_concurrency=2)
+        await runner.start()
+        await asyncio.wait_for(wait_connected(server), 5)
+        for i in range(6):
+            await server.send_envelope(make_event(f"Ev{i}"))
+        for _ in range(6):
+            await asyncio.wait_for(server.acks.get(), 5)
+        await runner.stop()
+
+    assert max(peak) == 2
+
+
+@pytest.mark.asyncio
+async def test_socket_mode_runner__reconnection():
+    """test the runner reconnects with a new url once disconnected"""
+    async with FakeSlackServer() as server:
+        server.failures["apps.connections.open"] = 2
+        runner = SocketModeRunner(make_app(server), app_token="xapp", ping_interval=0.05)
+        await runner.start()
+        assert runner.client is not None
+        runner.client.backoff = 0.01
+        await asyncio.wait_for(wait_connected(server), 5)
+        await server.disconnect()
+        await asyncio.sleep(0.05)
+        await asyncio.wait_for(wait_connected(server), 5)
+        await runner.stop()
+
+    assert server.calls["apps.connections.open"] == 4
+
+
+def test_concurrent_socket_mode_client__backoff():
+    """test reconnection delays grow exponentially up to the maximum backoff"""
+    client = ConcurrentSocketModeClient.__new__(ConcurrentSocketModeClient)
+    client.backoff = 1.0
+    client.max_backoff = 5.0
+
+    assert all(0 <= client.get_backoff(0) <= 1.0 for _ in range(100))
+    assert all(0 <= client.get_backoff(2) <= 4.0 for _ in range(100))
+    assert all(0 <= client.get_backoff(10) <= 5.0 for _ in range(100))
@@ -9,6 +9,7 @@ unit testing slackbox applications' entrypoint
 from fastapi import FastAPI
 from starlette.exceptions import HTTPException
 
+from slackbox.domain.slack import http_session
 from slackbox.main import app
 
 
@@ -24,3 +25,9 @@ def test_app():
     assert "/redoc" not in resources
     assert "/readyz" in resources
     assert "/livez" in resources
+
+
+def test_app__lifecycle():
+    """test the shared http session is started and stopped with the app"""
+    assert http_session.start in app.router.on_startup
+    assert http_session.stop in app.router.on_shutdown
@@ -6,18 +6,30 @@ license: MIT
 unit testing slackbox utilities
 """
 
+import asyncio
 import re
 from typing import Any
+from unittest.mock import Mock
+from unittest.mock import patch
 
 import pytest
 
+from slackbox.utils.caches import TTLCache
+from slackbox.utils.identifiers import IdentifierGenerator
+from slackbox.utils.identifiers import IdentifierPool
+from slackbox.utils.identifiers import IdentifierPoolStats
 from slackbox.utils.identifiers import generate_identifier
+from slackbox.utils.identifiers import generate_identifiers
 from slackbox.utils.strings import Case
 from slackbox.utils.strings import CaseConverter
 from slackbox.utils.strings import CaseEnforcer
 from slackbox.utils.strings import CaseValidator
 from slackbox.utils.strings import convert_case
+from slackbox.utils.strings import convert_case_many
+from slackbox.utils.strings import convert_keys
 from slackbox.utils.strings import force_case
+from slackbox.utils.strings import force_case_many
+from slackbox.utils.strings import register_case
 
 
 def test_generate_identifier__format():
@@ -33,6 +45,157 @@ def test_generate_identifier__unicity():
     assert first_public_id != second_public_id
 
 
+def test_generate_identifiers():
+    """test bulk identifier generation"""
+    public_ids = generate_identifiers(100)
+
+    assert len(public_ids) == 100
+    assert len(set(public_ids)) == 100
+    assert all(re.match("^[a-z]{8}$", public_id) for public_id in public_ids)
+    assert not generate_identifiers(0)
+
+
+@pytest.mark.parametrize("alphabet", ("", "é", "a" * 257))
+def test_identifier_generator__invalid_alphabet(alphabet: str):
+    """test identifier generator refuses alphabets it can not map bytes to"""
+    with pytest.raises(ValueError):
+        IdentifierGenerator(alphabet, 8)
+
+
+def test_identifier_generator__buffering():
+    """test identifier generator draws entropy in buffered chunks"""
+    generator = IdentifierGenerator("ab", 4, buffer_size=64)
+
+    with patch("slackbox.utils.identifiers.urandom", return_value=bytes(range(64))) as urandom:
+        identifiers = [generator.generate() for _ in range(8)]
+
+    urandom.assert_called_once_with(64)
+    assert identifiers == ["abab"] * 8
+
+
+def test_identifier_generator__generate_many():
+    """test identifier generator reads entropy at once for bulk generation"""
+    generator = IdentifierGenerator("ab", 4, buffer_size=1)
+
+    with patch("slackbox.utils.identifiers.urandom", side_effect=lambda n: bytes(n)) as urandom:
+        identifiers = generator.generate_many(100)
+
+    urandom.assert_called_once()
+    assert identifiers == ["aaaa"] * 100
+
+
+def test_identifier_generator__generate_many_count():
+    """test identifier generator refuses negative counts without moving its buffer back"""
+    generator = IdentifierGenerator("abcdefgh", 8)
+
+    first = generator.generate()
+    assert generator.generate_many(0) == []
+    with pytest.raises(ValueError):
+        generator.generate_many(-1)
+
+    assert generator.generate() != first
+
+
+def test_identifier_generator__reset():
+    """test identifier generator drops its buffered entropy on reset"""
+    generator = IdentifierGenerator("ab", 4, buffer_size=64)
+
+    with patch("slackbox.utils.identifiers.urandom", return_value=bytes(64)) as urandom:
+        generator.generate()
+        generator.reset()
+        generator.generate()
+
+    assert urandom.call_count == 2
+
+
+def mock_generator(*identifiers: str) -> Mock:
+    """create an identifier generator mock generating the given identifiers"""
+    mock = Mock()
+    mock.generate_many.side_effect = lambda count: list(identifiers[:count])
+    mock.generate.side_effect = list(identifiers)
+    return mock
+
+
+def test_identifier_pool():
+    """test identifier pool serves pre-generated identifiers"""
+    pool = IdentifierPool(size=10, low_watermark=0)
+    pool.refill()
+
+    identifiers = [pool.get() for _ in range(10)]
+
+    assert len(set(identifiers)) == 10
+    assert not pool
+    assert pool.stats == IdentifierPoolStats(hits=10, misses=0, refills=1, collisions=0)
+
+
+def test_identifier_pool__miss():
+    """test identifier pool generates identifiers when empty"""
+    pool = IdentifierPool(generator=mock_generator("aaaa", "bbbb"), size=2, low_watermark=0)
+
+    assert [pool.get(), pool.get()] == ["aaaa", "bbbb"]
+    assert pool.stats == IdentifierPoolStats(hits=0, misses=2, refills=0, collisions=0)
+
+
+def test_identifier_pool__refill_inline():
+    """test identifier pool refills inline when running low outside of an event loop"""
+    pool = IdentifierPool(
+        generator=mock_generator("aaaa", "bbbb", "cccc"), size=3, low_watermark=1
+    )
+
+    assert pool.get() == "aaaa"
+    assert len(pool) == 3
+    assert pool.stats == IdentifierPoolStats(hits=0, misses=1, refills=1, collisions=0)
+
+
+@pytest.mark.asyncio
+async def test_identifier_pool__refill_background():
+    """test identifier pool refills in the background when running low in an event loop"""
+    pool = IdentifierPool(size=8, low_watermark=4)
+    pool.refill()
+
+    identifiers = [pool.get() for _ in range(5)]
+    for _ in range(100):
+        if pool.stats.refills == 2:
+            break
+        await asyncio.sleep(0.01)
+
+    assert len(set(identifiers)) == 5
+    assert len(pool) == 8
+    assert pool.stats == IdentifierPoolStats(hits=5, misses=0, refills=2, collisions=0)
+
+
+@pytest.mark.asyncio
+async def test_identifier_pool__refill_failure(caplog):
+    """test failed background refills are logged and scheduled again"""
+    generator = Mock()
+    generator.generate.return_value = "aaaa"
+    generator.generate_many.side_effect = [ValueError("boom"), ["bbbb", "cccc"]]
+    pool = IdentifierPool(generator=generator, size=2, low_watermark=1)
+
+    for attempt in range(1, 3):
+        pool.get()
+        for _ in range(100):
+            if generator.generate_many.call_count == attempt:
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+
+    assert "identifier pool refill failed" in caplog.text
+    assert generator.generate_many.call_count == 2
+    assert len(pool) == 2
+
+
+def test_identifier_pool__deduplication():
+    """test identifier pool skips recently issued identifiers"""
+    generator = mock_generator("aaaa", "bbbb", "aaaa", "cccc", "aaaa", "bbbb")
+    pool = IdentifierPool(generator=generator, size=0, recent_size=2)
+
+    identifiers = [pool.get() for _ in range(4)]
+
+    assert identifiers == ["aaaa", "bbbb", "cccc", "aaaa"]
+    assert pool.stats == IdentifierPoolStats(hits=0, misses=5, refills=0, collisions=1)
+
+
 @pytest.mark.parametrize(
     "string, result",
     (
@@ -118,6 +281,38 @@ def test_is_valid_pascal(string: str, result: bool):
     assert CaseValidator.is_pascal(string) == result
 
 
+@pytest.mark.parametrize(
+    "string, result",
+    (
+        ("SCREAMING_SNAKE", True),
+        ("SCREAMING", True),
+        ("_SCREAMING_SNAKE", False),
+        ("SCREAMING__SNAKE", False),
+        ("SCREAMING_sNAKE", False),
+        ("screaming_snake", False),
+    ),
+)
+def test_is_valid_screaming_snake(string: str, result: bool):
+    """test screaming snake case validation"""
+    assert CaseValidator.is_screaming_snake(string) == result
+
+
+@pytest.mark.parametrize(
+    "string, result",
+    (
+        ("dot.case", True),
+        ("dot", True),
+        (".dot.case", False),
+        ("dot..case", False),
+        ("dot.Case", False),
+        ("dot_case", False),
+    ),
+)
+def test_is_valid_dot(string: str, result: bool):
+    """test dot case validation"""
+    assert CaseValidator.is_dot(string) == result
+
+
 @pytest.mark.parametrize(
     "string, case, result",
     (
@@ -157,6 +352,9 @@ def test_validator(string: str, case: Case, result: bool):
         ("camel_snake case", ["camel", "snake", "case"]),
         ("I'm a teapot", ["i", "m", "a", "teapot"]),
         ("HTTPRequest", ["h", "t", "t", "p", "request"]),
+        ('say "hello"', ["say", "", "hello"]),
+        ("__snake__case__", ["snake", "case"]),
+        ("dot.case", ["dot", "case"]),
     ),
 )
 def test_enforcer__get_components(string: str, components: list[str]):
@@ -191,6 +389,14 @@ def test_enforcer__get_components(string: str, components: list[str]):
         ("PascalCAse", Case.PASCAL, Case.SNAKE, "pascal_c_ase"),
         ("PascalCAse", Case.PASCAL, Case.KEBAB, "pascal-c-ase"),
         ("PascalCAse", Case.PASCAL, Case.CAMEL, "pascalCAse"),
+        ("SCREAMING_SNAKE", Case.SCREAMING_SNAKE, Case.SNAKE, "screaming_snake"),
+        ("SCREAMING_SNAKE", Case.SCREAMING_SNAKE, Case.CAMEL, "screamingSnake"),
+        ("SCREAMING_SNAKE", Case.SCREAMING_SNAKE, Case.DOT, "screaming.snake"),
+        ("snake_case", Case.SNAKE, Case.SCREAMING_SNAKE, "SNAKE_CASE"),
+        ("PascalCase", Case.PASCAL, Case.SCREAMING_SNAKE, "PASCAL_CASE"),
+        ("dot.case", Case.DOT, Case.KEBAB, "dot-case"),
+        ("dot.case", Case.DOT, Case.PASCAL, "DotCase"),
+        ("camelCase", Case.CAMEL, Case.DOT, "camel.case"),
     ),
 )
 def test_convertor(string: str, from_case: Case, to_case: Case, result: str):
@@ -244,8 +450,156 @@ def test_convert_case(string: str, from_case: Case, to_case: Case, result: Any):
         ("PascalCase", Case.CAMEL, "pascalCase"),
         ("PascalCase", Case.KEBAB, "pascal-case"),
         ("PascalCase", Case.PASCAL, "PascalCase"),
+        ("normal case", Case.SCREAMING_SNAKE, "NORMAL_CASE"),
+        ("SCREAMING_SNAKE", Case.SCREAMING_SNAKE, "SCREAMING_SNAKE"),
+        ("camelCase", Case.DOT, "camel.case"),
+        ("dot.case", Case.SNAKE, "dot_case"),
     ),
 )
 def test_force_case(string: str, case: Case, result: str):
     """test case enforcing"""
     assert force_case(string, case) == result
+
+
+def test_force_case__cache():
+    """test case enforcing results are memoized"""
+    force_case.cache_clear()
+    force_case("cached string", Case.SNAKE)
+    force_case("cached string", Case.SNAKE)
+    force_case("cached string", Case.KEBAB)
+
+    cache_info = force_case.cache_info()
+    assert cache_info.hits == 1
+    assert cache_info.misses == 2
+
+
+def test_convert_case__cache():
+    """test case conversions are memoized and invalid strings still raise"""
+    convert_case.cache_clear()
+    convert_case("cached_string", Case.SNAKE, Case.CAMEL)
+    convert_case("cached_string", Case.SNAKE, Case.CAMEL)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            convert_case("cachedString", Case.SNAKE, Case.CAMEL)
+
+    cache_info = convert_case.cache_info()
+    assert cache_info.hits == 1
+    assert cache_info.misses == 3
+
+
+def test_convert_case_many():
+    """test batch case conversion"""
+    strings = ["snake_case", "other_snake_case", "snake"]
+
+    assert convert_case_many(strings, Case.SNAKE, Case.CAMEL) == [
+        "snakeCase",
+        "otherSnakeCase",
+        "snake",
+    ]
+    with pytest.raises(ValueError):
+        convert_case_many(["snake_case", "camelCase"], Case.SNAKE, Case.CAMEL)
+
+
+def test_force_case_many():
+    """test batch case enforcing"""
+    strings = ("normal case", "camelCase", "kebab-case", "PascalCase")
+
+    assert force_case_many(strings, Case.SNAKE) == [
+        "normal_case",
+        "camel_case",
+        "kebab_case",
+        "pascal_case",
+    ]
+    assert not force_case_many([], Case.SNAKE)
+
+
+def test_convert_keys():
+    """test recursive dict keys case enforcing"""
+    data = {
+        "teamId": "T1",
+        "event": {"type": "app_home_opened", "eventTs": "1.2"},
+        "authorizations": [{"isBot": True, "userId": "U1"}, "userId"],
+        "count": 1,
+    }
+
+    assert convert_keys(data, Case.SNAKE) == {
+        "team_id": "T1",
+        "event": {"type": "app_home_opened", "event_ts": "1.2"},
+        "authorizations": [{"is_bot": True, "user_id": "U1"}, "userId"],
+        "count": 1,
+    }
+
+
+def test_converter__not_implemented():
+    """test converting a string to its own case is not supported"""
+    with pytest.raises(NotImplementedError):
+        CaseConverter.get_converter(Case.SNAKE, Case.SNAKE)
+
+
+def test_register_case():
+    """test registering a case wires it into the dispatch tables"""
+    register_case(
+        Case.DOT,
+        validator=CaseValidator.is_dot,
+        enforcer=CaseEnforcer.to_dot,
+        to_snake=CaseConverter.convert_dot_to_snake,
+        from_snake=CaseConverter.convert_snake_to_dot,
+    )
+
+    assert CaseValidator.get_validator(Case.DOT) is CaseValidator.is_dot
+    assert CaseEnforcer.get_enforcer(Case.DOT) == CaseEnforcer.to_dot
+    for case in Case:
+        if case is not Case.DOT:
+            assert (case, Case.DOT) in CaseConverter.converters
+            assert (Case.DOT, case) in CaseConverter.converters
+
+
+def test_ttl_cache():
+    """test values can be cached, read and deleted"""
+    cache: TTLCache[str, int] = TTLCache(max_size=10)
+    cache.set("one", 1)
+
+    assert cache.get("one") == 1
+    assert "one" in cache
+    assert cache.get("two") is None
+    cache.delete("one")
+    cache.delete("two")
+    assert "one" not in cache
+    assert not cache
+
+
+def test_ttl_cache__lru():
+    """test the least recently used entries are evicted first"""
+    cache: TTLCache[str, int] = TTLCache(max_size=2)
+    cache.set("one", 1)
+    cache.set("two", 2)
+    cache.get("one")
+    cache.set("three", 3)
+
+    assert len(cache) == 2
+    assert cache.get("one") == 1
+    assert cache.get("two") is None
+    assert cache.get("three") == 3
+
+
+@patch("slackbox.utils.caches.monotonic")
+def test_ttl_cache__ttl(monotonic):
+    """test entries expire after their ttl"""
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl=10)
+    monotonic.return_value = 100
+    cache.set("one", 1)
+
+    monotonic.return_value = 110
+    assert cache.get("one") == 1
+    monotonic.return_value = 111
+    assert cache.get("one") is None
+    assert not cache
+
+
+def test_ttl_cache__clear():
+    """test the cache can be cleared"""
+    cache: TTLCache[str, int] = TTLCache(max_size=2)
+    cache.set("one", 1)
+    cache.clear()
+
+    assert not cache
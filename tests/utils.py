@@ -6,8 +6,25 @@ license: MIT
 slackbox test utilities
 """
 
+import asyncio
+import json
+import math
 import re
+from dataclasses import dataclass
+from dataclasses import field
+from time import monotonic
+from time import time
+from typing import Callable
 from typing import Optional
+from urllib.parse import urlencode
+from uuid import uuid4
+
+from aiohttp import ClientSession
+from aiohttp import TCPConnector
+from aiohttp import WSMsgType
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from slack_sdk.signature import SignatureVerifier
 
 
 class AnyInstanceOf:
@@ -53,3 +70,251 @@ class AnyPublicID(AnyStringMatching):
     """Class being equal to any public id string"""
 
     regexp = re.compile(r"[a-z]{8}")
+
+
+class FakeSlackServer:  # pylint: disable=too-many-instance-attributes
+    """
+    local slack web api answering every method after the given latency, rate limiting the
+    methods called more than their limit within a window of the given number of seconds, and
+    socket mode server
+    """
+
+    def __init__(
+        self,
+        limits: Optional[dict[str, int]] = None,
+        window: float = 60.0,
+        latency: float = 0.0,
+    ):
+        self.limits = limits or {}
+        self.window = window
+        self.latency = latency
+        self.failures: dict[str, int] = {}
+        self.calls: dict[str, int] = {}
+        self.windows: dict[str, tuple[float, int]] = {}
+        self.sockets: list[web.WebSocketResponse] = []
+        self.acks: asyncio.Queue[dict] = asyncio.Queue()
+        self.server = TestServer(self.create_app())
+
+    @property
+    def base_url(self) -> str:
+        """base url of the fake web api"""
+        return str(self.server.make_url("/api/"))
+
+    @property
+    def response_url(self) -> str:
+        """response url of the fake slack hooks"""
+        return str(self.server.make_url("/hooks/response"))
+
+    def create_app(self) -> web.Application:
+        """create the fake web api application"""
+        application = web.Application()
+        application.router.add_post("/api/{method}", self.handle)
+        application.router.add_post("/hooks/{path}", self.handle_hook)
+        application.router.add_get("/link", self.handle_socket)
+        return application
+
+    async def handle_hook(self, request: web.Request) -> web.Response:
+        """answer a message sent to a response url"""
+        self.calls["hooks"] = self.calls.get("hooks", 0) + 1
+        await asyncio.sleep(self.latency)
+        return web.Response(text="ok")
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """answer a web api call"""
+        method = request.match_info["method"]
+        self.calls[method] = self.calls.get(method, 0) + 1
+        await asyncio.sleep(self.latency)
+        now = monotonic()
+        started_at, count = self.windows.get(method, (now, 0))
+        if now - started_at >= self.window:
+            started_at, count = now, 0
+        self.windows[method] = (started_at, count + 1)
+        if method in self.limits and count >= self.limits[method]:
+            return web.json_response(
+                {"ok": False, "error": "ratelimited"},
+                status=429,
+                headers={"Retry-After": f"{started_at + self.window - now:.3f}"},
+            )
+        if self.failures.get(method):
+            self.failures[method] -= 1
+            return web.json_response({"ok": False, "error": "fatal_error"})
+        if method == "apps.connections.open":
+            url = str(self.server.make_url("/link")).replace("http", "ws", 1)
+            return web.json_response({"ok": True, "url": url})
+        if method == "auth.test":
+            return web.json_response(
+                {"ok": True, "user_id": "U0", "bot_id": "B0", "team_id": "T0", "url": ""}
+            )
+        return web.json_response({"ok": True, "method": method})
+
+    async def handle_socket(self, request: web.Request) -> web.WebSocketResponse:
+        """accept a socket mode connection, collecting the acknowledged envelopes"""
+        socket = web.WebSocketResponse()
+        await socket.prepare(request)
+        self.sockets.append(socket)
+        await socket.send_json({"type": "hello"})
+        async for message in socket:
+            if message.type == WSMsgType.TEXT:
+                await self.acks.put(message.json())
+        self.sockets.remove(socket)
+        return socket
+
+    async def send_envelope(self, payload: dict, type_: str = "events_api") -> str:
+        """send an envelope to the connected socket mode clients, returning its id"""
+        envelope_id = f"envelope-{uuid4()}"
+        envelope = {"type": type_, "envelope_id": envelope_id, "payload": payload}
+        for socket in self.sockets:
+            await socket.send_json(envelope)
+        return envelope_id
+
+    async def disconnect(self) -> None:
+        """close the connected socket mode clients' connections"""
+        for socket in list(self.sockets):
+            await socket.close()
+
+    async def __aenter__(self) -> "FakeSlackServer":
+        await self.server.start_server()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.server.close()
+
+
+SlackRequest = tuple[bytes, str]
+
+
+@dataclass
+class LoadReport:
+    """results of a load test, latencies are measured in seconds"""
+
+    duration: float = 0.0
+    statuses: dict[int, int] = field(default_factory=dict)
+    errors: int = 0
+    latencies: list[float] = field(default_factory=list)
+
+    @property
+    def sent(self) -> int:
+        """number of requests sent"""
+        return sum(self.statuses.values()) + self.errors
+
+    @property
+    def acked(self) -> int:
+        """number of requests acknowledged by slackbox"""
+        return self.statuses.get(200, 0)
+
+    @property
+    def throughput(self) -> float:
+        """number of requests acknowledged per second"""
+        return self.acked / self.duration if self.duration else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """get the latency percentile of the acknowledged requests"""
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        return latencies[max(0, math.ceil(percent / 100 * len(latencies)) - 1)]
+
+    def __str__(self) -> str:
+        return (
+            f"sent={self.sent} acked={self.acked} statuses={self.statuses} "
+            f"errors={self.errors} throughput={self.throughput:.1f}/s "
+            f"p50={self.percentile(50) * 1000:.1f}ms p95={self.percentile(95) * 1000:.1f}ms "
+            f"p99={self.percentile(99) * 1000:.1f}ms"
+        )
+
+
+class SlackLoadGenerator:
+    """send signed slack requests to slackbox at a target rate, measuring their ack latency"""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        url: str,
+        signing_secret: str,
+        response_url: str,
+        team_id: str = "T0",
+        users: int = 100,
+        user_prefix: str = "U",
+    ):
+        self.url = url
+        self.verifier = SignatureVerifier(signing_secret)
+        self.response_url = response_url
+        self.team_id = team_id
+        self.users = users
+        self.user_prefix = user_prefix
+
+    def get_user(self, index: int) -> str:
+        """get the user sending the request of the given index"""
+        return f"{self.user_prefix}{index % self.users}"
+
+    def sign(self, body: bytes) -> dict[str, str]:
+        """get the headers of a signed slack request"""
+        timestamp = str(int(time()))
+        return {
+            "x-slack-request-timestamp": timestamp,
+            "x-slack-signature": self.verifier.generate_signature(timestamp=timestamp, body=body),
+        }
+
+    def make_command(self, index: int) -> SlackRequest:
+        """make a beerbox slash command"""
+        body = urlencode(
+            {
+                "command": "/beerbox",
+                "text": f"beer {index}",
+                "team_id": self.team_id,
+                "user_id": self.get_user(index),
+                "channel_id": "C0",
+                "trigger_id": f"trigger-{uuid4()}",
+                "response_url": self.response_url,
+            }
+        )
+        return body.encode(), "application/x-www-form-urlencoded"
+
+    def make_home_opened(self, index: int) -> SlackRequest:
+        """make an app_home_opened event"""
+        body = {
+            "type": "event_callback",
+            "team_id": self.team_id,
+            "api_app_id": "A0",
+            "event_id": f"event-{uuid4()}",
+            "event": {"type": "app_home_opened", "user": self.get_user(index), "tab": "home"},
+        }
+        return json.dumps(body).encode(), "application/json"
+
+    async def send(self, session: ClientSession, request: SlackRequest, report: LoadReport):
+        """send a request, recording its status and latency"""
+        body, content_type = request
+        headers = {"content-type": content_type, **self.sign(body)}
+        started_at = monotonic()
+        try:
+            async with session.post(self.url, data=body, headers=headers) as response:
+                await response.read()
+        except Exception:  # pylint: disable=broad-except
+            report.errors += 1
+            return
+        report.statuses[response.status] = report.statuses.get(response.status, 0) + 1
+        if response.status == 200:
+            report.latencies.append(monotonic() - started_at)
+
+    async def run(
+        self,
+        make_request: Callable[[int], SlackRequest],
+        rate: float,
+        duration: float,
+    ) -> LoadReport:
+        """send requests at the given rate per second for the given number of seconds"""
+        report = LoadReport()
+        count = int(rate * duration)
+        # connections are not pooled, requests waiting for a connection would skew latencies
+        async with ClientSession(connector=TCPConnector(limit=0)) as session:
+            started_at = monotonic()
+            tasks = []
+            # requests are sent on schedule whatever the latency, slow acks do not lower the rate
+            for index in range(count):
+                delay = started_at + index / rate - monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                request = make_request(index)
+                tasks.append(asyncio.create_task(self.send(session, request, report)))
+            await asyncio.gather(*tasks)
+            report.duration = monotonic() - started_at
+        return report